@@ -0,0 +1,4 @@
+"""
+Avatar Engine Benchmarks
+Standalone performance measurements, run from apps/avatar-engine with `python -m benchmarks.<name>`.
+"""
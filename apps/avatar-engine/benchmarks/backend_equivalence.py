@@ -0,0 +1,193 @@
+"""
+Frame equivalence and latency of the torch and onnxruntime inference backends.
+
+Renders the same frames (same reference image, audio features and noise)
+through both backends, from VAE encode to composite, and compares the output
+frames. Also times each component and backend startup: the one-time ONNX
+export against loading the cached export.
+
+The stand-ins have the diffusers call signatures, so the backends run their
+real export and session code on them.
+
+    python -m benchmarks.backend_equivalence --frames 30
+    python -m benchmarks.backend_equivalence --real   # needs diffusers and the checkpoints
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from src.musetalk.inference_backend import InferenceBackend, OnnxRuntimeBackend, TorchBackend
+from src.musetalk.model_manager import MuseTalkModelManager
+from src.musetalk.render_buffers import RenderBuffers
+
+from .common import StandInAttentionUNet, StandInDecoder, print_table, time_call
+from .render_mode import make_avatar
+
+
+class StandInVAE(nn.Module):
+    """Stand-in AutoencoderKL: strided conv encoder, StandInDecoder, diffusers outputs."""
+
+    def __init__(self, width: int = 32):
+        super().__init__()
+        self.encoder = nn.Sequential(
+            nn.Conv2d(3, width, 3, stride=2, padding=1), nn.SiLU(),
+            nn.Conv2d(width, width, 3, stride=2, padding=1), nn.SiLU(),
+            nn.Conv2d(width, 8, 3, stride=2, padding=1),
+        )
+        self.decoder = StandInDecoder(width)
+        self.config = SimpleNamespace(scaling_factor=0.18215)
+
+    def encode(self, images):
+        mean, _ = self.encoder(images).chunk(2, dim=1)
+        return SimpleNamespace(latent_dist=SimpleNamespace(mode=lambda: mean))
+
+    def decode(self, latents):
+        return SimpleNamespace(sample=self.decoder(latents))
+
+
+class StandInDiffusersUNet(StandInAttentionUNet):
+    """StandInAttentionUNet returning a diffusers-style output."""
+
+    def forward(self, latents, timesteps, encoder_hidden_states):
+        return SimpleNamespace(sample=super().forward(latents, timesteps, encoder_hidden_states))
+
+
+class StandInModelManager(MuseTalkModelManager):
+    """Model manager serving the stand-ins (or the real checkpoints) under benchmark keys."""
+
+    real = False
+
+    def registry_key(self, model_name: str, quantized: bool = True) -> str:
+        return f"benchmark-{'real' if self.real else 'standin'}:{super().registry_key(model_name, quantized)}"
+
+    async def load_vae(self):
+        if self.real:
+            return await super().load_vae()
+        torch.manual_seed(0)
+        return await self._acquire("vae", StandInVAE)
+
+    async def load_unet(self):
+        if self.real:
+            return await super().load_unet()
+        torch.manual_seed(1)
+        return await self._acquire("unet", StandInDiffusersUNet)
+
+
+def render_frames(backend: InferenceBackend, face: np.ndarray, features: np.ndarray, frames: int):
+    """Render frames end to end on one backend; returns (frames, reference latents)."""
+    images = torch.from_numpy(face).permute(2, 0, 1).unsqueeze(0).float() / 127.5 - 1.0
+    ref_latents = backend.forward_fn("vae_encoder")(images)
+
+    size = face.shape[0]
+    buffers = RenderBuffers(make_avatar(None, size // 8), ref_latents, decode_size=(size, size))
+    audio_encoder = backend.forward_fn("audio_encoder")
+    unet = backend.forward_fn("unet")
+    decoder = backend.forward_fn("vae_decoder")
+
+    rendered = []
+    for index in range(frames):
+        conditioning = audio_encoder(torch.from_numpy(features[index]).unsqueeze(0))
+        noise_scale = float(torch.clamp(torch.norm(conditioning, dim=-1) * 0.1, 0.01, 0.3))
+        torch.manual_seed(index)
+        noisy = buffers.prepare_latents(noise_scale)
+        noise_pred = unet(noisy, buffers.timesteps, buffers.text_embeddings)
+        decoded = decoder(buffers.apply_prediction(noise_pred))
+        rendered.append(buffers.composite(decoded).copy())
+    return rendered, ref_latents
+
+
+def psnr(reference: np.ndarray, test: np.ndarray) -> float:
+    """PSNR in dB of two uint8 frames."""
+    mse = float(np.mean((reference.astype(np.float64) - test.astype(np.float64)) ** 2))
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+async def load_backend(backend: InferenceBackend) -> float:
+    """Load every component and return the time taken."""
+    start = time.perf_counter()
+    await backend.load(("vae_encoder", "vae_decoder", "unet", "audio_encoder"))
+    return time.perf_counter() - start
+
+
+async def run(args) -> None:
+    StandInModelManager.real = args.real
+    models_path = Path(tempfile.mkdtemp())
+    torch_backend = TorchBackend(StandInModelManager(models_path, "cpu"))
+
+    # First start exports; the second backend finds the cached export
+    onnx_backend = OnnxRuntimeBackend(
+        StandInModelManager(models_path, "cpu"), args.intra_op_threads, args.inter_op_threads
+    )
+    torch_s = await load_backend(torch_backend)
+    export_s = await load_backend(onnx_backend)
+    onnx_backend.cleanup()
+    onnx_backend = OnnxRuntimeBackend(
+        StandInModelManager(models_path, "cpu"), args.intra_op_threads, args.inter_op_threads
+    )
+    cached_s = await load_backend(onnx_backend)
+
+    rng = np.random.default_rng(0)
+    size = args.face_size
+    face = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+    features = rng.standard_normal((args.frames, 80, 32)).astype(np.float32)
+
+    torch_frames, torch_latents = render_frames(torch_backend, face, features, args.frames)
+    onnx_frames, onnx_latents = render_frames(onnx_backend, face, features, args.frames)
+
+    diffs = [np.abs(a.astype(np.int16) - b.astype(np.int16)) for a, b in zip(torch_frames, onnx_frames)]
+    print_table("Frame equivalence, onnxruntime vs torch", [{
+        "frames": args.frames,
+        "max_abs_diff": int(max(d.max() for d in diffs)),
+        "mean_abs_diff": float(np.mean([d.mean() for d in diffs])),
+        "min_psnr_db": min(psnr(a, b) for a, b in zip(torch_frames, onnx_frames)),
+        "ref_latent_rel_err": float((onnx_latents - torch_latents).norm() / torch_latents.norm()),
+    }])
+
+    latent = size // 8
+    inputs = {
+        "vae_encoder": (torch.randn(1, 3, size, size),),
+        "unet": (torch.randn(1, 4, latent, latent), torch.zeros((1,), dtype=torch.long), torch.zeros(1, 77, 768)),
+        "vae_decoder": (torch.randn(1, 4, latent, latent),),
+    }
+    rows = []
+    for backend, startup_s in ((torch_backend, torch_s), (onnx_backend, cached_s)):
+        row = {"backend": backend.name}
+        for component, component_inputs in inputs.items():
+            forward = backend.forward_fn(component)
+            row[f"{component}_ms"] = time_call(lambda: forward(*component_inputs), args.iterations)["mean_ms"]
+        row["frame_ms"] = row["unet_ms"] + row["vae_decoder_ms"]
+        row["startup_s"] = startup_s
+        rows.append(row)
+    print_table(f"Per-component latency ({size}x{size} face, {latent}x{latent} latents)", rows)
+    print_table("onnxruntime startup", [
+        {"path": "export + create sessions (first run)", "seconds": export_s},
+        {"path": "create sessions from cached export", "seconds": cached_s},
+    ])
+
+    onnx_backend.cleanup()
+    torch_backend.cleanup()
+    torch_backend.model_manager.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--face-size", type=int, default=256)
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=1)
+    parser.add_argument("--real", action="store_true", help="Use the real UNet and VAE")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Shared helpers for the avatar engine benchmarks.
+
+The stand-in models have the same tensor shapes as the MuseTalk UNet and VAE
+decoder but far fewer weights, so the benchmarks run on any CPU without
+downloading checkpoints. Pass ``--real`` where supported to use the real models.
+"""
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class StandInUNet(nn.Module):
+    """Conv stack mapping (B, 4, h, w) latents to a noise prediction of the same shape."""
+
+    def __init__(self, width: int = 64, depth: int = 4):
+        super().__init__()
+        layers: List[nn.Module] = [nn.Conv2d(4, width, 3, padding=1), nn.SiLU()]
+        for _ in range(depth):
+            layers += [nn.Conv2d(width, width, 3, padding=1), nn.SiLU()]
+        layers.append(nn.Conv2d(width, 4, 3, padding=1))
+        self.body = nn.Sequential(*layers)
+        self.cond = nn.Linear(768, 4)
+
+    def forward(self, latents, timesteps, encoder_hidden_states):
+        cond = self.cond(encoder_hidden_states.mean(dim=1))[:, :, None, None]
+        return self.body(latents) + cond
+
+
+class StandInAttentionUNet(nn.Module):
+    """
+    Conv stem, transformer blocks and conv head, like one resolution level of the SD UNet.
+
+    Unlike StandInUNet most of its FLOPs are in Linear layers (self attention,
+    cross attention to the 77x768 conditioning and the feed-forward), which is
+    what dynamic int8 quantization and graph runtimes act on.
+    """
+
+    def __init__(self, width: int = 320, depth: int = 2, heads: int = 8, context_dim: int = 768):
+        super().__init__()
+        self.heads = heads
+        self.stem = nn.Conv2d(4, width, 3, padding=1)
+        self.blocks = nn.ModuleList([
+            nn.ModuleDict({
+                "norm1": nn.LayerNorm(width),
+                "to_qkv": nn.Linear(width, 3 * width),
+                "out1": nn.Linear(width, width),
+                "norm2": nn.LayerNorm(width),
+                "to_q": nn.Linear(width, width),
+                "to_kv": nn.Linear(context_dim, 2 * width),
+                "out2": nn.Linear(width, width),
+                "norm3": nn.LayerNorm(width),
+                "ff1": nn.Linear(width, 4 * width),
+                "ff2": nn.Linear(4 * width, width),
+            })
+            for _ in range(depth)
+        ])
+        self.head = nn.Conv2d(width, 4, 3, padding=1)
+
+    def _attention(self, q, k, v):
+        batch, tokens, width = q.shape
+        split = lambda t: t.reshape(batch, -1, self.heads, width // self.heads).transpose(1, 2)
+        out = F.scaled_dot_product_attention(split(q), split(k), split(v))
+        return out.transpose(1, 2).reshape(batch, tokens, width)
+
+    def forward(self, latents, timesteps, encoder_hidden_states):
+        x = self.stem(latents)
+        batch, width, height, breadth = x.shape
+        x = x.flatten(2).transpose(1, 2)
+        for block in self.blocks:
+            q, k, v = block["to_qkv"](block["norm1"](x)).chunk(3, dim=-1)
+            x = x + block["out1"](self._attention(q, k, v))
+            k, v = block["to_kv"](encoder_hidden_states).chunk(2, dim=-1)
+            x = x + block["out2"](self._attention(block["to_q"](block["norm2"](x)), k, v))
+            x = x + block["ff2"](F.gelu(block["ff1"](block["norm3"](x))))
+        x = x.transpose(1, 2).reshape(batch, width, height, breadth)
+        return self.head(x)
+
+
+class StandInDecoder(nn.Module):
+    """Upsamples (B, 4, h, w) latents to (B, 3, 8h, 8w) images like the SD VAE decoder."""
+
+    def __init__(self, width: int = 32):
+        super().__init__()
+        self.stem = nn.Conv2d(4, width, 3, padding=1)
+        self.blocks = nn.ModuleList(
+            [nn.Conv2d(width, width, 3, padding=1) for _ in range(3)]
+        )
+        self.head = nn.Conv2d(width, 3, 3, padding=1)
+
+    def forward(self, latents):
+        x = F.silu(self.stem(latents))
+        for block in self.blocks:
+            x = F.interpolate(x, scale_factor=2, mode="nearest")
+            x = F.silu(block(x))
+        return torch.tanh(self.head(x))
+
+
+class RealUNet(nn.Module):
+    """The SD v1-4 UNet used by the engine, returning the noise prediction tensor."""
+
+    def __init__(self, pretrained: bool = True):
+        super().__init__()
+        from diffusers import UNet2DConditionModel
+        repo, subfolder = "runwayml/stable-diffusion-v1-4", "unet"
+        self.unet = (
+            UNet2DConditionModel.from_pretrained(repo, subfolder=subfolder) if pretrained
+            else UNet2DConditionModel.from_config(UNet2DConditionModel.load_config(repo, subfolder=subfolder))
+        )
+
+    def forward(self, latents, timesteps, encoder_hidden_states):
+        return self.unet(latents, timesteps, encoder_hidden_states=encoder_hidden_states).sample
+
+
+class RealDecoder(nn.Module):
+    """The sd-vae-ft-mse decoder used by the engine."""
+
+    def __init__(self, pretrained: bool = True):
+        super().__init__()
+        from diffusers import AutoencoderKL
+        repo = "stabilityai/sd-vae-ft-mse"
+        self.vae = (
+            AutoencoderKL.from_pretrained(repo) if pretrained
+            else AutoencoderKL.from_config(AutoencoderKL.load_config(repo))
+        )
+
+    def forward(self, latents):
+        return self.vae.decode(latents / self.vae.config.scaling_factor).sample
+
+
+def load_models(real: bool = False) -> Tuple[nn.Module, nn.Module]:
+    """Get (unet, decoder) in eval mode: the stand-ins, or the real checkpoints with ``real``."""
+    if real:
+        unet, decoder = RealUNet(), RealDecoder()
+    else:
+        torch.manual_seed(0)
+        unet, decoder = StandInUNet(), StandInDecoder()
+    return unet.eval().requires_grad_(False), decoder.eval().requires_grad_(False)
+
+
+def time_call(fn: Callable[[], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """Time a callable and return per-call statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples_arr = np.array(samples)
+    return {
+        "mean_ms": float(samples_arr.mean()),
+        "p50_ms": float(np.percentile(samples_arr, 50)),
+        "p95_ms": float(np.percentile(samples_arr, 95)),
+    }
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    """Print benchmark rows as an aligned table."""
+    print(f"\n{title}")
+    if not rows:
+        return
+
+    columns = list(rows[0].keys())
+    widths = {
+        column: max(len(column), *(len(_format(row[column])) for row in rows))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(_format(row[column]).ljust(widths[column]) for column in columns))
+
+
+def _format(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
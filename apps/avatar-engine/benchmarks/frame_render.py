@@ -0,0 +1,136 @@
+"""
+Allocations and time per frame for the steady-state render path.
+
+Compares the previous per-frame code (fresh conditioning/timestep tensors,
+randn_like, rebuilt blurred mask, full-frame copy and double resize) with
+RenderBuffers. Model passes are excluded: the decoder output is synthetic,
+so only the work around the UNet and VAE is measured.
+
+    python -m benchmarks.frame_render --frames 300
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+import torch
+from torch.profiler import ProfilerActivity, profile
+
+from src.musetalk.avatar_cache import PreparedAvatar
+from src.musetalk.render_buffers import RenderBuffers
+
+from .common import print_table
+
+
+def make_avatar() -> PreparedAvatar:
+    """Synthetic 512x512 prepared avatar with a typical face box."""
+    rng = np.random.default_rng(0)
+    return PreparedAvatar(
+        key="benchmark",
+        image=rng.integers(0, 255, (512, 512, 3), dtype=np.uint8),
+        bbox=(160, 140, 352, 372),
+        face_region=(122, 94, 390, 418),
+        landmarks=None,
+        mouth_mask=np.zeros((256, 256), dtype=np.uint8),
+        ref_latents=rng.standard_normal((1, 4, 32, 32)).astype(np.float32),
+    )
+
+
+def legacy_frame(avatar: PreparedAvatar, ref_latents: torch.Tensor, decoded: torch.Tensor) -> np.ndarray:
+    """The per-frame work of the previous _generate_lip_sync_frame, minus the models."""
+    text_embeddings = torch.zeros((1, 77, 768))
+    noise = torch.randn_like(ref_latents)
+    noisy_latents = ref_latents + noise * 0.1
+    timesteps = torch.zeros((1,), dtype=torch.long)
+    denoised_latents = noisy_latents - noisy_latents * 0.1
+    del text_embeddings, timesteps, denoised_latents
+
+    decoded_image = (decoded / 2 + 0.5).clamp(0, 1)
+    decoded_image = decoded_image.squeeze(0).permute(1, 2, 0).cpu().numpy()
+    decoded_image = (decoded_image * 255).astype(np.uint8)
+    decoded_image = cv2.cvtColor(decoded_image, cv2.COLOR_RGB2BGR)
+    decoded_image = cv2.resize(decoded_image, (512, 512))
+
+    result_image = avatar.image.copy()
+    x1, y1, x2, y2 = avatar.face_region
+    face_h, face_w = y2 - y1, x2 - x1
+    decoded_face = cv2.resize(decoded_image, (face_w, face_h))
+    mask = np.zeros((face_h, face_w), dtype=np.float32)
+    mask[int(face_h * 0.6):, :] = 1.0
+    mask = cv2.GaussianBlur(mask, (15, 15), 0)
+    mask = np.stack([mask] * 3, axis=-1)
+    original_face = result_image[y1:y2, x1:x2]
+    result_image[y1:y2, x1:x2] = (original_face * (1 - mask) + decoded_face * mask).astype(np.uint8)
+    return result_image
+
+
+def buffered_frame(buffers: RenderBuffers, decoded: torch.Tensor) -> np.ndarray:
+    """The per-frame work of the RenderBuffers path, minus the models."""
+    noisy_latents = buffers.prepare_latents(0.1)
+    buffers.apply_prediction(noisy_latents)
+    return buffers.composite(decoded)
+
+
+def measure(name: str, render, decoded_frames) -> dict:
+    """Time the render callable and count numpy and torch allocations per frame."""
+    frames = len(decoded_frames)
+
+    # Warm up caches and lazy initialisation
+    for decoded in decoded_frames[:5]:
+        render(decoded.clone())
+
+    start = time.perf_counter()
+    for decoded in decoded_frames:
+        render(decoded)
+    elapsed = time.perf_counter() - start
+
+    # Peak transient numpy memory per frame (numpy reports its buffers to tracemalloc)
+    sample = [d.clone() for d in decoded_frames[:50]]
+    peaks = []
+    tracemalloc.start()
+    for decoded in sample:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        render(decoded)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    # torch CPU allocations
+    sample = [d.clone() for d in decoded_frames[:50]]
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        for decoded in sample:
+            render(decoded)
+    torch_allocs = sum(
+        event.cpu_memory_usage for event in prof.events() if event.cpu_memory_usage > 0
+    )
+
+    return {
+        "path": name,
+        "ms/frame": elapsed / frames * 1000,
+        "numpy_peak_KB/frame": float(np.mean(peaks)) / 1024,
+        "torch_KB/frame": torch_allocs / len(sample) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    avatar = make_avatar()
+    ref_latents = torch.from_numpy(avatar.ref_latents)
+    buffers = RenderBuffers(avatar, ref_latents)
+    source = torch.rand((1, 3, 256, 256)) * 2 - 1
+
+    rows = [
+        measure("legacy", lambda d: legacy_frame(avatar, ref_latents, d), [source.clone() for _ in range(args.frames)]),
+        measure("render_buffers", lambda d: buffered_frame(buffers, d), [source.clone() for _ in range(args.frames)]),
+    ]
+    print_table("Per-frame render path (512x512 avatar, models excluded)", rows)
+
+
+if __name__ == "__main__":
+    main()
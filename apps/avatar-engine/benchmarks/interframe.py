@@ -0,0 +1,72 @@
+"""
+Cost per output frame with in-between frame synthesis.
+
+Compares rendering every frame (UNet + decoder + composite) with rendering
+every other frame and synthesizing the one between: "blend" averages the two
+rendered mouth bands, "latent" decodes the midpoint of their latents. Also
+converts the cost into how many 30 fps sessions one core can carry.
+
+    python -m benchmarks.interframe --frames 40
+    python -m benchmarks.interframe --real   # needs diffusers and the checkpoints
+"""
+
+import argparse
+
+import torch
+
+from src.musetalk.render_buffers import RenderBuffers
+
+from .common import load_models, print_table, time_call
+from .render_mode import make_avatar
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--real", action="store_true", help="Use the real UNet and VAE")
+    args = parser.parse_args()
+
+    unet, decoder = load_models(args.real)
+    avatar = make_avatar(None, 32)
+    ref_latents = torch.from_numpy(avatar.ref_latents)
+    buffers = RenderBuffers(avatar, ref_latents, decode_size=(256, 256))
+
+    def render():
+        with torch.no_grad():
+            noisy = buffers.prepare_latents(0.1)
+            noise_pred = unet(noisy, buffers.timesteps, buffers.text_embeddings)
+            denoised = buffers.apply_prediction(noise_pred)
+            frame = buffers.composite(decoder(denoised))
+        return buffers.extract_patch(frame), denoised.clone()
+
+    previous_band, previous_latents = render()
+
+    def blend_pair():
+        band, _ = render()
+        buffers.blend_patches(previous_band, band)
+
+    def latent_pair():
+        _, latents = render()
+        with torch.no_grad():
+            buffers.composite(decoder(torch.lerp(previous_latents, latents, 0.5)))
+
+    pair_ms = {
+        "off (render every frame)": 2 * time_call(render, args.frames)["mean_ms"],
+        "blend": time_call(blend_pair, args.frames // 2)["mean_ms"],
+        "latent": time_call(latent_pair, args.frames // 2)["mean_ms"],
+    }
+
+    rows = []
+    for mode, ms in pair_ms.items():
+        frame_ms = ms / 2
+        rows.append({
+            "interframe_mode": mode,
+            "ms/output_frame": frame_ms,
+            f"sessions/core@{args.fps}fps": 1000.0 / (frame_ms * args.fps),
+        })
+    print_table("Cost per output frame (two frames per rendered pair)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Throughput vs latency of cross-session micro-batching on CPU.
+
+Each simulated session renders frames back to back (UNet pass then decoder
+pass), submitting both through MicroBatchers. Batch size 1 is the unbatched
+baseline; larger sizes trade a short wait for fewer, larger forward passes.
+
+    python -m benchmarks.micro_batching --sessions 8 --seconds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import torch
+
+from src.musetalk.batch_scheduler import MicroBatcher
+from src.musetalk.inference_executor import InferenceExecutor
+
+from .common import StandInDecoder, StandInUNet, print_table
+
+
+async def run_config(
+    sessions: int,
+    seconds: float,
+    batch_size: int,
+    wait_ms: float,
+    workers: int,
+) -> dict:
+    """Run all sessions against one batching configuration."""
+    unet = StandInUNet().eval()
+    decoder = StandInDecoder().eval()
+
+    def unet_forward(latents, timesteps, cond):
+        with torch.no_grad():
+            return unet(latents, timesteps, cond)
+
+    def decode(latents):
+        with torch.no_grad():
+            return decoder(latents)
+
+    executor = InferenceExecutor(workers)
+    unet_batcher = MicroBatcher("unet", unet_forward, executor, batch_size, wait_ms)
+    vae_batcher = MicroBatcher("vae", decode, executor, batch_size, wait_ms)
+
+    cond = torch.zeros((1, 77, 768))
+    timesteps = torch.zeros((1,), dtype=torch.long)
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def session_loop() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            latents = torch.randn((1, 4, 32, 32))
+            noise_pred = await unet_batcher.submit(latents, timesteps, cond)
+            await vae_batcher.submit(latents - noise_pred * 0.1)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(session_loop() for _ in range(sessions)))
+    executor.shutdown()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "batch": batch_size,
+        "wait_ms": wait_ms,
+        "frames/s": len(latencies) / seconds,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "avg_unet_batch": float(np.mean(unet_batcher.batch_sizes)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = default)")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    configs = [(1, 0.0), (4, 2.0), (4, 5.0), (8, 5.0), (8, 10.0)]
+    rows = [
+        asyncio.run(run_config(args.sessions, args.seconds, batch, wait, args.workers))
+        for batch, wait in configs
+    ]
+    print_table(f"Micro-batching, {args.sessions} sessions (stand-in UNet + decoder)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Cold start and memory of diffusers from_pretrained against memory-mapped safetensors.
+
+Saves the SD VAE and TAESD architectures (with --unet also the SD UNet,
+~3.4 GB in fp32) with random weights as diffusers checkpoints, then loads
+each in a fresh process per path: from_pretrained (the previous loader), the
+first-run conversion, and the cached memory-mapped load. Reports load time,
+RSS after loading and after one forward pass, and the anonymous memory the
+load added: that is what every extra process pays, while mapped weights are
+file-backed pages shared through the page cache. --format bin saves pickled
+.bin checkpoints, as the MuseTalk weights ship, and also compares the
+MuseTalk state dict loader: torch.load (previous) against the mapped file.
+
+    python -m benchmarks.model_loading
+    python -m benchmarks.model_loading --format bin --unet
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+from src.musetalk.mapped_weights import (
+    diffusers_metadata,
+    load_or_convert,
+    load_or_convert_state,
+    mapped_weights_path,
+)
+from src.musetalk.model_registry import process_rss_bytes
+
+from .common import print_table
+
+
+PATHS = ("from_pretrained", "convert (first run)", "mapped (cached)")
+STATE_PATHS = ("torch.load", "convert state (first run)", "mapped state (cached)")
+
+
+def model_class(name: str):
+    """Get the diffusers class of a benchmarked model."""
+    from diffusers import AutoencoderKL, AutoencoderTiny, UNet2DConditionModel
+
+    return {"vae": AutoencoderKL, "taesd": AutoencoderTiny, "unet": UNet2DConditionModel}[name]
+
+
+def save_checkpoint(name: str, directory: Path, safe_serialization: bool) -> None:
+    """Save a randomly initialized model in the diffusers layout of its real checkpoint."""
+    torch.manual_seed(0)
+    if name == "vae":
+        # sd-vae-ft-mse
+        model = model_class(name)(
+            down_block_types=("DownEncoderBlock2D",) * 4,
+            up_block_types=("UpDecoderBlock2D",) * 4,
+            block_out_channels=(128, 256, 512, 512),
+            layers_per_block=2,
+            latent_channels=4,
+            scaling_factor=0.18215,
+        )
+    elif name == "unet":
+        # SD v1 is the class default apart from the CLIP text width
+        model = model_class(name)(cross_attention_dim=768)
+    else:
+        # TAESD is the class default
+        model = model_class(name)()
+    model.save_pretrained(directory, safe_serialization=safe_serialization)
+
+
+def forward(name: str, model) -> None:
+    """Run one frame's pass, touching every weight."""
+    latents = torch.randn(1, 4, 32, 32)
+    with torch.no_grad():
+        if name == "unet":
+            model(latents, torch.zeros((1,), dtype=torch.long), torch.zeros(1, 77, 768))
+        else:
+            model.decode(latents)
+
+
+def memory_breakdown() -> dict:
+    """Anonymous (private) and file-backed resident memory of this process, in MB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {"anon": fields["Anonymous"], "file": fields["Rss"] - fields["Anonymous"]}
+
+
+def worker(name: str, path: str, checkpoint: Path, models_path: Path) -> None:
+    """Load one model one way and print the measurements as JSON."""
+    cls = model_class(name)
+    memory_before = memory_breakdown()
+    rss_before = process_rss_bytes()
+    start = time.perf_counter()
+    if path == "from_pretrained":
+        model = cls.from_pretrained(checkpoint)
+    elif path in STATE_PATHS:
+        weights = checkpoint / "diffusion_pytorch_model.bin"
+        if path == "torch.load":
+            state = torch.load(weights, map_location="cpu")
+        else:
+            state = load_or_convert_state(
+                mapped_weights_path(models_path, f"{name}-state", str(weights)),
+                lambda: torch.load(weights, map_location="cpu", weights_only=True),
+            )
+        with torch.device("meta"):
+            model = cls.from_config(cls.load_config(checkpoint))
+        model.load_state_dict(state, assign=True)
+    else:
+        model = load_or_convert(
+            mapped_weights_path(models_path, name, str(checkpoint)),
+            lambda: cls.from_pretrained(checkpoint),
+            lambda metadata: cls.from_config(json.loads(metadata["config"])),
+            diffusers_metadata,
+        )
+    model.eval().requires_grad_(False)
+    load_s = time.perf_counter() - start
+    rss_load = process_rss_bytes() - rss_before
+
+    forward(name, model)
+    memory = memory_breakdown()
+    print(json.dumps({
+        "load_s": load_s,
+        "rss_after_load_mb": rss_load / 1024 ** 2,
+        "rss_after_forward_mb": (process_rss_bytes() - rss_before) / 1024 ** 2,
+        "anon_mb": memory["anon"] - memory_before["anon"],
+        "file_backed_mb": memory["file"] - memory_before["file"],
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--unet", action="store_true", help="Also benchmark the SD UNet")
+    parser.add_argument("--format", choices=("safetensors", "bin"), default="safetensors",
+                        help="Checkpoint format from_pretrained reads")
+    parser.add_argument("--worker", nargs=4, metavar=("MODEL", "PATH", "CHECKPOINT", "MODELS_PATH"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        name, path, checkpoint, models_path = args.worker
+        worker(name, path, Path(checkpoint), Path(models_path))
+        return
+
+    root = Path(tempfile.mkdtemp())
+    rows = []
+    for name in ("vae", "taesd") + (("unet",) if args.unet else ()):
+        checkpoint = root / "checkpoints" / name
+        save_checkpoint(name, checkpoint, args.format == "safetensors")
+        for path in PATHS + (STATE_PATHS if args.format == "bin" else ()):
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.model_loading", "--worker",
+                 name, path, str(checkpoint), str(root / "models")],
+                check=True, capture_output=True, text=True,
+            )
+            rows.append({"model": name, "path": path, **json.loads(result.stdout.strip().splitlines()[-1])})
+
+    print_table(f"Model load per process from {args.format} checkpoints (deltas over the interpreter)", rows)
+
+
+if __name__ == "__main__":
+    main()
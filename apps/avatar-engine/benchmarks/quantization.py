@@ -0,0 +1,133 @@
+"""
+Latency and accuracy of the cpu-fast (dynamic int8) profile against fp32.
+
+Runs the UNet and decoder passes of one frame in fp32 and with the Linear
+layers quantized as the cpu-fast profile does, and compares the outputs.
+Also times the two ways a node gets the int8 weights: quantizing the float
+model (first start) and loading the cached quantized state dict.
+
+    python -m benchmarks.quantization --frames 20
+    python -m benchmarks.quantization --real   # needs diffusers and the checkpoints
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.musetalk.quantization import load_or_quantize, quantized_state_path
+
+from .common import (
+    RealDecoder,
+    RealUNet,
+    StandInAttentionUNet,
+    StandInDecoder,
+    load_models,
+    print_table,
+    time_call,
+)
+
+
+def psnr(reference: torch.Tensor, test: torch.Tensor) -> float:
+    """PSNR in dB of two decoder outputs in [-1, 1]."""
+    mse = float(((reference - test) / 2).pow(2).mean())
+    return float("inf") if mse == 0 else 10 * np.log10(1.0 / mse)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--real", action="store_true", help="Use the real UNet and VAE")
+    args = parser.parse_args()
+
+    cache_dir = Path(tempfile.mkdtemp())
+    if args.real:
+        unet, decoder = load_models(real=True)
+        models = {
+            "unet": (unet, RealUNet, ("unet",)),
+            "decoder": (decoder, RealDecoder, ("vae.decoder",)),
+        }
+    else:
+        torch.manual_seed(0)
+        unet = StandInAttentionUNet().eval().requires_grad_(False)
+        decoder = StandInDecoder().eval().requires_grad_(False)
+        models = {
+            "unet": (unet, StandInAttentionUNet, ("",)),
+            "decoder": (decoder, StandInDecoder, ("",)),
+        }
+
+    def get_int8(name: str, directory: Path) -> torch.nn.Module:
+        """Load int8 weights as a node does, reading the float checkpoint only on a cache miss."""
+        model, cls, targets = models[name]
+        float_path = cache_dir / f"{name}-float.pt"
+        if not float_path.exists():
+            torch.save(model.state_dict(), float_path)
+
+        def load_float():
+            float_model = cls(pretrained=False) if args.real else cls()
+            float_model.load_state_dict(torch.load(float_path, weights_only=True))
+            return float_model
+
+        build_empty = (lambda metadata: cls(pretrained=False)) if args.real else (lambda metadata: cls())
+        path = quantized_state_path(directory, name, "benchmark")
+        return load_or_quantize(path, load_float, build_empty, targets)
+
+    latents = torch.randn(1, 4, 32, 32)
+    timesteps = torch.zeros((1,), dtype=torch.long)
+    conditioning = torch.randn(1, 77, 768)
+
+    # Warm up one-time runtime initialisation, then time a first start and a cached start
+    warm_dir = Path(tempfile.mkdtemp())
+    for _ in range(2):
+        get_int8("unet", warm_dir), get_int8("decoder", warm_dir)
+
+    start = time.perf_counter()
+    get_int8("unet", cache_dir), get_int8("decoder", cache_dir)
+    quantize_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    int8_unet, int8_decoder = get_int8("unet", cache_dir), get_int8("decoder", cache_dir)
+    cached_s = time.perf_counter() - start
+
+    with torch.no_grad():
+        ref_pred = unet(latents, timesteps, conditioning)
+        ref_image = decoder(latents - 0.1 * ref_pred)
+        int8_pred = int8_unet(latents, timesteps, conditioning)
+        int8_image = int8_decoder(latents - 0.1 * int8_pred)
+
+    rows = []
+    for name, unet_model, decoder_model, pred, image in (
+        ("fp32", unet, decoder, ref_pred, ref_image),
+        ("int8 dynamic", int8_unet, int8_decoder, int8_pred, int8_image),
+    ):
+        def unet_pass():
+            with torch.no_grad():
+                return unet_model(latents, timesteps, conditioning)
+
+        def decoder_pass():
+            with torch.no_grad():
+                return decoder_model(latents)
+
+        unet_ms = time_call(unet_pass, args.frames)["mean_ms"]
+        decoder_ms = time_call(decoder_pass, args.frames)["mean_ms"]
+        rows.append({
+            "weights": name,
+            "unet_ms": unet_ms,
+            "decoder_ms": decoder_ms,
+            "frame_ms": unet_ms + decoder_ms,
+            "pred_rel_err": float((pred - ref_pred).norm() / ref_pred.norm()),
+            "frame_psnr_db": psnr(ref_image, image),
+        })
+
+    print_table("cpu-fast profile vs fp32 (one frame: UNet + decoder)", rows)
+    print_table("Getting int8 weights at startup", [
+        {"path": "load float + quantize", "seconds": quantize_s},
+        {"path": "load cached int8 state", "seconds": cached_s},
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+FLOPs and time per frame for the full_face and mouth_roi render modes.
+
+full_face runs the UNet and decoder on 32x32 latents (256x256 face crop);
+mouth_roi runs them on 16x16 latents (128x128 mouth crop). Both include
+the composite into a 512x512 frame.
+
+    python -m benchmarks.render_mode --frames 50
+    python -m benchmarks.render_mode --real   # needs diffusers and the checkpoints
+"""
+
+import argparse
+
+import numpy as np
+import torch
+from torch.utils.flop_counter import FlopCounterMode
+
+from src.musetalk.avatar_cache import PreparedAvatar
+from src.musetalk.render_buffers import RenderBuffers
+
+from .common import load_models, print_table, time_call
+
+
+def make_avatar(render_region, latent_size: int) -> PreparedAvatar:
+    """Synthetic 512x512 prepared avatar rendering the given region."""
+    rng = np.random.default_rng(0)
+    return PreparedAvatar(
+        key="benchmark",
+        image=rng.integers(0, 255, (512, 512, 3), dtype=np.uint8),
+        bbox=(160, 140, 352, 372),
+        face_region=(122, 94, 390, 418),
+        landmarks=None,
+        mouth_mask=np.zeros((256, 256), dtype=np.uint8),
+        ref_latents=rng.standard_normal((1, 4, latent_size, latent_size)).astype(np.float32),
+        render_region=render_region,
+    )
+
+
+def run_mode(name: str, avatar: PreparedAvatar, unet, decoder, frames: int, mouth_only: bool) -> dict:
+    """Measure one render mode."""
+    ref_latents = torch.from_numpy(avatar.ref_latents)
+    latent_h, latent_w = ref_latents.shape[-2:]
+    buffers = RenderBuffers(
+        avatar,
+        ref_latents,
+        decode_size=(latent_w * 8, latent_h * 8),
+        mouth_start=0.0 if mouth_only else 0.6,
+        feather_edges=mouth_only,
+    )
+
+    def render():
+        with torch.no_grad():
+            noisy = buffers.prepare_latents(0.1)
+            noise_pred = unet(noisy, buffers.timesteps, buffers.text_embeddings)
+            decoded = decoder(buffers.apply_prediction(noise_pred))
+        return buffers.composite(decoded)
+
+    with FlopCounterMode(display=False) as counter:
+        render()
+
+    timing = time_call(render, frames)
+    return {
+        "mode": name,
+        "latents": f"{latent_w}x{latent_h}",
+        "GFLOPs/frame": counter.get_total_flops() / 1e9,
+        "mean_ms": timing["mean_ms"],
+        "p95_ms": timing["p95_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--real", action="store_true", help="Use the real UNet and VAE")
+    args = parser.parse_args()
+
+    unet, decoder = load_models(args.real)
+
+    rows = [
+        run_mode("full_face", make_avatar(None, 32), unet, decoder, args.frames, mouth_only=False),
+        run_mode("mouth_roi", make_avatar((186, 250, 326, 390), 16), unet, decoder, args.frames, mouth_only=True),
+    ]
+    print_table("Render modes (UNet + decoder + composite)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Decode time of the full SD VAE decoder and the distilled TAESD decoder.
+
+Builds both decoders from their architectures (random weights, no download)
+and times one frame's decode for the full_face (32x32 latents, 256x256
+output) and mouth_roi (16x16 latents, 128x128 output) render modes. With
+--pretrained the real checkpoints are loaded and the TAESD output is also
+compared with the full decoder's.
+
+    python -m benchmarks.vae_decoder --iterations 5
+    python -m benchmarks.vae_decoder --pretrained   # downloads sd-vae-ft-mse and taesd
+"""
+
+import argparse
+
+import numpy as np
+import torch
+from torch.utils.flop_counter import FlopCounterMode
+
+from .common import print_table, time_call
+
+
+def build_decoders(pretrained: bool):
+    """Get the (full, tiny) autoencoders in eval mode."""
+    from diffusers import AutoencoderKL, AutoencoderTiny
+
+    if pretrained:
+        full = AutoencoderKL.from_pretrained("stabilityai/sd-vae-ft-mse")
+        tiny = AutoencoderTiny.from_pretrained("madebyollin/taesd")
+    else:
+        torch.manual_seed(0)
+        # The sd-vae-ft-mse architecture; AutoencoderTiny's defaults are TAESD's
+        full = AutoencoderKL(
+            down_block_types=("DownEncoderBlock2D",) * 4,
+            up_block_types=("UpDecoderBlock2D",) * 4,
+            block_out_channels=(128, 256, 512, 512),
+            layers_per_block=2,
+            latent_channels=4,
+            scaling_factor=0.18215,
+        )
+        tiny = AutoencoderTiny()
+    return full.eval().requires_grad_(False), tiny.eval().requires_grad_(False)
+
+
+def decode(vae, latents: torch.Tensor) -> torch.Tensor:
+    """Decode scaled latents to [-1, 1] images, as the engine's vae_decoder component does."""
+    with torch.no_grad():
+        return vae.decode(latents / vae.config.scaling_factor).sample
+
+
+def psnr(reference: torch.Tensor, test: torch.Tensor) -> float:
+    """PSNR in dB of two decoder outputs in [-1, 1]."""
+    mse = float(((reference.clamp(-1, 1) - test.clamp(-1, 1)) / 2).pow(2).mean())
+    return float("inf") if mse == 0 else 10 * np.log10(1.0 / mse)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pretrained", action="store_true", help="Load the real checkpoints")
+    args = parser.parse_args()
+
+    full, tiny = build_decoders(args.pretrained)
+    decoders = {"full": full, "tiny": tiny}
+
+    rows = []
+    for mode, latent_size in (("full_face", 32), ("mouth_roi", 16)):
+        torch.manual_seed(1)
+        latents = torch.randn(1, 4, latent_size, latent_size)
+        reference = decode(full, latents)
+        for name, vae in decoders.items():
+            with FlopCounterMode(display=False) as counter:
+                output = decode(vae, latents)
+            timing = time_call(lambda: decode(vae, latents), args.iterations, warmup=1)
+            row = {
+                "mode": mode,
+                "decoder": name,
+                "params_M": sum(p.numel() for p in vae.decoder.parameters()) / 1e6,
+                "GFLOPs": counter.get_total_flops() / 1e9,
+                "mean_ms": timing["mean_ms"],
+                "p95_ms": timing["p95_ms"],
+            }
+            if args.pretrained:
+                row["psnr_vs_full_db"] = psnr(reference, output)
+            rows.append(row)
+
+    print_table("VAE decode per frame", rows)
+
+
+if __name__ == "__main__":
+    main()
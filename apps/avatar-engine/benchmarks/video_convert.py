@@ -0,0 +1,96 @@
+"""
+Per-frame CPU cost of preparing rendered frames for LiveKit.
+
+Compares the previous stream_frame conversion (BGR->RGB, tobytes, RGB24
+VideoFrame, then LiveKit's own RGB24->I420 conversion, run here through
+VideoFrame.convert as a stand-in for what capture_frame does natively)
+with I420FramePool, which writes I420 straight into a pooled buffer.
+
+    python -m benchmarks.video_convert --seconds 10
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from livekit import rtc
+
+from src.streaming.video_buffers import I420FramePool
+
+from .common import print_table
+
+
+def legacy_convert(frame: np.ndarray) -> rtc.VideoFrame:
+    """The previous conversion, including LiveKit's RGB24 -> I420 step."""
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width = frame_rgb.shape[:2]
+    video_frame = rtc.VideoFrame(
+        width=width,
+        height=height,
+        type=rtc.VideoBufferType.RGB24,
+        data=frame_rgb.tobytes(),
+    )
+    return video_frame.convert(rtc.VideoBufferType.I420)
+
+
+def measure(name: str, convert, frames, fps: int) -> dict:
+    """CPU time, wall time and allocated bytes per converted frame."""
+    for frame in frames[:10]:
+        convert(frame)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for frame in frames:
+        convert(frame)
+    cpu = (time.process_time() - cpu_start) / len(frames)
+    wall = (time.perf_counter() - wall_start) / len(frames)
+
+    peaks = []
+    tracemalloc.start()
+    for frame in frames[:50]:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        convert(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    return {
+        "path": name,
+        "cpu_ms/frame": cpu * 1000,
+        "wall_ms/frame": wall * 1000,
+        f"core_%@{fps}fps": cpu * fps * 100,
+        "alloc_KB/frame": float(np.mean(peaks)) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--size", type=int, default=512)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    count = int(args.seconds * args.fps)
+    sources = [rng.integers(0, 255, (args.size, args.size, 3), dtype=np.uint8) for _ in range(3)]
+    frames = [sources[i % len(sources)] for i in range(count)]
+
+    pool = I420FramePool((args.size, args.size), slots=5)
+
+    def pooled_convert(frame: np.ndarray) -> rtc.VideoFrame:
+        # Released right away, as the publisher does once a frame is no longer held
+        video_frame = pool.convert(frame)
+        pool.release(video_frame)
+        return video_frame
+
+    rows = [
+        measure("rgb24 + tobytes", legacy_convert, frames, args.fps),
+        measure("pooled i420", pooled_convert, frames, args.fps),
+    ]
+    print_table(f"Frame conversion, {args.size}x{args.size} at {args.fps} fps", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,29 @@ Provides REST API endpoints for avatar session management and real-time control.
 
 import asyncio
 import io
+import math
+import time
 from pathlib import Path
 from typing import Dict, Optional, List
 import uuid
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from loguru import logger
 
 from ..core.avatar_session import AvatarSession
+from ..core.capacity import CapacityBudget
 from ..core.config import AvatarConfig
+from ..core.session_pool import SessionPool
+from ..musetalk.avatar_cache import get_avatar_cache
+from ..musetalk.mouth_patch_cache import get_mouth_patch_cache_stats
+from ..musetalk.batch_scheduler import get_batch_scheduler
+from ..musetalk.inference_executor import get_inference_executor
+from ..musetalk.model_registry import get_model_registry
+from ..musetalk.model_warmup import get_model_warmup_status
+from ..musetalk.video_avatar import check_avatar_source
+from ..utils.loop_monitor import get_loop_lag_monitor
 
 
 # Pydantic models for API requests/responses
@@ -24,6 +37,11 @@ class CreateAvatarRequest(BaseModel):
     avatar_image_url: Optional[str] = Field(default=None, description="Avatar image URL")
     emotion: str = Field(default="neutral", description="Initial emotion")
     emotion_intensity: float = Field(default=0.5, ge=0.0, le=1.0, description="Emotion intensity")
+    vae_decoder: Optional[str] = Field(
+        default=None,
+        pattern="^(full|tiny)$",
+        description="Frame decoder for this session (full or tiny), overriding VAE_DECODER"
+    )
 
 
 class AvatarSessionResponse(BaseModel):
@@ -34,6 +52,8 @@ class AvatarSessionResponse(BaseModel):
     current_emotion: str
     avatar_image: Optional[str]
     session_start_time: float
+    init_state: str = Field(description="Bring-up state: pending, initializing, ready or failed")
+    init_error: Optional[str] = Field(default=None, description="Why initialization failed")
 
 
 class StartLiveKitStreamRequest(BaseModel):
@@ -64,17 +84,34 @@ class AvatarSessionManager:
         self.config = config
         self.sessions: Dict[str, AvatarSession] = {}
         self.max_sessions = config.max_concurrent_sessions
+        
+        # Sessions are admitted while their render demand fits the measured throughput
+        self.capacity = CapacityBudget(config)
+        
+        # Sessions for the default avatar are handed out ready from the pool
+        self.pool = SessionPool(config, lambda: self.max_sessions - len(self.sessions))
+    
+    def start(self) -> None:
+        """Start filling the session pool."""
+        self.pool.start()
+    
+    async def shutdown(self) -> None:
+        """Stop the session pool and its idle sessions."""
+        await self.pool.stop()
     
     async def create_session(
         self, 
         avatar_image_path: Optional[Path] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        vae_decoder: Optional[str] = None
     ) -> AvatarSession:
         """Create a new avatar session."""
         if len(self.sessions) >= self.max_sessions:
+            retry_after = self.capacity.estimate_retry_after(self.sessions.values())
             raise HTTPException(
                 status_code=429,
-                detail=f"Maximum concurrent sessions ({self.max_sessions}) reached"
+                detail=f"Maximum concurrent sessions ({self.max_sessions}) reached",
+                headers={"Retry-After": str(math.ceil(retry_after))}
             )
         
         # Generate session ID if not provided
@@ -85,9 +122,38 @@ class AvatarSessionManager:
         if avatar_image_path is None:
             avatar_image_path = self.config.default_avatar_image
         
-        # Create and initialize session
-        session = AvatarSession(session_id, avatar_image_path, self.config)
-        await session.initialize()
+        # Per-session render settings override the service defaults
+        config = self.config
+        if vae_decoder is not None and vae_decoder != config.vae_decoder:
+            config = config.model_copy(update={"vae_decoder": vae_decoder})
+        
+        # Reject before any setup when the new session's frames would not fit
+        retry_after = self.capacity.check_admission(self.sessions.values(), config)
+        if retry_after is not None:
+            logger.warning(f"Rejecting new session: render capacity exhausted, retry in {retry_after:.0f}s")
+            raise HTTPException(
+                status_code=429,
+                detail="Render capacity exhausted",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+        
+        # Default sessions come ready from the pool; others are built here
+        session = None
+        if config is self.config and avatar_image_path == self.config.default_avatar_image:
+            session = self.pool.acquire()
+        
+        if session is not None:
+            session.claim(session_id)
+        else:
+            # A bad source fails here rather than in the background initialization
+            try:
+                await asyncio.to_thread(check_avatar_source, avatar_image_path)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            
+            # Initialization overlaps the room connection of the streaming request
+            session = AvatarSession(session_id, avatar_image_path, config)
+            session.start_initialize()
         
         # Store session
         self.sessions[session_id] = session
@@ -110,6 +176,7 @@ class AvatarSessionManager:
             session = self.sessions[session_id]
             await session.stop()
             del self.sessions[session_id]
+            self.capacity.record_session_end(time.time() - session.state.session_start_time)
             logger.info(f"Deleted avatar session: {session_id}")
     
     def list_sessions(self) -> List[Dict]:
@@ -121,6 +188,11 @@ class AvatarSessionManager:
 session_manager: Optional[AvatarSessionManager] = None
 
 
+def get_session_manager() -> Optional[AvatarSessionManager]:
+    """Get the session manager created with the avatar router."""
+    return session_manager
+
+
 def create_avatar_router(config: AvatarConfig) -> APIRouter:
     """Create the avatar API router with configuration."""
     global session_manager
@@ -142,7 +214,8 @@ def create_avatar_router(config: AvatarConfig) -> APIRouter:
             # Create session
             session = await session_manager.create_session(
                 avatar_image_path=avatar_image_path,
-                session_id=request.avatar_id
+                session_id=request.avatar_id,
+                vae_decoder=request.vae_decoder
             )
             
             # Set initial emotion
@@ -151,6 +224,9 @@ def create_avatar_router(config: AvatarConfig) -> APIRouter:
             
             return AvatarSessionResponse(**session.get_session_info())
             
+        except HTTPException:
+            # Admission rejections keep their status and Retry-After
+            raise
         except Exception as e:
             logger.error(f"Failed to create avatar session: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -187,8 +263,16 @@ def create_avatar_router(config: AvatarConfig) -> APIRouter:
             
             return {"message": f"LiveKit streaming started for session {session_id}"}
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to start LiveKit streaming: {e}")
+            if session.init_state == "failed":
+                # The avatar could not be prepared; retrying the stream will not help
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Avatar session failed to initialize: {session.init_error}"
+                ) from e
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.post("/{session_id}/emotion")
@@ -281,22 +365,48 @@ def create_system_router() -> APIRouter:
             "active_sessions": len(session_manager.sessions) if session_manager else 0
         }
     
+    @router.get("/ready")
+    async def readiness_check():
+        """Readiness endpoint: 503 until every render model is loaded and warm."""
+        status = get_model_warmup_status()
+        if status is None:
+            # Warmup disabled: models load on the first session instead
+            status = {"ready": session_manager is not None, "warmup": "disabled", "models": {}}
+        
+        return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+    
     @router.get("/metrics")
     async def system_metrics():
         """Get system-wide metrics."""
         if not session_manager:
             return {"error": "Session manager not initialized"}
         
+        config = session_manager.config
+        executor = get_inference_executor(config.inference_workers)
+        batch_scheduler = get_batch_scheduler(executor, config.batch_max_size, config.batch_max_wait_ms)
+        
         total_sessions = len(session_manager.sessions)
         active_sessions = sum(1 for s in session_manager.sessions.values() if s.state.is_active)
         streaming_sessions = sum(1 for s in session_manager.sessions.values() if s.state.is_streaming)
+        capacity_load = session_manager.capacity.load(session_manager.sessions.values())
         
         return {
             "total_sessions": total_sessions,
             "active_sessions": active_sessions,
             "streaming_sessions": streaming_sessions,
             "max_sessions": session_manager.max_sessions,
-            "system_load": active_sessions / session_manager.max_sessions if session_manager.max_sessions > 0 else 0
+            "session_pool": session_manager.pool.get_stats(),
+            "system_load": capacity_load if capacity_load is not None else (
+                active_sessions / session_manager.max_sessions if session_manager.max_sessions > 0 else 0
+            ),
+            "capacity": session_manager.capacity.get_stats(session_manager.sessions.values()),
+            "models": get_model_registry().get_stats(),
+            "warmup": get_model_warmup_status(),
+            "inference": executor.get_stats(),
+            "batching": batch_scheduler.get_stats() if config.enable_micro_batching else {},
+            "avatar_cache": get_avatar_cache(config.avatar_cache_path, config.avatar_cache_size).get_stats(),
+            "mouth_cache": get_mouth_patch_cache_stats(),
+            "event_loop": get_loop_lag_monitor().get_stats(),
         }
     
     return router
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Audio Frame Chunker
+Slices streamed PCM into one window per video frame, independent of how the client packetizes audio.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+
+@dataclass
+class AudioFrameWindow:
+    """The audio belonging to one video frame, with context on either side."""
+    index: int
+    timestamp: float
+    start_sample: int
+    samples: np.ndarray        # the frame's own samples (533 or 534 at 16 kHz / 30 fps)
+    left_context: np.ndarray   # samples before the frame, zero-padded at stream start
+    right_context: np.ndarray  # samples after the frame
+
+    @property
+    def end_sample(self) -> int:
+        """Absolute index one past the frame's last sample."""
+        return self.start_sample + len(self.samples)
+
+    @property
+    def context_samples(self) -> np.ndarray:
+        """Left context, frame samples and right context as one array."""
+        return np.concatenate([self.left_context, self.samples, self.right_context])
+
+
+class AudioFrameChunker:
+    """
+    Cadence chunker from arbitrary PCM payloads to video-frame windows.
+
+    Frame ``k`` owns samples ``[k * sr // fps, (k + 1) * sr // fps)``, so
+    frames alternate between 533 and 534 samples at 16 kHz / 30 fps and
+    never drift from the audio clock. A window is emitted once its right
+    context has arrived, so every frame interval of audio yields exactly
+    one window regardless of payload size.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        fps: int = 30,
+        left_context: int = 0,
+        right_context: int = 0,
+    ):
+        """
+        Initialize the chunker.
+
+        Args:
+            sample_rate: Input sample rate in Hz
+            fps: Video frame rate the windows are aligned to
+            left_context: Samples of context kept before each frame
+            right_context: Samples of context required after each frame
+        """
+        self.sample_rate = sample_rate
+        self.fps = fps
+        self.left_context = left_context
+        self.right_context = right_context
+
+        self._buffer = np.zeros(
+            max(2 * sample_rate, 4 * (left_context + right_context + sample_rate // fps)),
+            dtype=np.float32,
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget buffered audio and restart the frame clock at zero."""
+        # The buffer holds absolute samples [_buffer_offset, total_samples)
+        self._buffer_offset = 0
+        self._length = 0
+        self._partial_byte = b""
+        self.total_samples = 0
+        self.frames_emitted = 0
+
+    @property
+    def samples_per_frame(self) -> float:
+        """Average samples per video frame."""
+        return self.sample_rate / self.fps
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether received audio is still waiting for its window to be emitted."""
+        return self.total_samples > self._frame_start(self.frames_emitted)
+
+    def _frame_start(self, index: int) -> int:
+        return index * self.sample_rate // self.fps
+
+    def push_bytes(self, audio_data: bytes) -> List[AudioFrameWindow]:
+        """
+        Add 16-bit little-endian PCM bytes and return every window that became complete.
+
+        An odd trailing byte is kept until the next payload completes the sample.
+        """
+        data = self._partial_byte + audio_data
+        usable = len(data) - len(data) % 2
+        self._partial_byte = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+        return self.push(samples)
+
+    def push(self, samples: np.ndarray) -> List[AudioFrameWindow]:
+        """
+        Add float32 samples in [-1, 1] and return every window that became complete.
+
+        Returns:
+            Windows for newly complete video frames, in frame order
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        windows = []
+        offset = 0
+        while offset < len(samples):
+            # Emit between slices so arbitrarily large pushes fit the buffer
+            space = len(self._buffer) - self._length
+            chunk = samples[offset:offset + space]
+            self._buffer[self._length:self._length + len(chunk)] = chunk
+            self._length += len(chunk)
+            self.total_samples += len(chunk)
+            offset += len(chunk)
+            windows.extend(self._emit_windows())
+        return windows
+
+    def flush(self) -> List[AudioFrameWindow]:
+        """
+        Pad pending audio with silence and emit its windows, e.g. at the end of an utterance.
+
+        The padding becomes part of the stream, so later audio stays on the frame clock.
+        """
+        if not self.has_pending:
+            return []
+
+        # Complete the frame holding the last sample, plus its right context
+        last_frame = (self.total_samples * self.fps - 1) // self.sample_rate
+        target = self._frame_start(last_frame + 1) + self.right_context
+        return self.push(np.zeros(target - self.total_samples, dtype=np.float32))
+
+    def _emit_windows(self) -> List[AudioFrameWindow]:
+        """Emit windows for frames whose right context has arrived, then compact the buffer."""
+        windows = []
+
+        while True:
+            index = self.frames_emitted
+            start = self._frame_start(index)
+            end = self._frame_start(index + 1)
+            if end + self.right_context > self.total_samples:
+                break
+
+            windows.append(AudioFrameWindow(
+                index=index,
+                timestamp=start / self.sample_rate,
+                start_sample=start,
+                samples=self._slice(start, end),
+                left_context=self._slice(start - self.left_context, start),
+                right_context=self._slice(end, end + self.right_context),
+            ))
+            self.frames_emitted += 1
+
+        # Drop samples no future window can reach
+        keep_from = max(self._frame_start(self.frames_emitted) - self.left_context, self._buffer_offset)
+        drop = keep_from - self._buffer_offset
+        if drop > 0:
+            self._length -= drop
+            self._buffer[:self._length] = self._buffer[drop:drop + self._length]
+            self._buffer_offset = keep_from
+
+        return windows
+
+    def _slice(self, start: int, end: int) -> np.ndarray:
+        """Copy absolute samples [start, end), zero-filled before the stream start."""
+        out = np.zeros(end - start, dtype=np.float32)
+        first = max(start, 0)
+        out[first - start:] = self._buffer[first - self._buffer_offset:end - self._buffer_offset]
+        return out
@@ -6,12 +6,15 @@ Orchestrates the complete avatar pipeline: lip-sync, emotion control, and stream
 import asyncio
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field
 
 from loguru import logger
 
 from .config import AvatarConfig
+from .audio_chunker import AudioFrameChunker, AudioFrameWindow
+from .voice_activity import EnergyVAD
+from .quality_controller import QualityController
 from ..musetalk.lip_sync_engine import MuseTalkLipSyncEngine
 from ..streaming.livekit_streamer import LiveKitStreamer
 
@@ -55,15 +58,55 @@ class AvatarSession:
         self.lip_sync_engine = MuseTalkLipSyncEngine(self.config)
         self.streamer = LiveKitStreamer(self.config)
         
-        # Audio processing
+        # Audio processing: payloads are sliced into one window per video frame
+        frontend = self.lip_sync_engine.audio_frontend
+        self.audio_chunker = AudioFrameChunker(
+            sample_rate=self.config.audio_sample_rate,
+            fps=self.config.video_fps,
+            left_context=frontend.lookbehind_samples,
+            right_context=frontend.lookahead_samples,
+        )
         self.audio_queue = asyncio.Queue(maxsize=100)
+        self.last_audio_time = time.monotonic()
+        self.last_voice_time = time.monotonic()
+        self.frame_interval = 1.0 / self.config.video_fps
+        
+        # Silent frames skip inference and stream the avatar's idle loop instead
+        self.vad = EnergyVAD(
+            threshold_db=self.config.vad_threshold_db,
+            hangover_frames=int(round(self.config.vad_hangover_ms * self.config.video_fps / 1000)),
+        )
         self.processing_task: Optional[asyncio.Task] = None
         
+        # Bring-up: engine setup runs as a task so the room connection can overlap it
+        self._init_task: Optional[asyncio.Task] = None
+        self.bring_up_start = time.monotonic()
+        self.stage_times: Dict[str, float] = {}
+        
+        # Half-rate rendering: odd frames are synthesized between the rendered ones
+        self.half_rate = self.config.interframe_mode != "off"
+        self._inbetween_pending = False
+        
+        # Render quality steps down when frames take longer than the frame budget
+        self.quality = QualityController(
+            fps=self.config.video_fps / 2 if self.half_rate else self.config.video_fps,
+            window_frames=self.config.quality_window_frames,
+            degrade_ratio=self.config.quality_degrade_ratio,
+            recover_ratio=self.config.quality_recover_ratio,
+            enabled=self.config.adaptive_quality,
+        )
+        
         # Performance tracking
         self.metrics = {
             "session_start_time": time.time(),
             "frames_generated": 0,
             "audio_chunks_processed": 0,
+            "audio_frames_processed": 0,
+            "audio_frames_dropped": 0,
+            "idle_frames_streamed": 0,
+            "frames_interpolated": 0,
+            "hibernations": 0,
+            "resumes": 0,
             "errors_count": 0,
         }
         
@@ -73,50 +116,140 @@ class AvatarSession:
         
         logger.info(f"AvatarSession created: {session_id}")
     
+    def start_initialize(self) -> None:
+        """Start initializing the session components in the background, if not already started."""
+        if self._init_task is None:
+            self._init_task = asyncio.create_task(self._initialize())
+    
     async def initialize(self) -> None:
-        """Initialize all session components."""
+        """Initialize all session components, or wait for an initialization already started."""
+        self.start_initialize()
+        await asyncio.shield(self._init_task)
+    
+    @property
+    def init_state(self) -> str:
+        """Bring-up state: pending, initializing, ready or failed."""
+        if self._init_task is None:
+            return "ready" if self.state.is_active else "pending"
+        if not self._init_task.done():
+            return "initializing"
+        if self._init_task.cancelled() or self._init_task.exception() is not None:
+            return "failed"
+        return "ready"
+    
+    @property
+    def init_error(self) -> Optional[str]:
+        """Why initialization failed, or None."""
+        if self._init_task is None or not self._init_task.done():
+            return None
+        if self._init_task.cancelled():
+            return "Initialization was cancelled"
+        error = self._init_task.exception()
+        return f"{type(error).__name__}: {error}" if error is not None else None
+    
+    async def _initialize(self) -> None:
+        """Initialize the lip-sync engine and prepare the avatar, timing each stage."""
         try:
             logger.info(f"Initializing avatar session: {self.session_id}")
             
             # Initialize lip-sync engine
+            start_time = time.perf_counter()
             await self.lip_sync_engine.initialize()
+            self.stage_times["engine_init"] = time.perf_counter() - start_time
             
             # Set avatar image
             if self.state.avatar_image_path:
+                start_time = time.perf_counter()
                 await self.lip_sync_engine.set_avatar_image(self.state.avatar_image_path)
+                self.stage_times["avatar_prepare"] = time.perf_counter() - start_time
             
             self.state.is_active = True
-            logger.info(f"Avatar session initialized: {self.session_id}")
+            logger.info(
+                f"Avatar session initialized: {self.session_id} "
+                f"(engine {self.stage_times['engine_init']:.2f}s, "
+                f"avatar {self.stage_times.get('avatar_prepare', 0.0):.2f}s)"
+            )
             
         except Exception as e:
             logger.error(f"Failed to initialize avatar session: {e}")
             raise
     
+    def claim(self, session_id: str) -> None:
+        """
+        Hand a pre-initialized session out under a caller's session ID.
+        
+        Args:
+            session_id: ID the session is known by from now on
+        """
+        self.session_id = session_id
+        self.state.session_start_time = time.time()
+        self.metrics["session_start_time"] = self.state.session_start_time
+        
+        # The pool paid for engine setup; the caller's bring-up starts here
+        self.bring_up_start = time.monotonic()
+        self.stage_times = {}
+        logger.info(f"Pooled avatar session claimed: {session_id}")
+    
     async def start_livekit_streaming(
         self,
         livekit_url: str,
         livekit_token: str,
         participant_identity: str = "heallink-avatar"
     ) -> None:
-        """Start LiveKit streaming and audio processing."""
+        """
+        Start LiveKit streaming and audio processing.
+        
+        The room connection runs concurrently with engine initialization and
+        avatar preparation, if those have not finished yet.
+        """
         try:
             logger.info(f"Starting LiveKit streaming for session: {self.session_id}")
+            start_time = time.perf_counter()
             
-            # Connect to LiveKit room
-            await self.streamer.connect_to_room(
-                livekit_url, 
-                livekit_token,
-                participant_identity
+            # Connect to LiveKit room while the engine comes up
+            self.start_initialize()
+            connect_task = asyncio.create_task(
+                self.streamer.connect_to_room(
+                    livekit_url, 
+                    livekit_token,
+                    participant_identity
+                )
             )
+            try:
+                await asyncio.wait({self._init_task, connect_task}, return_when=asyncio.FIRST_EXCEPTION)
+            except asyncio.CancelledError:
+                connect_task.cancel()
+                raise
+            
+            if self._init_task.done() and self.init_state == "failed":
+                # No point waiting out the connection retries for a session that cannot render
+                connect_task.cancel()
+                try:
+                    await connect_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+                await self.streamer.disconnect()
+                await self._init_task
+            
+            # A failed connect has already disconnected itself
+            await connect_task
+            self.stage_times.update(self.streamer.connect_times)
+            await asyncio.shield(self._init_task)
             
-            # Start streaming
+            # Start streaming; the idle loop fills gaps between utterances, never slow renders mid-speech
+            self.streamer.set_idle_source(self.lip_sync_engine.next_idle_frame, lambda: self.vad.is_open)
             await self.streamer.start_streaming()
             
             # Start audio processing loop
+            self.last_voice_time = time.monotonic()
             self.processing_task = asyncio.create_task(self._audio_processing_loop())
             
             self.state.is_streaming = True
-            logger.info(f"LiveKit streaming started for session: {self.session_id}")
+            self.stage_times["stream_start"] = time.perf_counter() - start_time
+            logger.info(
+                f"LiveKit streaming started for session: {self.session_id} "
+                f"in {self.stage_times['stream_start']:.2f}s"
+            )
             
         except Exception as e:
             logger.error(f"Failed to start LiveKit streaming: {e}")
@@ -128,19 +261,63 @@ class AvatarSession:
         
         while self.state.is_active and self.state.is_streaming:
             try:
-                # Get audio chunk from queue (with timeout)
+                # Get the next frame's audio window from queue (with timeout)
                 try:
-                    audio_data = await asyncio.wait_for(
+                    window = await asyncio.wait_for(
                         self.audio_queue.get(), 
-                        timeout=0.1
+                        timeout=self.frame_interval
                     )
                 except asyncio.TimeoutError:
+                    await self._handle_audio_gap()
+                    continue
+                
+                self.metrics["audio_frames_processed"] += 1
+                
+                # Render no further ahead than the publisher's queue (a render
+                # that completes a pending in-between frame queues two frames)
+                await self.streamer.wait_for_space(2 if self._inbetween_pending else 1)
+                
+                was_speaking = self.vad.is_open
+                if not self.vad.update(window.samples):
+                    # Silence: no inference, just the next idle frame
+                    if was_speaking:
+                        self._end_utterance()
+                    await self._stream_idle_frame()
+                    await self._maybe_hibernate()
                     continue
                 
-                # Process audio and generate lip-synced frame
-                frame = await self.lip_sync_engine.process_audio_chunk(audio_data)
+                # Speech after a long silence: reload the render state first
+                self.last_voice_time = time.monotonic()
+                if self.lip_sync_engine.is_hibernated:
+                    await self._resume()
+                
+                # At half rate odd frames wait for the following frame to be rendered
+                render_index = window.index
+                if self.half_rate:
+                    if window.index % 2:
+                        self._inbetween_pending = True
+                        continue
+                    render_index = window.index // 2
+                
+                # At REDUCED_FPS every other render is skipped; the publisher repeats the last frame
+                if not self.quality.should_render(render_index):
+                    continue
+                
+                # Render exactly one lip-synced frame per frame interval of audio
+                render_start = time.perf_counter()
+                frame = await self.lip_sync_engine.process_audio_window(window)
+                tier = self.quality.record(time.perf_counter() - render_start)
+                if tier is not None:
+                    self.lip_sync_engine.set_quality_tier(tier)
                 
                 if frame is not None:
+                    # The frame before this one is synthesized between it and the last render
+                    if self._inbetween_pending:
+                        inbetween = await self.lip_sync_engine.interpolate_frame()
+                        if inbetween is not None and await self.streamer.stream_frame(inbetween):
+                            self.metrics["frames_interpolated"] += 1
+                    self._inbetween_pending = False
+                    
                     # Stream frame to LiveKit
                     success = await self.streamer.stream_frame(frame)
                     
@@ -151,9 +328,7 @@ class AvatarSession:
                         if self.on_frame_generated:
                             await self.on_frame_generated(frame)
                     
-                    logger.debug(f"Processed audio chunk, frame streamed: {success}")
-                
-                self.metrics["audio_chunks_processed"] += 1
+                    logger.debug(f"Processed audio frame {window.index}, frame streamed: {success}")
                 
             except Exception as e:
                 logger.error(f"Error in audio processing loop: {e}")
@@ -170,24 +345,81 @@ class AvatarSession:
     
     async def process_audio(self, audio_data: bytes) -> None:
         """
-        Add audio data to processing queue.
+        Slice audio data into per-frame windows and add them to the processing queue.
         
         Args:
-            audio_data: Raw audio bytes (16kHz, 16-bit)
+            audio_data: Raw audio bytes (16kHz, 16-bit), any payload size
         """
         if not self.state.is_active:
             return
         
         try:
-            # Add to queue (non-blocking)
-            if not self.audio_queue.full():
-                await self.audio_queue.put(audio_data)
-            else:
-                logger.warning("Audio queue full, dropping audio chunk")
+            self.last_audio_time = time.monotonic()
+            self.metrics["audio_chunks_processed"] += 1
+            self._enqueue_windows(self.audio_chunker.push_bytes(audio_data))
         
         except Exception as e:
             logger.error(f"Failed to queue audio data: {e}")
     
+    async def _handle_audio_gap(self) -> None:
+        """Render the tail of an utterance once audio stops arriving, then let the gate close."""
+        idle_ms = (time.monotonic() - self.last_audio_time) * 1000
+        if idle_ms < self.config.audio_flush_ms:
+            return
+        
+        if self.audio_chunker.has_pending:
+            self._enqueue_windows(self.audio_chunker.flush())
+            return
+        
+        # The publisher streams the idle loop while no frames arrive
+        if self.vad.is_open:
+            self.vad.reset()
+            self._end_utterance()
+        
+        await self._maybe_hibernate()
+    
+    async def _maybe_hibernate(self) -> None:
+        """Release the engine's render state once the session has been silent for hibernate_after_s."""
+        if self.config.hibernate_after_s <= 0 or self.lip_sync_engine.is_hibernated:
+            return
+        if time.monotonic() - self.last_voice_time < self.config.hibernate_after_s:
+            return
+        
+        await self.lip_sync_engine.hibernate()
+        if self.lip_sync_engine.is_hibernated:
+            self.metrics["hibernations"] += 1
+            logger.info(f"Session hibernated after {self.config.hibernate_after_s:.0f}s without speech: {self.session_id}")
+    
+    async def _resume(self) -> None:
+        """Resume a hibernated engine, re-preparing the avatar if its artifacts are gone."""
+        try:
+            await self.lip_sync_engine.resume()
+        except Exception as e:
+            logger.error(f"Failed to resume session {self.session_id}, re-preparing the avatar: {e}")
+            await self.lip_sync_engine.set_avatar_image(self.state.avatar_image_path)
+        self.metrics["resumes"] += 1
+    
+    def _end_utterance(self) -> None:
+        """Reset per-utterance render state once speech stops."""
+        self.lip_sync_engine.restart_idle_loop()
+        self.lip_sync_engine.reset_interframe()
+        self._inbetween_pending = False
+    
+    async def _stream_idle_frame(self) -> None:
+        """Stream the next pre-rendered idle frame for a silent audio frame."""
+        frame = self.lip_sync_engine.next_idle_frame()
+        if frame is not None and await self.streamer.stream_frame(frame):
+            self.metrics["idle_frames_streamed"] += 1
+    
+    def _enqueue_windows(self, windows: List[AudioFrameWindow]) -> None:
+        """Add audio frame windows to the queue (non-blocking)."""
+        for window in windows:
+            if not self.audio_queue.full():
+                self.audio_queue.put_nowait(window)
+            else:
+                self.metrics["audio_frames_dropped"] += 1
+                logger.warning("Audio queue full, dropping audio frame")
+    
     async def set_emotion(self, emotion: str, intensity: float = 0.5) -> None:
         """
         Set avatar facial expression/emotion.
@@ -204,8 +436,8 @@ class AvatarSession:
             self.state.current_emotion = emotion
             self.state.emotion_intensity = intensity
             
-            # TODO: Implement emotion blending in MuseTalk engine
-            # For now, this is stored in state and could affect future processing
+            # Blended into the following frames' latents; no extra inference
+            self.lip_sync_engine.set_emotion(emotion, intensity)
             
             logger.info(f"Avatar emotion set: {emotion} ({intensity})")
             
@@ -222,6 +454,10 @@ class AvatarSession:
         try:
             logger.info(f"Updating avatar image: {image_path}")
             
+            # The initial avatar must not land after this one
+            if self._init_task is not None:
+                await asyncio.shield(self._init_task)
+            
             # Update lip-sync engine
             await self.lip_sync_engine.set_avatar_image(image_path)
             
@@ -264,6 +500,18 @@ class AvatarSession:
         # Stop streaming first
         await self.stop_streaming()
         
+        # Abandon a bring-up still in progress
+        if self._init_task is not None:
+            if not self._init_task.done():
+                self._init_task.cancel()
+            try:
+                await self._init_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Already logged when initialization failed
+                pass
+        
         # Cleanup components
         await self.lip_sync_engine.cleanup()
         
@@ -277,7 +525,8 @@ class AvatarSession:
             f"Avatar session stopped: {self.session_id}. "
             f"Duration: {session_duration:.2f}s, "
             f"Frames: {self.metrics['frames_generated']}, "
-            f"Audio chunks: {self.metrics['audio_chunks_processed']}"
+            f"Audio chunks: {self.metrics['audio_chunks_processed']}, "
+            f"Audio frames: {self.metrics['audio_frames_processed']}"
         )
     
     def get_session_metrics(self) -> Dict[str, Any]:
@@ -295,7 +544,15 @@ class AvatarSession:
             "session_duration_s": session_duration,
             "frames_generated": self.metrics["frames_generated"],
             "audio_chunks_processed": self.metrics["audio_chunks_processed"],
+            "audio_frames_processed": self.metrics["audio_frames_processed"],
+            "audio_frames_dropped": self.metrics["audio_frames_dropped"],
+            "idle_frames_streamed": self.metrics["idle_frames_streamed"],
+            "frames_interpolated": self.metrics["frames_interpolated"],
+            "hibernations": self.metrics["hibernations"],
+            "resumes": self.metrics["resumes"],
             "errors_count": self.metrics["errors_count"],
+            "quality": self.quality.get_stats(),
+            "bring_up": self.get_bring_up_times(),
         }
         
         # Calculate rates
@@ -314,6 +571,24 @@ class AvatarSession:
         
         return metrics
     
+    def get_bring_up_times(self) -> Dict[str, Any]:
+        """
+        Get per-stage bring-up timings, in milliseconds.
+        
+        Stages are engine_init, avatar_prepare, room_connect (with retries),
+        publish_setup and stream_start (the whole streaming request); engine
+        stages are absent for sessions handed out by the pool.
+        time_to_first_frame_ms runs from session creation, or from the
+        hand-out of a pooled session, to the first published frame.
+        """
+        times: Dict[str, Any] = {f"{stage}_ms": t * 1000 for stage, t in self.stage_times.items()}
+        times["connect_attempts"] = self.streamer.connect_attempts
+        first_frame_time = self.streamer.first_frame_time
+        times["time_to_first_frame_ms"] = (
+            (first_frame_time - self.bring_up_start) * 1000 if first_frame_time is not None else None
+        )
+        return times
+    
     def get_session_info(self) -> Dict[str, Any]:
         """Get basic session information."""
         return {
@@ -323,4 +598,6 @@ class AvatarSession:
             "current_emotion": self.state.current_emotion,
             "avatar_image": str(self.state.avatar_image_path) if self.state.avatar_image_path else None,
             "session_start_time": self.state.session_start_time,
+            "init_state": self.init_state,
+            "init_error": self.init_error,
         }
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Capacity-based Admission Control
+Admits sessions only while their render demand fits the frame throughput measured on this hardware.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from .avatar_session import AvatarSession
+from .config import AvatarConfig
+from .quality_controller import QualityTier
+from ..musetalk.model_warmup import get_model_warmup_status, render_latent_sizes
+
+
+# Bounds of the Retry-After estimate, in seconds
+MIN_RETRY_AFTER_S = 1.0
+MAX_RETRY_AFTER_S = 600.0
+
+# Ended sessions whose durations estimate when live ones will end
+DURATION_HISTORY = 50
+
+
+class CapacityBudget:
+    """
+    Render budget of the process, in full-quality frames per second.
+
+    Supply is the frame throughput measured by the startup warmup with
+    every inference worker busy, less ``headroom``. A session demands its
+    render rate (video fps, halved when rendering at half rate and again at
+    REDUCED_FPS) times the cost of one frame at its quality tier relative to
+    a FULL frame, from the warm pass times of the audio encoder, UNet and
+    decoder at the full and LOW_RES latent sizes. Latent in-between frames
+    add one decoder pass per render. A new session is reserved at FULL.
+
+    A rejected caller is told to retry when enough live sessions are
+    expected to have ended, from the durations of recently ended sessions.
+    Until the warmup has measured throughput, admission falls back to the
+    session limit alone.
+    """
+
+    def __init__(self, config: AvatarConfig):
+        """Initialize the budget."""
+        self.config = config
+        self.headroom = config.capacity_headroom
+        self.default_retry_after_s = config.capacity_retry_after_s
+        self.session_durations: deque = deque(maxlen=DURATION_HISTORY)
+        self.rejections = 0
+
+    def _calibration(self) -> Optional[Dict[str, Any]]:
+        """Warmup measurements, or None until throughput has been measured."""
+        status = get_model_warmup_status()
+        if status is None or not status.get("throughput_fps"):
+            return None
+        return status
+
+    @property
+    def capacity_fps(self) -> Optional[float]:
+        """Full-quality frames per second sessions may reserve, or None before calibration."""
+        calibration = self._calibration()
+        if calibration is None:
+            return None
+        return calibration["throughput_fps"] * self.headroom
+
+    def frame_costs(self) -> Dict[str, float]:
+        """Cost of one render per quality tier, and of one in-between decode, relative to a FULL frame."""
+        calibration = self._calibration()
+        if calibration is None:
+            return {tier.name: 1.0 for tier in QualityTier}
+
+        pass_ms = {component: model["pass_ms"] for component, model in calibration["models"].items()}
+        latent_sizes = [str(size) for size in render_latent_sizes(self.config)]
+        full, low = latent_sizes[0], latent_sizes[-1]
+
+        audio = max(pass_ms["audio_encoder"].values())
+        unet_full, unet_low = pass_ms["unet"][full], pass_ms["unet"][low]
+        decode_full, decode_low = pass_ms["vae_decoder"][full], pass_ms["vae_decoder"][low]
+        frame = audio + unet_full + decode_full
+
+        # Each tier keeps the savings of the ones above it
+        low_res = (audio + unet_low / 2 + decode_low) / frame
+        return {
+            QualityTier.FULL.name: 1.0,
+            QualityTier.REUSE_LATENTS.name: (audio + unet_full / 2 + decode_full) / frame,
+            QualityTier.LOW_RES.name: low_res,
+            QualityTier.REDUCED_FPS.name: low_res,
+            "inbetween_decode": decode_full / frame,
+        }
+
+    def _demand_fps(self, config: AvatarConfig, tier: QualityTier, costs: Dict[str, float]) -> float:
+        """Full-quality frames per second a session at a tier takes."""
+        renders = config.video_fps
+        if config.interframe_mode != "off":
+            renders /= 2
+        if tier == QualityTier.REDUCED_FPS:
+            renders /= 2
+
+        demand = renders * costs[tier.name]
+        if config.interframe_mode == "latent":
+            demand += renders * costs["inbetween_decode"]
+        return demand
+
+    def demand_fps(self, sessions: Iterable[AvatarSession]) -> float:
+        """Full-quality frames per second the live sessions take at their current tiers."""
+        costs = self.frame_costs()
+        return sum(self._demand_fps(session.config, session.quality.tier, costs) for session in sessions)
+
+    def load(self, sessions: Iterable[AvatarSession]) -> Optional[float]:
+        """Fraction of the budget the live sessions take, or None before calibration."""
+        capacity = self.capacity_fps
+        if not capacity:
+            return None
+        return self.demand_fps(sessions) / capacity
+
+    def check_admission(self, sessions: Iterable[AvatarSession], config: AvatarConfig) -> Optional[float]:
+        """
+        Check whether a new session fits the budget.
+
+        Args:
+            sessions: Live sessions
+            config: The new session's configuration
+
+        Returns:
+            None if the session fits, else the seconds until it is expected to
+        """
+        sessions = list(sessions)
+        capacity = self.capacity_fps
+        # An empty process always takes one session; adaptive quality makes it fit
+        if capacity is None or not sessions:
+            return None
+
+        costs = self.frame_costs()
+        deficit = (
+            sum(self._demand_fps(session.config, session.quality.tier, costs) for session in sessions)
+            + self._demand_fps(config, QualityTier.FULL, costs)
+            - capacity
+        )
+        if deficit <= 0:
+            return None
+
+        self.rejections += 1
+        return self.estimate_retry_after(sessions, deficit)
+
+    def estimate_retry_after(self, sessions: Iterable[AvatarSession], deficit_fps: float = 0.0) -> float:
+        """
+        Seconds until enough live sessions are expected to end to free ``deficit_fps``.
+
+        Each session is expected to last the mean duration of recently ended
+        sessions; one already past it is expected to end at the next check.
+        """
+        if not self.session_durations:
+            return self.default_retry_after_s
+
+        expected_s = float(np.mean(self.session_durations))
+        costs = self.frame_costs()
+        now = time.time()
+        endings = sorted(
+            (
+                max(expected_s - (now - session.state.session_start_time), MIN_RETRY_AFTER_S),
+                self._demand_fps(session.config, session.quality.tier, costs),
+            )
+            for session in sessions
+        )
+
+        freed = 0.0
+        retry_after = self.default_retry_after_s
+        for remaining_s, demand in endings:
+            freed += demand
+            retry_after = remaining_s
+            if freed >= deficit_fps:
+                break
+        return min(max(retry_after, MIN_RETRY_AFTER_S), MAX_RETRY_AFTER_S)
+
+    def record_session_end(self, duration_s: float) -> None:
+        """Record how long an ended session lasted."""
+        self.session_durations.append(duration_s)
+
+    def get_stats(self, sessions: Iterable[AvatarSession]) -> Dict[str, Any]:
+        """Get supply, demand and admission statistics."""
+        sessions = list(sessions)
+        return {
+            "capacity_fps": self.capacity_fps,
+            "demand_fps": self.demand_fps(sessions),
+            "load": self.load(sessions),
+            "headroom": self.headroom,
+            "frame_costs": self.frame_costs(),
+            "expected_session_s": float(np.mean(self.session_durations)) if self.session_durations else None,
+            "rejections": self.rejections,
+        }
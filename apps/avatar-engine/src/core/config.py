@@ -20,6 +20,18 @@ class AvatarConfig(BaseSettings):
     livekit_url: str = Field(..., description="LiveKit server URL")
     livekit_api_key: str = Field(..., description="LiveKit API key")
     livekit_api_secret: str = Field(..., description="LiveKit API secret")
+    livekit_connect_attempts: int = Field(
+        default=5,
+        description="Room connection attempts before starting a stream fails"
+    )
+    livekit_backoff_base_s: float = Field(
+        default=0.25,
+        description="Upper bound of the first retry delay; it doubles per attempt, with full jitter"
+    )
+    livekit_backoff_max_s: float = Field(
+        default=4.0,
+        description="Cap on the upper bound of a retry delay"
+    )
     
     # MuseTalk configuration
     musetalk_model_path: Path = Field(
@@ -27,6 +39,34 @@ class AvatarConfig(BaseSettings):
         description="Path to MuseTalk model files"
     )
     device: str = Field(default="cuda", description="Device for inference (cuda/cpu)")
+    render_mode: str = Field(
+        default="full_face",
+        description="Region run through the UNet and VAE: full_face (256x256 face crop) or mouth_roi"
+    )
+    inference_profile: str = Field(
+        default="default",
+        description="Model precision profile: default, or cpu-fast (int8 dynamic quantization on CPU)"
+    )
+    inference_backend: str = Field(
+        default="torch",
+        description="Runtime for the UNet, VAE and audio encoder: torch, or onnxruntime (CPU, needs the onnx extra)"
+    )
+    vae_decoder: str = Field(
+        default="full",
+        description="Frame decoder: full (SD VAE) or tiny (distilled TAESD, much faster, slightly softer)"
+    )
+    onnx_intra_op_threads: int = Field(
+        default=0,
+        description="ONNX Runtime threads within one operator (0 lets ONNX Runtime pick)"
+    )
+    onnx_inter_op_threads: int = Field(
+        default=1,
+        description="ONNX Runtime threads running independent operators in parallel"
+    )
+    mouth_roi_size: int = Field(
+        default=128,
+        description="Side of the square mouth crop in mouth_roi render mode (multiple of 8)"
+    )
     
     # Avatar configuration
     default_avatar_image: Path = Field(
@@ -34,18 +74,146 @@ class AvatarConfig(BaseSettings):
         description="Default avatar image path"
     )
     # Removed avatar_image_size - using hardcoded (512, 512) in code with getattr
+    avatar_cache_path: Path = Field(
+        default=Path("/app/cache/avatars"),
+        description="On-disk store for prepared avatar artifacts"
+    )
+    avatar_cache_size: int = Field(
+        default=16,
+        description="Prepared avatars kept in the in-memory LRU"
+    )
+    avatar_video_max_frames: int = Field(
+        default=150,
+        description="Longest video avatar loop prepared, in output frames"
+    )
     
     # Performance configuration
     max_concurrent_sessions: int = Field(
         default=10,
         description="Maximum concurrent avatar sessions"
     )
+    capacity_headroom: float = Field(
+        default=0.85,
+        description="Fraction of the measured frame throughput that admitted sessions may reserve"
+    )
+    capacity_retry_after_s: float = Field(
+        default=30.0,
+        description="Retry-After for rejected sessions until session durations have been observed"
+    )
     enable_gpu_acceleration: bool = Field(
         default=True,
         description="Enable GPU acceleration"
     )
+    inference_workers: int = Field(
+        default=2,
+        description="Worker threads running lip-sync inference off the event loop"
+    )
+    enable_micro_batching: bool = Field(
+        default=False,
+        description="Batch UNet/VAE passes from concurrent sessions together"
+    )
+    batch_max_size: int = Field(
+        default=8,
+        description="Maximum frames per batched UNet/VAE forward pass"
+    )
+    batch_max_wait_ms: float = Field(
+        default=5.0,
+        description="Longest a frame waits for other sessions to join its batch"
+    )
+    interframe_mode: str = Field(
+        default="off",
+        description="Render at half video_fps and synthesize the frames between: off, blend (mouth ROI) or latent (one decode)"
+    )
+    adaptive_quality: bool = Field(
+        default=True,
+        description="Step render quality down when frames fall behind the frame budget"
+    )
+    quality_window_frames: int = Field(
+        default=30,
+        description="Renders averaged for each quality tier decision"
+    )
+    quality_degrade_ratio: float = Field(
+        default=1.0,
+        description="Fraction of the frame budget above which render quality steps down"
+    )
+    quality_recover_ratio: float = Field(
+        default=0.6,
+        description="Fraction of the frame budget below which render quality steps back up"
+    )
+    mouth_cache_size: int = Field(
+        default=256,
+        description="Rendered mouth patches cached per avatar (0 disables the cache)"
+    )
+    mouth_cache_levels: int = Field(
+        default=6,
+        description="Quantization steps per audio band in the mouth cache key; fewer raise the hit rate"
+    )
+    mouth_cache_bands: int = Field(
+        default=8,
+        description="Audio frequency bands in the mouth cache key; fewer raise the hit rate"
+    )
+    vad_threshold_db: float = Field(
+        default=-45.0,
+        description="Audio level in dBFS below which a frame counts as silence"
+    )
+    vad_hangover_ms: float = Field(
+        default=300.0,
+        description="Time lip-sync keeps rendering after speech drops below the threshold"
+    )
+    idle_loop_seconds: float = Field(
+        default=2.0,
+        description="Length of the pre-rendered idle loop streamed during silence"
+    )
+    idle_loop_cache_size: int = Field(
+        default=4,
+        description="Idle loops kept in memory (one per avatar)"
+    )
+    hibernate_after_s: float = Field(
+        default=180.0,
+        description="Silence after which a streaming session releases its render state (0 disables hibernation)"
+    )
+    emotion_bank_enabled: bool = Field(
+        default=True,
+        description="Precompute per-avatar emotion latent offsets for set_emotion"
+    )
+    emotion_transition_ms: float = Field(
+        default=400.0,
+        description="Time constant of the smoothed transition between emotions"
+    )
+    warmup_on_startup: bool = Field(
+        default=True,
+        description="Load and warm up the render models in the background at startup; /ready reports when done"
+    )
+    warmup_iterations: int = Field(
+        default=2,
+        description="Dummy passes per model and input shape during startup warmup"
+    )
+    session_pool_size: int = Field(
+        default=2,
+        description="Initialized sessions kept ready with the default avatar (0 disables the pool)"
+    )
+    session_pool_min_size: int = Field(
+        default=1,
+        description="Pooled sessions kept however long the pool goes unused"
+    )
+    session_pool_idle_s: float = Field(
+        default=300.0,
+        description="Time without a hand-out after which the pool shrinks by one session"
+    )
     video_fps: int = Field(default=30, description="Video frame rate")
+    publisher_queue_frames: int = Field(
+        default=3,
+        description="Rendered frames buffered ahead of the fixed-rate publisher"
+    )
+    publisher_idle_after_ms: float = Field(
+        default=200.0,
+        description="Time without rendered frames after which the publisher streams the idle loop"
+    )
     audio_sample_rate: int = Field(default=16000, description="Audio sample rate")
+    audio_flush_ms: float = Field(
+        default=250.0,
+        description="Gap in incoming audio after which buffered audio is padded and rendered"
+    )
     
     # Paths
     models_path: Path = Field(
@@ -65,6 +233,46 @@ class AvatarConfig(BaseSettings):
     log_level: str = Field(default="INFO", description="Logging level")
     log_file: Optional[Path] = Field(default=None, description="Log file path")
     
+    @field_validator("render_mode")
+    @classmethod
+    def validate_render_mode(cls, value: str) -> str:
+        """Only the supported render modes are accepted."""
+        if value not in ("full_face", "mouth_roi"):
+            raise ValueError(f"render_mode must be 'full_face' or 'mouth_roi', got {value!r}")
+        return value
+    
+    @field_validator("inference_profile")
+    @classmethod
+    def validate_inference_profile(cls, value: str) -> str:
+        """Only the supported inference profiles are accepted."""
+        if value not in ("default", "cpu-fast"):
+            raise ValueError(f"inference_profile must be 'default' or 'cpu-fast', got {value!r}")
+        return value
+    
+    @field_validator("inference_backend")
+    @classmethod
+    def validate_inference_backend(cls, value: str) -> str:
+        """Only the supported inference backends are accepted."""
+        if value not in ("torch", "onnxruntime"):
+            raise ValueError(f"inference_backend must be 'torch' or 'onnxruntime', got {value!r}")
+        return value
+    
+    @field_validator("vae_decoder")
+    @classmethod
+    def validate_vae_decoder(cls, value: str) -> str:
+        """Only the supported frame decoders are accepted."""
+        if value not in ("full", "tiny"):
+            raise ValueError(f"vae_decoder must be 'full' or 'tiny', got {value!r}")
+        return value
+    
+    @field_validator("interframe_mode")
+    @classmethod
+    def validate_interframe_mode(cls, value: str) -> str:
+        """Only the supported in-between frame modes are accepted."""
+        if value not in ("off", "blend", "latent"):
+            raise ValueError(f"interframe_mode must be 'off', 'blend' or 'latent', got {value!r}")
+        return value
+    
     class Config:
         env_prefix = ""
         case_sensitive = False
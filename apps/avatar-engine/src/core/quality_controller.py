@@ -0,0 +1,165 @@
+"""
+Adaptive Quality Controller
+Steps a session through render quality tiers to keep frame render time within the frame budget.
+"""
+
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class QualityTier(IntEnum):
+    """Render quality tiers, from best to cheapest. Each tier keeps the savings of the ones above it."""
+    FULL = 0            # UNet and decoder every frame
+    REUSE_LATENTS = 1   # UNet every other frame; in between the last noise prediction is reused
+    LOW_RES = 2         # Latents downsampled 2x before the UNet and decoder
+    REDUCED_FPS = 3     # Every other frame is skipped and the publisher repeats the last one
+
+
+# A recovery that is undone right away waits this many times longer before the next attempt
+MAX_RECOVERY_BACKOFF = 8
+
+
+class QualityController:
+    """
+    Compares the rolling render time with the frame budget and picks a tier.
+
+    The session steps down one tier when the mean render time over the last
+    ``window_frames`` renders exceeds the budget of the current tier (twice
+    the frame interval at REDUCED_FPS, where only every other frame renders),
+    and steps up when it is below ``recover_ratio`` of the frame interval.
+    Every change needs a full window of renders at the new tier first. If a
+    step up is undone by the very next decision, the following recovery
+    needs a longer window, so a session near the edge does not flap.
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        window_frames: int = 30,
+        degrade_ratio: float = 1.0,
+        recover_ratio: float = 0.6,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            fps: Render rate; the frame budget is 1 / fps
+            window_frames: Renders averaged for each decision
+            degrade_ratio: Fraction of the tier budget above which quality steps down
+            recover_ratio: Fraction of the frame budget below which quality steps up
+            enabled: When False the tier stays FULL and render times are only tracked
+        """
+        self.frame_budget_s = 1.0 / fps
+        self.window_frames = window_frames
+        self.degrade_ratio = degrade_ratio
+        self.recover_ratio = recover_ratio
+        self.enabled = enabled
+
+        self.tier = QualityTier.FULL
+        self.render_times: deque = deque(maxlen=window_frames * MAX_RECOVERY_BACKOFF)
+        self._renders_in_tier = 0
+        self._recovery_backoff = 1
+        self._just_recovered = False
+
+        # Metrics
+        self.tier_changes = 0
+        self.tier_since = time.monotonic()
+        self.history: deque = deque(maxlen=10)
+        self.frames_skipped = 0
+
+    @property
+    def render_budget_s(self) -> float:
+        """Time one render may take at the current tier."""
+        return self.frame_budget_s * (2 if self.tier == QualityTier.REDUCED_FPS else 1)
+
+    def should_render(self, frame_index: int) -> bool:
+        """Check whether a frame is rendered at the current tier, counting skipped frames."""
+        if self.tier == QualityTier.REDUCED_FPS and frame_index % 2:
+            self.frames_skipped += 1
+            return False
+        return True
+
+    def record(self, render_time_s: float) -> Optional[QualityTier]:
+        """
+        Record one render and re-evaluate the tier.
+
+        Args:
+            render_time_s: Wall time of the render, including waiting for the executor
+
+        Returns:
+            The new tier if it changed, else None
+        """
+        self.render_times.append(render_time_s)
+        self._renders_in_tier += 1
+        if not self.enabled or self._renders_in_tier < self.window_frames:
+            return None
+
+        rolling = self.rolling_render_time_s
+        if rolling > self.render_budget_s * self.degrade_ratio and self.tier < QualityTier.REDUCED_FPS:
+            # Stepping straight back down means the last recovery came too soon
+            if self._just_recovered:
+                self._recovery_backoff = min(self._recovery_backoff * 2, MAX_RECOVERY_BACKOFF)
+            return self._set_tier(QualityTier(self.tier + 1), rolling)
+
+        if self._just_recovered:
+            # The last recovery held for a full window
+            self._just_recovered = False
+            self._recovery_backoff = max(1, self._recovery_backoff // 2)
+
+        if (
+            rolling < self.frame_budget_s * self.recover_ratio
+            and self.tier > QualityTier.FULL
+            and self._renders_in_tier >= self.window_frames * self._recovery_backoff
+        ):
+            tier = self._set_tier(QualityTier(self.tier - 1), rolling)
+            self._just_recovered = True
+            return tier
+
+        return None
+
+    def _set_tier(self, tier: QualityTier, rolling_s: float) -> QualityTier:
+        """Switch tiers and start a fresh measurement window."""
+        logger.info(
+            f"Quality tier {self.tier.name} -> {tier.name} "
+            f"(render {rolling_s * 1000:.1f} ms, budget {self.render_budget_s * 1000:.1f} ms)"
+        )
+        self.history.append({
+            "time": time.time(),
+            "from": self.tier.name,
+            "to": tier.name,
+            "render_ms": rolling_s * 1000,
+        })
+        self.tier = tier
+        self.tier_changes += 1
+        self.tier_since = time.monotonic()
+        self.render_times.clear()
+        self._renders_in_tier = 0
+        self._just_recovered = False
+        return tier
+
+    @property
+    def rolling_render_time_s(self) -> float:
+        """Mean render time over the last decision window."""
+        if not self.render_times:
+            return 0.0
+        return float(np.mean(list(self.render_times)[-self.window_frames:]))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current tier and recent tier changes."""
+        return {
+            "tier": self.tier.name,
+            "tier_level": int(self.tier),
+            "adaptive": self.enabled,
+            "rolling_render_ms": self.rolling_render_time_s * 1000,
+            "render_budget_ms": self.render_budget_s * 1000,
+            "time_in_tier_s": time.monotonic() - self.tier_since,
+            "tier_changes": self.tier_changes,
+            "recent_changes": list(self.history),
+            "frames_skipped": self.frames_skipped,
+        }
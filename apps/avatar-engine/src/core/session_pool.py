@@ -0,0 +1,170 @@
+"""
+Pre-warmed Session Pool
+Keeps initialized sessions prepared with the default avatar ready to hand out without setup.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .avatar_session import AvatarSession
+from .config import AvatarConfig
+from ..musetalk.model_warmup import get_model_warmup_status
+
+
+# Seconds between idle checks when nothing wakes the refill loop
+POOL_CHECK_INTERVAL_S = 5.0
+
+
+class SessionPool:
+    """
+    Pool of fully initialized sessions for the default avatar.
+
+    ``acquire`` hands out a pooled session in O(1) and wakes the background
+    loop, which builds a replacement off the request path. Refills wait for
+    the startup model warmup and never take the pool plus the live sessions
+    past the session limit. After ``idle_s`` without a hand-out the pool
+    shrinks by one session per idle period down to ``min_size``; the next
+    hand-out restores the full size.
+    """
+
+    def __init__(self, config: AvatarConfig, free_slots: Callable[[], int]):
+        """
+        Initialize the pool.
+
+        Args:
+            config: Service configuration; pooled sessions use it as is
+            free_slots: Session slots not taken by live sessions
+        """
+        self.config = config
+        self.max_size = config.session_pool_size
+        self.min_size = min(config.session_pool_min_size, config.session_pool_size)
+        self.idle_s = config.session_pool_idle_s
+        self.free_slots = free_slots
+
+        self.sessions: Deque[AvatarSession] = deque()
+        self.target_size = self.max_size
+        self.last_activity = time.monotonic()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Performance tracking
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.retired = 0
+        self.build_times: List[float] = []
+
+    def acquire(self) -> Optional[AvatarSession]:
+        """Take a ready session, or None if the pool is empty."""
+        self.target_size = self.max_size
+        self.last_activity = time.monotonic()
+        self._wake.set()
+
+        if not self.sessions:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.sessions.popleft()
+
+    def start(self) -> None:
+        """Start filling the pool on the running event loop."""
+        if self.max_size <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Session pool started (size {self.max_size}, min {self.min_size})")
+
+    async def stop(self) -> None:
+        """Stop refilling and stop every pooled session."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self.sessions:
+            await self.sessions.pop().stop()
+
+    async def _run(self) -> None:
+        """Refill and shrink loop."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=POOL_CHECK_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            await self._shrink_if_idle()
+            await self._refill()
+
+    async def _refill(self) -> None:
+        """Build sessions until the pool is at its target size."""
+        # Building sessions during warmup would compete with it for the same cores
+        warmup = get_model_warmup_status()
+        if warmup is not None and warmup["running"]:
+            return
+
+        while len(self.sessions) < min(self.target_size, self.free_slots()):
+            try:
+                session = await self._build_session()
+            except Exception as e:
+                logger.error(f"Failed to build pooled session: {e}")
+                return
+            self.sessions.append(session)
+
+    async def _build_session(self) -> AvatarSession:
+        """Create and initialize a session prepared with the default avatar."""
+        start_time = time.time()
+        session = AvatarSession(
+            f"pooled_{uuid.uuid4().hex[:8]}", self.config.default_avatar_image, self.config
+        )
+        try:
+            await session.initialize()
+        except Exception:
+            await session.stop()
+            raise
+
+        build_time = time.time() - start_time
+        self.created += 1
+        self.build_times.append(build_time)
+        if len(self.build_times) > 100:
+            self.build_times.pop(0)
+        logger.info(f"Pooled session ready in {build_time:.2f}s ({len(self.sessions) + 1}/{self.target_size})")
+        return session
+
+    async def _shrink_if_idle(self) -> None:
+        """Retire one pooled session per idle period, down to the minimum size."""
+        if time.monotonic() - self.last_activity < self.idle_s or self.target_size <= self.min_size:
+            return
+
+        self.target_size -= 1
+        self.last_activity = time.monotonic()
+        if len(self.sessions) > self.target_size:
+            session = self.sessions.pop()
+            self.retired += 1
+            await session.stop()
+            logger.info(f"Session pool idle, shrunk to {len(self.sessions)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and hit rates."""
+        requests = self.hits + self.misses
+        return {
+            "ready": len(self.sessions),
+            "target_size": self.target_size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "created": self.created,
+            "retired": self.retired,
+            "avg_build_time_s": float(np.mean(self.build_times)) if self.build_times else 0.0,
+        }
@@ -0,0 +1,55 @@
+"""
+Voice Activity Gate
+Energy-based speech/silence decision per video frame of audio, with hangover.
+"""
+
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    Frame-level energy gate.
+
+    A frame is speech when its RMS level is above ``threshold_db`` (dBFS).
+    After the last speech frame the gate stays open for ``hangover_frames``
+    so word endings and short pauses inside an utterance are still rendered.
+    """
+
+    def __init__(self, threshold_db: float = -45.0, hangover_frames: int = 9):
+        """
+        Initialize the gate.
+
+        Args:
+            threshold_db: RMS level in dBFS above which a frame counts as speech
+            hangover_frames: Frames kept open after speech ends
+        """
+        self.threshold_db = threshold_db
+        self.hangover_frames = hangover_frames
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the gate."""
+        self._hangover = 0
+        self.last_level_db = -120.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the most recent frame was speech or within the hangover."""
+        return self._hangover > 0
+
+    def update(self, samples: np.ndarray) -> bool:
+        """
+        Classify one frame of float32 samples in [-1, 1].
+
+        Returns:
+            True while speech (or its hangover) is active
+        """
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float32)))) if len(samples) else 0.0
+        self.last_level_db = 20.0 * np.log10(max(rms, 1e-6))
+
+        if self.last_level_db >= self.threshold_db:
+            self._hangover = self.hangover_frames + 1
+        elif self._hangover > 0:
+            self._hangover -= 1
+
+        return self._hangover > 0
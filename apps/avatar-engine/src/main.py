@@ -12,8 +12,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from .core.config import AvatarConfig, load_config
-from .api.routes import create_avatar_router, create_system_router
+from .api.routes import create_avatar_router, create_system_router, get_session_manager
+from .musetalk.model_warmup import get_model_warmup
 from .utils.logging import setup_logging
+from .utils.loop_monitor import get_loop_lag_monitor
 
 
 @asynccontextmanager
@@ -21,9 +23,27 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("🚀 HealLink Avatar Engine v2.0 starting up...")
+    loop_monitor = get_loop_lag_monitor()
+    loop_monitor.start()
+    
+    # Load and warm up the models in the background; /ready gates traffic until done
+    config: AvatarConfig = app.state.config
+    warmup = get_model_warmup(config) if config.warmup_on_startup else None
+    if warmup is not None:
+        warmup.start()
+    
+    # Keep sessions for the default avatar initialized ahead of requests
+    session_manager = get_session_manager()
+    if session_manager is not None:
+        session_manager.start()
     yield
     # Shutdown
     logger.info("⚡ HealLink Avatar Engine shutting down...")
+    if session_manager is not None:
+        await session_manager.shutdown()
+    if warmup is not None:
+        await warmup.stop()
+    await loop_monitor.stop()
 
 
 def create_app(config: AvatarConfig) -> FastAPI:
@@ -37,6 +57,7 @@ def create_app(config: AvatarConfig) -> FastAPI:
         redoc_url="/redoc" if config.debug else None,
         lifespan=lifespan
     )
+    app.state.config = config
     
     # CORS middleware
     app.add_middleware(
@@ -63,6 +84,7 @@ def create_app(config: AvatarConfig) -> FastAPI:
             "endpoints": {
                 "avatars": "/avatars",
                 "health": "/health",
+                "ready": "/ready",
                 "metrics": "/metrics"
             }
         }
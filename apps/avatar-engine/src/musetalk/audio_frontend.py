@@ -0,0 +1,212 @@
+"""
+Streaming Mel-spectrogram Frontend
+Incremental log-mel features for live audio, emitted as one window per video frame.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import librosa
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass
+class FeatureWindow:
+    """Log-mel features around one video frame."""
+    index: int
+    timestamp: float
+    features: np.ndarray  # (n_mels, window_frames), Whisper-normalized
+
+
+class StreamingMelFrontend:
+    """
+    Stateful log-mel frontend for streamed PCM.
+
+    Samples are appended to a sliding buffer that keeps the STFT overlap
+    between calls, so chunk boundaries never lose context. Complete STFT
+    frames are computed with one vectorized rFFT per push and projected
+    through a mel filterbank built once. Log-mel frames go into a history
+    ring from which a fixed-length window (the video frame plus
+    ``context_frames`` video frames either side) is emitted as soon as its
+    right context exists.
+
+    Frame timing matches ``librosa.feature.melspectrogram(center=True)``:
+    mel frame ``i`` is centred on sample ``i * hop_length``.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        fps: int = 30,
+        n_mels: int = 80,
+        n_fft: int = 400,
+        hop_length: int = 160,
+        context_frames: int = 2,
+        history_seconds: float = 2.0,
+    ):
+        """
+        Initialize the frontend.
+
+        Args:
+            sample_rate: Input sample rate in Hz
+            fps: Video frame rate the windows are aligned to
+            n_mels: Number of mel bins (80 matches Whisper)
+            n_fft: STFT window length in samples (25 ms at 16 kHz)
+            hop_length: STFT hop in samples (10 ms at 16 kHz)
+            context_frames: Video frames of context on each side of a window
+            history_seconds: Log-mel history kept for windows and normalization
+        """
+        self.sample_rate = sample_rate
+        self.fps = fps
+        self.n_mels = n_mels
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.context_frames = context_frames
+
+        # Precomputed analysis window and mel filterbank
+        self.window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        self.mel_basis = librosa.filters.mel(
+            sr=sample_rate, n_fft=n_fft, n_mels=n_mels
+        ).astype(np.float32)
+
+        # Fixed window length in mel frames, centred on the video frame
+        samples_per_frame = sample_rate / fps
+        self.window_frames = int(round((2 * context_frames + 1) * samples_per_frame / hop_length))
+
+        # Sliding sample buffer holding the unconsumed tail plus STFT overlap
+        self._buffer = np.zeros(max(4 * sample_rate, 8 * n_fft), dtype=np.float32)
+        self._history_capacity = max(
+            int(history_seconds * sample_rate / hop_length), 2 * self.window_frames
+        )
+        self._log_mel = np.zeros((self._history_capacity, n_mels), dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all buffered audio, e.g. at the start of a new utterance stream."""
+        # Left-pad with n_fft // 2 zeros so frame i is centred on sample i * hop
+        self._start = 0
+        self._end = self.n_fft // 2
+        self._buffer[:self._end] = 0.0
+        self._log_mel.fill(-10.0)
+        self.mel_frames = 0
+        self.frames_emitted = 0
+
+    @property
+    def lookahead_samples(self) -> int:
+        """Samples needed past the end of a video frame before its window can be emitted."""
+        return max(self._window_span(k)[1] - self._frame_bounds(k)[1] for k in range(self.fps))
+
+    @property
+    def lookbehind_samples(self) -> int:
+        """Samples before the start of a video frame that its window covers."""
+        return max(self._frame_bounds(k)[0] - self._window_span(k)[0] for k in range(self.fps))
+
+    def _frame_bounds(self, index: int) -> Tuple[int, int]:
+        """Sample range [start, end) of a video frame."""
+        return (
+            index * self.sample_rate // self.fps,
+            (index + 1) * self.sample_rate // self.fps,
+        )
+
+    def _window_span(self, index: int) -> Tuple[int, int]:
+        """Sample range [start, end) covered by a video frame's feature window."""
+        first = self._window_first(index)
+        last = first + self.window_frames - 1
+        half_fft = self.n_fft // 2
+        return first * self.hop_length - half_fft, last * self.hop_length + half_fft
+
+    def _window_first(self, index: int) -> int:
+        """First mel frame of a video frame's window."""
+        center_sample = (index + 0.5) * self.sample_rate / self.fps
+        return int(round(center_sample / self.hop_length)) - self.window_frames // 2
+
+    @property
+    def samples_received(self) -> int:
+        """Number of real samples pushed since the last reset."""
+        return self.mel_frames * self.hop_length + (self._end - self._start) - self.n_fft // 2
+
+    def push(self, samples: np.ndarray) -> List[FeatureWindow]:
+        """
+        Add PCM samples and return every feature window that became complete.
+
+        Args:
+            samples: Mono float32 samples in [-1, 1]
+
+        Returns:
+            Windows for newly complete video frames, in frame order
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        offset = 0
+        while offset < len(samples):
+            # Process in slices so arbitrarily large pushes fit the buffer
+            space = len(self._buffer) - (self._end - self._start)
+            chunk = samples[offset:offset + max(space - self.n_fft, self.hop_length)]
+            self._append(chunk)
+            self._compute_frames()
+            offset += len(chunk)
+
+        return self._emit_windows()
+
+    def _append(self, samples: np.ndarray) -> None:
+        """Append samples, compacting the buffer when the tail reaches its end."""
+        if self._end + len(samples) > len(self._buffer):
+            remaining = self._end - self._start
+            self._buffer[:remaining] = self._buffer[self._start:self._end]
+            self._start, self._end = 0, remaining
+
+        self._buffer[self._end:self._end + len(samples)] = samples
+        self._end += len(samples)
+
+    def _compute_frames(self) -> None:
+        """Run the STFT and mel projection over every complete frame in the buffer."""
+        available = self._end - self._start
+        if available < self.n_fft:
+            return
+
+        count = (available - self.n_fft) // self.hop_length + 1
+        frames = sliding_window_view(self._buffer[self._start:self._end], self.n_fft)
+        frames = frames[::self.hop_length][:count]
+
+        spectrum = np.fft.rfft(frames * self.window, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        mel = power.astype(np.float32) @ self.mel_basis.T
+        log_mel = np.log10(np.maximum(mel, 1e-10))
+
+        positions = (self.mel_frames + np.arange(count)) % self._history_capacity
+        self._log_mel[positions] = log_mel
+
+        # Keep the n_fft - hop overlap for the next frame
+        self._start += count * self.hop_length
+        self.mel_frames += count
+
+    def _emit_windows(self) -> List[FeatureWindow]:
+        """Emit windows for video frames whose right context has been computed."""
+        windows = []
+
+        while True:
+            index = self.frames_emitted
+            first = self._window_first(index)
+            last = first + self.window_frames
+
+            if last > self.mel_frames:
+                break
+
+            windows.append(FeatureWindow(
+                index=index,
+                timestamp=index / self.fps,
+                features=self._window(first, last),
+            ))
+            self.frames_emitted += 1
+
+        return windows
+
+    def _window(self, first: int, last: int) -> np.ndarray:
+        """Whisper-normalized log-mel frames [first, last), edge-padded before the stream start."""
+        oldest = max(0, self.mel_frames - self._history_capacity)
+        indices = np.clip(np.arange(first, last), oldest, None) % self._history_capacity
+        log_mel = self._log_mel[indices].T
+
+        # Whisper normalization against the loudest frame in the history
+        floor = self._log_mel.max() - 8.0
+        return (np.maximum(log_mel, floor) + 4.0) / 4.0
@@ -0,0 +1,245 @@
+"""
+Avatar Preparation Cache
+Content-addressed cache of prepared avatar artifacts (face box, landmarks, mask, latents).
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+# Bump when the prepared artifacts change shape or meaning
+CACHE_VERSION = 2
+
+
+@dataclass
+class PreparedAvatar:
+    """Everything the renderer needs from an avatar image, computed once per image."""
+    key: str
+    image: np.ndarray
+    bbox: Tuple[int, int, int, int]
+    face_region: Tuple[int, int, int, int]
+    landmarks: Optional[np.ndarray]
+    mouth_mask: np.ndarray
+    ref_latents: np.ndarray
+    confidence: float = 0.0
+    render_region: Optional[Tuple[int, int, int, int]] = None  # box ref_latents encode; face_region if None
+    emotion_offsets: Optional[Dict[str, np.ndarray]] = None  # latent offset per emotion, added to ref_latents
+
+    @property
+    def latent_region(self) -> Tuple[int, int, int, int]:
+        """Frame box covered by the reference latents and the decoder output."""
+        return self.render_region or self.face_region
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays."""
+        total = self.image.nbytes + self.mouth_mask.nbytes + self.ref_latents.nbytes
+        if self.landmarks is not None:
+            total += self.landmarks.nbytes
+        if self.emotion_offsets:
+            total += sum(offset.nbytes for offset in self.emotion_offsets.values())
+        return total
+
+    def to_bytes(self) -> bytes:
+        """Serialize to an uncompressed npz blob."""
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            image=self.image,
+            bbox=np.asarray(self.bbox, dtype=np.int32),
+            face_region=np.asarray(self.face_region, dtype=np.int32),
+            landmarks=self.landmarks if self.landmarks is not None else np.empty((0, 2)),
+            mouth_mask=self.mouth_mask,
+            ref_latents=self.ref_latents,
+            confidence=np.float32(self.confidence),
+            render_region=np.asarray(self.latent_region, dtype=np.int32),
+            **{f"emotion_{name}": offset for name, offset in (self.emotion_offsets or {}).items()},
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, key: str, data: bytes) -> "PreparedAvatar":
+        """Deserialize from an npz blob written by to_bytes."""
+        with np.load(io.BytesIO(data)) as arrays:
+            landmarks = arrays["landmarks"]
+            emotion_offsets = {
+                name[len("emotion_"):]: arrays[name] for name in arrays.files if name.startswith("emotion_")
+            }
+            return cls(
+                key=key,
+                image=arrays["image"],
+                bbox=tuple(int(v) for v in arrays["bbox"]),
+                face_region=tuple(int(v) for v in arrays["face_region"]),
+                landmarks=landmarks if landmarks.size else None,
+                mouth_mask=arrays["mouth_mask"],
+                ref_latents=arrays["ref_latents"],
+                confidence=float(arrays["confidence"]),
+                render_region=tuple(int(v) for v in arrays["render_region"]),
+                emotion_offsets=emotion_offsets or None,
+            )
+
+
+class AvatarPreparationCache:
+    """
+    Two-level cache of prepared avatars keyed by image content hash.
+
+    An in-memory LRU serves repeat sessions without touching disk; every
+    entry is also written to ``cache_dir`` so prepared avatars survive
+    restarts and are shared by all processes on the node.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 16):
+        """Initialize the cache."""
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, PreparedAvatar]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Emotion bank builds in flight, by avatar key (event loop only)
+        self._emotion_builds: Dict[str, asyncio.Task] = {}
+
+        # Performance tracking
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_key(image_bytes: bytes, variant: str) -> str:
+        """
+        Build the cache key for an image.
+
+        Args:
+            image_bytes: Raw encoded image file contents
+            variant: Preparation settings that change the artifacts (size, VAE, ...)
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}:{variant}:".encode())
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def emotion_bank_build(self, key: str, build: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Get the running emotion bank build for an avatar, starting it if there is none.
+
+        Sessions on the same avatar await one build instead of each encoding
+        the bank. Call from the event loop.
+        """
+        task = self._emotion_builds.get(key)
+        if task is None:
+            task = asyncio.create_task(build())
+            self._emotion_builds[key] = task
+
+            def forget(_: asyncio.Task) -> None:
+                if self._emotion_builds.get(key) is task:
+                    del self._emotion_builds[key]
+
+            task.add_done_callback(forget)
+        return task
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get_from_memory(self, key: str) -> Optional[PreparedAvatar]:
+        """Look up an entry in the in-memory LRU only."""
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+            return prepared
+
+    def load_from_disk(self, key: str) -> Optional[PreparedAvatar]:
+        """Load an entry from disk into memory (blocking)."""
+        path = self._path(key)
+        if not path.exists():
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            prepared = PreparedAvatar.from_bytes(key, path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Discarding unreadable avatar cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(prepared)
+        return prepared
+
+    def get(self, key: str) -> Optional[PreparedAvatar]:
+        """Look up an entry in memory, then on disk (blocking)."""
+        return self.get_from_memory(key) or self.load_from_disk(key)
+
+    def put(self, prepared: PreparedAvatar) -> None:
+        """Store an entry in memory and on disk (blocking)."""
+        self._remember(prepared)
+        self._write(prepared)
+
+    def _write(self, prepared: PreparedAvatar) -> None:
+        """Write an entry to disk atomically (blocking)."""
+        path = self._path(prepared.key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(prepared.to_bytes())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist avatar cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def spill(self, prepared: PreparedAvatar) -> None:
+        """Make sure an entry is on disk, leaving the in-memory LRU order alone (blocking)."""
+        path = self._path(prepared.key)
+        if not path.exists():
+            self._write(prepared)
+        if not path.exists():
+            raise OSError(f"Avatar cache entry {prepared.key[:12]} could not be written to disk")
+
+    def _remember(self, prepared: PreparedAvatar) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entries."""
+        with self._lock:
+            self._entries[prepared.key] = prepared
+            self._entries.move_to_end(prepared.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit rates and memory use."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._entries),
+                "memory_mb": sum(p.nbytes for p in self._entries.values()) / 1024 ** 2,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_cache: Optional[AvatarPreparationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_avatar_cache(cache_dir: Path, max_entries: int = 16) -> AvatarPreparationCache:
+    """Get the process-wide avatar preparation cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AvatarPreparationCache(cache_dir, max_entries)
+        return _cache
@@ -0,0 +1,194 @@
+"""
+Cross-session Micro-batching Scheduler
+Gathers UNet and VAE requests from concurrent sessions into single batched forward passes.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from loguru import logger
+
+from .inference_executor import InferenceExecutor
+
+
+@dataclass
+class _PendingRequest:
+    """One session's inputs waiting to be batched."""
+    inputs: Tuple[torch.Tensor, ...]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Batches calls to one forward function.
+
+    Requests are grouped by input shape and dtype. A group is flushed when it
+    reaches ``max_batch_size`` or when its oldest request has waited
+    ``max_wait_ms``, whichever comes first. Every input is concatenated along
+    dim 0 and the output is split back into each caller's slice.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        forward_fn: Callable[..., torch.Tensor],
+        executor: InferenceExecutor,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ):
+        """Initialize the batcher."""
+        self.name = name
+        self.forward_fn = forward_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+
+        self._pending: Dict[Tuple, List[_PendingRequest]] = {}
+        self._flush_handles: Dict[Tuple, asyncio.TimerHandle] = {}
+
+        # Performance tracking
+        self.batches_run = 0
+        self.batch_sizes: List[int] = []
+        self.wait_times: List[float] = []
+
+    @staticmethod
+    def _group_key(inputs: Tuple[torch.Tensor, ...]) -> Tuple:
+        """Requests can only share a batch when all non-batch dims match."""
+        return tuple((tuple(t.shape[1:]), t.dtype, t.device) for t in inputs)
+
+    async def submit(self, *inputs: torch.Tensor) -> torch.Tensor:
+        """Queue inputs for the next batch and await this request's output slice."""
+        loop = asyncio.get_running_loop()
+        key = self._group_key(inputs)
+        request = _PendingRequest(inputs=inputs, future=loop.create_future())
+
+        group = self._pending.setdefault(key, [])
+        group.append(request)
+
+        if len(group) >= self.max_batch_size:
+            self._flush(key)
+        elif len(group) == 1:
+            self._flush_handles[key] = loop.call_later(self.max_wait_s, self._flush, key)
+
+        return await request.future
+
+    def _flush(self, key: Tuple) -> None:
+        """Dispatch the pending group for ``key`` as one batch."""
+        handle = self._flush_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+        group = self._pending.pop(key, None)
+        if group:
+            asyncio.create_task(self._run_batch(group))
+
+    async def _run_batch(self, group: List[_PendingRequest]) -> None:
+        """Run one batched forward pass and distribute the results."""
+        now = time.perf_counter()
+        sizes = [request.inputs[0].shape[0] for request in group]
+
+        try:
+            if len(group) == 1:
+                batched = group[0].inputs
+            else:
+                batched = tuple(
+                    torch.cat([request.inputs[i] for request in group], dim=0)
+                    for i in range(len(group[0].inputs))
+                )
+
+            output = await self.executor.run(self.forward_fn, *batched)
+            slices = torch.split(output, sizes, dim=0)
+
+            for request, result in zip(group, slices):
+                if not request.future.done():
+                    request.future.set_result(result)
+
+        except Exception as e:
+            logger.error(f"Batched {self.name} forward failed: {e}")
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+        self.batches_run += 1
+        self.batch_sizes.append(len(group))
+        self.wait_times.extend(now - request.enqueued_at for request in group)
+
+        # Keep only last 100 measurements
+        if len(self.batch_sizes) > 100:
+            del self.batch_sizes[:-100]
+        if len(self.wait_times) > 100:
+            del self.wait_times[:-100]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching metrics."""
+        stats: Dict[str, Any] = {
+            "batches_run": self.batches_run,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000,
+        }
+        if self.batch_sizes:
+            stats.update({
+                "avg_batch_size": float(np.mean(self.batch_sizes)),
+                "avg_wait_ms": float(np.mean(self.wait_times)) * 1000,
+            })
+        return stats
+
+
+class BatchScheduler:
+    """Process-wide set of micro-batchers, one per shared model and operation."""
+
+    def __init__(self, executor: InferenceExecutor, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        """Initialize the scheduler."""
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers: Dict[str, MicroBatcher] = {}
+
+    def get_batcher(self, name: str, forward_fn: Callable[..., torch.Tensor]) -> MicroBatcher:
+        """
+        Get the batcher for a named operation, creating it on first use.
+
+        Args:
+            name: Operation name, unique per shared model (e.g. its registry key)
+            forward_fn: Blocking batched forward function, used when the batcher is created
+        """
+        if name not in self._batchers:
+            self._batchers[name] = MicroBatcher(
+                name,
+                forward_fn,
+                self.executor,
+                max_batch_size=self.max_batch_size,
+                max_wait_ms=self.max_wait_ms,
+            )
+        return self._batchers[name]
+
+    def remove_batcher(self, name: str) -> None:
+        """Forget the batcher for an operation whose model was unloaded."""
+        self._batchers.pop(name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get metrics for every batcher."""
+        return {name: batcher.get_stats() for name, batcher in self._batchers.items()}
+
+
+_scheduler: Optional[BatchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_batch_scheduler(
+    executor: InferenceExecutor,
+    max_batch_size: int = 8,
+    max_wait_ms: float = 5.0,
+) -> BatchScheduler:
+    """Get the process-wide batch scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BatchScheduler(executor, max_batch_size, max_wait_ms)
+        return _scheduler
@@ -154,6 +154,31 @@ class DWPoseDetector:
         Returns:
             Cropped face image
         """
+        x1, y1, x2, y2 = self.get_face_box(image.shape[:2], bbox, padding)
+        
+        # Extract and resize to standard size
+        face_region = image[y1:y2, x1:x2]
+        face_region = cv2.resize(face_region, (256, 256))
+        
+        return face_region
+    
+    def get_face_box(
+        self,
+        image_shape: Tuple[int, int],
+        bbox: Tuple[int, int, int, int],
+        padding: float = 0.2
+    ) -> Tuple[int, int, int, int]:
+        """
+        Expand a face bounding box by padding, clipped to the image.
+        
+        Args:
+            image_shape: (height, width) of the image
+            bbox: (x1, y1, x2, y2) bounding box
+            padding: Padding ratio to add around face
+            
+        Returns:
+            Padded (x1, y1, x2, y2) box, the region extract_face_region crops
+        """
         x1, y1, x2, y2 = bbox
         w, h = x2 - x1, y2 - y1
         
@@ -162,16 +187,51 @@ class DWPoseDetector:
         pad_h = int(h * padding)
         
         # Expand region with padding
-        x1 = max(0, x1 - pad_w)
-        y1 = max(0, y1 - pad_h)
-        x2 = min(image.shape[1], x2 + pad_w)
-        y2 = min(image.shape[0], y2 + pad_h)
+        return (
+            max(0, x1 - pad_w),
+            max(0, y1 - pad_h),
+            min(image_shape[1], x2 + pad_w),
+            min(image_shape[0], y2 + pad_h),
+        )
+    
+    def get_mouth_box(
+        self,
+        image_shape: Tuple[int, int],
+        face_box: Tuple[int, int, int, int],
+        landmarks: Optional[np.ndarray] = None
+    ) -> Tuple[int, int, int, int]:
+        """
+        Get a square box around the mouth and chin for mouth-only rendering.
         
-        # Extract and resize to standard size
-        face_region = image[y1:y2, x1:x2]
-        face_region = cv2.resize(face_region, (256, 256))
+        Args:
+            image_shape: (height, width) of the image
+            face_box: Padded (x1, y1, x2, y2) face box from get_face_box
+            landmarks: Facial landmarks in image coordinates
+            
+        Returns:
+            (x1, y1, x2, y2) box, clipped to the image
+        """
+        x1, y1, x2, y2 = face_box
+        face_w, face_h = x2 - x1, y2 - y1
         
-        return face_region
+        if landmarks is not None and len(landmarks) >= 468:
+            # Centre on the lips (MediaPipe mouth corners and lip midpoints)
+            lips = landmarks[[61, 291, 0, 17]]
+            center_x, center_y = lips.mean(axis=0)
+            side = max(2.2 * (lips[:, 0].max() - lips[:, 0].min()), 0.45 * face_w)
+        else:
+            # Fallback: the mouth sits around three quarters down a padded face box
+            center_x, center_y = x1 + face_w / 2, y1 + face_h * 0.72
+            side = 0.55 * face_w
+        
+        half = side / 2
+        height, width = image_shape
+        return (
+            max(0, int(center_x - half)),
+            max(0, int(center_y - half)),
+            min(width, int(center_x + half)),
+            min(height, int(center_y + half)),
+        )
     
     def get_mouth_mask(
         self, 
@@ -209,6 +269,43 @@ class DWPoseDetector:
             
         return mask
     
+    def get_eye_boxes(
+        self,
+        landmarks: Optional[np.ndarray],
+        bbox: Tuple[int, int, int, int]
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Get bounding boxes of both eyes.
+        
+        Args:
+            landmarks: Facial landmarks in image coordinates
+            bbox: (x1, y1, x2, y2) face bounding box, used when landmarks are missing
+            
+        Returns:
+            (x1, y1, x2, y2) box for each eye
+        """
+        if landmarks is not None and len(landmarks) >= 468:
+            # MediaPipe face mesh eye contours
+            left_eye = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
+            right_eye = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
+            
+            boxes = []
+            for indices in (left_eye, right_eye):
+                points = landmarks[indices]
+                x1, y1 = points.min(axis=0)
+                x2, y2 = points.max(axis=0)
+                boxes.append((int(x1), int(y1), int(np.ceil(x2)), int(np.ceil(y2))))
+            return boxes
+        
+        # Fallback: typical eye positions within a frontal face box
+        x1, y1, x2, y2 = bbox
+        w, h = x2 - x1, y2 - y1
+        eye_y1, eye_y2 = y1 + int(h * 0.33), y1 + int(h * 0.45)
+        return [
+            (x1 + int(w * 0.18), eye_y1, x1 + int(w * 0.42), eye_y2),
+            (x1 + int(w * 0.58), eye_y1, x1 + int(w * 0.82), eye_y2),
+        ]
+    
     def cleanup(self):
         """Clean up resources."""
         if hasattr(self, 'face_detector') and self.face_detector:
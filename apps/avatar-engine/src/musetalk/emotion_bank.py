@@ -0,0 +1,214 @@
+"""
+Emotion Latent Offset Bank
+Per-avatar latent offsets for facial expressions, blended into the reference latents at render time.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .avatar_cache import PreparedAvatar
+
+
+# Face mesh landmarks the expression warps are anchored to, with the
+# fallback position as a fraction of the face bbox when landmarks are missing
+ANCHORS: Dict[str, Tuple[int, Tuple[float, float]]] = {
+    "mouth_left": (61, (0.32, 0.78)),
+    "mouth_right": (291, (0.68, 0.78)),
+    "upper_lip": (0, (0.50, 0.74)),
+    "lower_lip": (17, (0.50, 0.85)),
+    "cheek_left": (205, (0.28, 0.62)),
+    "cheek_right": (425, (0.72, 0.62)),
+    "brow_inner_left": (55, (0.42, 0.30)),
+    "brow_inner_right": (285, (0.58, 0.30)),
+    "brow_outer_left": (70, (0.22, 0.28)),
+    "brow_outer_right": (300, (0.78, 0.28)),
+}
+
+# Anchor displacements per emotion, as (dx, dy) in face widths (negative dy is up)
+EMOTION_WARPS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "neutral": {},
+    "happy": {
+        "mouth_left": (-0.025, -0.035),
+        "mouth_right": (0.025, -0.035),
+        "cheek_left": (0.0, -0.02),
+        "cheek_right": (0.0, -0.02),
+        "lower_lip": (0.0, 0.01),
+    },
+    "reassuring": {
+        "mouth_left": (-0.012, -0.02),
+        "mouth_right": (0.012, -0.02),
+        "brow_inner_left": (0.0, -0.008),
+        "brow_inner_right": (0.0, -0.008),
+    },
+    "concerned": {
+        "brow_inner_left": (0.012, -0.015),
+        "brow_inner_right": (-0.012, -0.015),
+        "mouth_left": (0.0, 0.012),
+        "mouth_right": (0.0, 0.012),
+    },
+    "sad": {
+        "brow_inner_left": (0.006, -0.02),
+        "brow_inner_right": (-0.006, -0.02),
+        "brow_outer_left": (0.0, 0.01),
+        "brow_outer_right": (0.0, 0.01),
+        "mouth_left": (0.0, 0.03),
+        "mouth_right": (0.0, 0.03),
+    },
+    "surprised": {
+        "brow_inner_left": (0.0, -0.03),
+        "brow_inner_right": (0.0, -0.03),
+        "brow_outer_left": (0.0, -0.03),
+        "brow_outer_right": (0.0, -0.03),
+        "upper_lip": (0.0, -0.01),
+        "lower_lip": (0.0, 0.035),
+    },
+}
+
+# Radius of each anchor's influence, in face widths
+WARP_RADIUS = 0.12
+
+
+def anchor_points(landmarks: Optional[np.ndarray], bbox: Tuple[int, int, int, int]) -> Dict[str, np.ndarray]:
+    """Image coordinates of the warp anchors, from face mesh landmarks or the face bbox."""
+    x1, y1, x2, y2 = bbox
+    points = {}
+    for name, (index, (fx, fy)) in ANCHORS.items():
+        if landmarks is not None and len(landmarks) >= 468:
+            points[name] = np.asarray(landmarks[index][:2], dtype=np.float32)
+        else:
+            points[name] = np.array([x1 + fx * (x2 - x1), y1 + fy * (y2 - y1)], dtype=np.float32)
+    return points
+
+
+def warp_expression(
+    image: np.ndarray,
+    points: Dict[str, np.ndarray],
+    moves: Dict[str, Tuple[float, float]],
+    face_width: float,
+) -> np.ndarray:
+    """
+    Move anchor points with a smooth Gaussian displacement field.
+
+    Args:
+        image: Image to warp
+        points: Anchor positions in image coordinates
+        moves: (dx, dy) per anchor in face widths
+        face_width: Face width in pixels, scaling the moves and the warp radius
+    """
+    height, width = image.shape[:2]
+    grid_x, grid_y = np.meshgrid(
+        np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32)
+    )
+    map_x, map_y = grid_x.copy(), grid_y.copy()
+    two_sigma_sq = 2 * (WARP_RADIUS * face_width) ** 2
+
+    # Backward mapping: each output pixel samples from where the field moved it from
+    for name, (dx, dy) in moves.items():
+        px, py = points[name]
+        weight = np.exp(-((grid_x - px) ** 2 + (grid_y - py) ** 2) / two_sigma_sq)
+        map_x -= weight * dx * face_width
+        map_y -= weight * dy * face_width
+
+    return cv2.remap(image, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
+
+
+def render_emotion_images(prepared: PreparedAvatar, render_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+    """
+    Warp the avatar's render region into each emotion, ready for the VAE encoder (blocking).
+
+    Args:
+        prepared: Prepared avatar; the crop covers its latent region
+        render_size: (width, height) the reference latents were encoded at
+
+    Returns:
+        BGR render-size images per emotion; neutral is the unwarped crop
+    """
+    x1, y1, x2, y2 = prepared.latent_region
+    crop = prepared.image[y1:y2, x1:x2]
+    points = {
+        name: point - np.array([x1, y1], dtype=np.float32)
+        for name, point in anchor_points(prepared.landmarks, prepared.bbox).items()
+    }
+    face_width = float(prepared.bbox[2] - prepared.bbox[0])
+
+    return {
+        emotion: cv2.resize(warp_expression(crop, points, moves, face_width), render_size)
+        for emotion, moves in EMOTION_WARPS.items()
+    }
+
+
+class EmotionBlender:
+    """
+    Time-smoothed blend weights over the emotion bank.
+
+    The current emotion's weight approaches its intensity, and every other
+    weight approaches zero, with an exponential time constant. ``version``
+    changes whenever the weights do, so renderers only recompute the
+    combined offset while a transition is running.
+    """
+
+    def __init__(self, transition_s: float = 0.4):
+        """Initialize a neutral blender."""
+        self.transition_s = transition_s
+        self.target_emotion = "neutral"
+        self.target_intensity = 0.0
+        self.weights: Dict[str, float] = {}
+        self.version = 0
+        self._last_step: Optional[float] = None
+
+    def set_target(self, emotion: str, intensity: float) -> None:
+        """Start a transition towards an emotion at the given intensity."""
+        self.target_emotion = emotion
+        self.target_intensity = 0.0 if emotion == "neutral" else intensity
+
+    def _targets(self) -> Dict[str, float]:
+        targets = {emotion: 0.0 for emotion in self.weights}
+        if self.target_intensity > 0:
+            targets[self.target_emotion] = self.target_intensity
+        return targets
+
+    @property
+    def settled(self) -> bool:
+        """Whether the weights have reached the target."""
+        targets = self._targets()
+        return all(self.weights.get(emotion, 0.0) == value for emotion, value in targets.items())
+
+    def step(self, now: float) -> None:
+        """Advance the transition to time ``now`` (seconds, monotonic)."""
+        dt = 0.0 if self._last_step is None else max(0.0, now - self._last_step)
+        self._last_step = now
+        if self.settled:
+            return
+
+        alpha = 1.0 if self.transition_s <= 0 else 1.0 - math.exp(-dt / self.transition_s)
+        weights = {}
+        for emotion, target in self._targets().items():
+            weight = self.weights.get(emotion, 0.0)
+            weight += (target - weight) * alpha
+            # Snap the tail of the exponential so transitions finish
+            if abs(target - weight) < 1e-3:
+                weight = target
+            if weight:
+                weights[emotion] = weight
+        self.weights = weights
+        self.version += 1
+
+    def cache_tag(self) -> Optional[bytes]:
+        """Tag for rendered patches at the current expression, or None while it is changing."""
+        if not self.settled:
+            return None
+        if not self.weights:
+            return b""
+        return f"|{self.target_emotion}:{self.target_intensity:.2f}".encode()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get the target and current blend weights."""
+        return {
+            "emotion": self.target_emotion,
+            "intensity": self.target_intensity,
+            "weights": dict(self.weights),
+            "transitioning": not self.settled,
+        }
@@ -0,0 +1,160 @@
+"""
+Idle Loop
+Pre-rendered listening animation (blinks, subtle head motion) streamed while the user is silent.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .avatar_cache import PreparedAvatar
+
+
+# Eye closure per frame of a blink (~200 ms at 30 fps)
+BLINK_PROFILE = (0.3, 0.7, 1.0, 1.0, 0.6, 0.25)
+
+
+@dataclass
+class IdleLoop:
+    """A seamless loop of frames for one avatar."""
+    key: str
+    frames: List[np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the frames."""
+        return sum(frame.nbytes for frame in self.frames)
+
+    def frame_at(self, index: int) -> np.ndarray:
+        """Get the frame for an ever-increasing index, wrapping around the loop."""
+        return self.frames[index % len(self.frames)]
+
+
+def render_idle_loop(
+    prepared: PreparedAvatar,
+    eye_boxes: Sequence[Tuple[int, int, int, int]],
+    fps: int = 30,
+    seconds: float = 2.0,
+) -> IdleLoop:
+    """
+    Render an idle loop from a prepared avatar (blocking).
+
+    Motion is a sub-pixel sway and breathing scale that returns to the
+    still image at the loop seam, so the loop can start right after a
+    speech frame. One blink is placed in the first half of the loop.
+
+    Args:
+        prepared: Prepared avatar to animate
+        eye_boxes: (x1, y1, x2, y2) box of each eye
+        fps: Frame rate of the loop
+        seconds: Loop length
+    """
+    count = max(int(round(seconds * fps)), len(BLINK_PROFILE) + 1)
+    blink_start = int(count * 0.4)
+    image = prepared.image
+    h, w = image.shape[:2]
+    center = (w / 2, h * 0.6)
+
+    frames = []
+    for index in range(count):
+        closure = 0.0
+        if blink_start <= index < blink_start + len(BLINK_PROFILE):
+            closure = BLINK_PROFILE[index - blink_start]
+
+        frame = image
+        if closure > 0:
+            frame = image.copy()
+            for box in eye_boxes:
+                _close_eye(frame, image, box, closure)
+
+        phase = 2 * np.pi * index / count
+        matrix = cv2.getRotationMatrix2D(center, 0.3 * np.sin(phase), 1.0 + 0.003 * np.sin(2 * phase))
+        matrix[0, 2] += 0.6 * np.sin(phase)
+        matrix[1, 2] += 0.8 * np.sin(2 * phase)
+        frames.append(cv2.warpAffine(frame, matrix, (w, h), borderMode=cv2.BORDER_REFLECT))
+
+    return IdleLoop(key=prepared.key, frames=frames)
+
+
+def _close_eye(
+    frame: np.ndarray,
+    source: np.ndarray,
+    box: Tuple[int, int, int, int],
+    closure: float,
+) -> None:
+    """Draw the upper lid down over an eye by stretching the skin just above it."""
+    x1, y1, x2, y2 = box
+    eye_w, eye_h = x2 - x1, y2 - y1
+    pad_w, pad_h = max(2, eye_w // 4), max(2, eye_h // 2)
+
+    x1, x2 = max(0, x1 - pad_w), min(source.shape[1], x2 + pad_w)
+    y1, y2 = max(0, y1 - pad_h), min(source.shape[0], y2 + pad_h)
+    roi_w, roi_h = x2 - x1, y2 - y1
+    if roi_w < 4 or roi_h < 4:
+        return
+
+    # Skin band above the eye, stretched down to the closed lid position
+    lid = source[y1:y1 + pad_h, x1:x2]
+    lid_h = pad_h + int(round(closure * (roi_h - pad_h) * 0.75))
+    lid = cv2.resize(lid, (roi_w, lid_h), interpolation=cv2.INTER_LINEAR)
+
+    # Feathered elliptical mask so the lid blends into the surrounding skin
+    mask = np.zeros((roi_h, roi_w), dtype=np.float32)
+    cv2.ellipse(mask, (roi_w // 2, roi_h // 2), (roi_w // 2, roi_h // 2), 0, 0, 360, 1.0, -1)
+    mask[lid_h:] = 0.0
+    kernel = max(3, (min(roi_w, roi_h) // 4) | 1)
+    mask = cv2.GaussianBlur(mask, (kernel, kernel), 0)[:lid_h, :, None]
+
+    region = frame[y1:y1 + lid_h, x1:x2]
+    region[:] = (region * (1 - mask) + lid * mask).astype(np.uint8)
+
+
+class IdleLoopCache:
+    """Process-wide LRU of rendered idle loops keyed by prepared avatar."""
+
+    def __init__(self, max_entries: int = 4):
+        """Initialize the cache."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, IdleLoop]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[IdleLoop]:
+        """Look up the idle loop for an avatar."""
+        with self._lock:
+            loop = self._entries.get(key)
+            if loop is not None:
+                self._entries.move_to_end(key)
+            return loop
+
+    def put(self, loop: IdleLoop) -> None:
+        """Store an idle loop, evicting the least recently used."""
+        with self._lock:
+            self._entries[loop.key] = loop
+            self._entries.move_to_end(loop.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cached loops and memory use."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_mb": sum(loop.nbytes for loop in self._entries.values()) / 1024 ** 2,
+            }
+
+
+_cache: Optional[IdleLoopCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_idle_loop_cache(max_entries: int = 4) -> IdleLoopCache:
+    """Get the process-wide idle loop cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IdleLoopCache(max_entries)
+        return _cache
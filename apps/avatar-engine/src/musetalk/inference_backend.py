@@ -0,0 +1,448 @@
+"""
+Inference Backends
+Run the VAE encoder, VAE decoder, UNet and audio encoder on PyTorch or ONNX Runtime.
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from loguru import logger
+
+from ..core.config import AvatarConfig
+from .model_manager import MuseTalkModelManager
+from .model_registry import get_model_registry
+
+
+# Components a backend runs, by the model weights they come from
+COMPONENTS = {
+    "vae_encoder": "vae",
+    "vae_decoder": "vae",
+    "unet": "unet",
+    "audio_encoder": None,
+}
+
+# Decoder weights the vae_decoder component can run: the full SD VAE or distilled TAESD
+DECODER_MODELS = {
+    "full": "vae",
+    "tiny": "taesd",
+}
+
+# Model manager method loading each weight set
+MODEL_LOADERS = {
+    "vae": "load_vae",
+    "taesd": "load_tiny_vae",
+    "unet": "load_unet",
+}
+
+# Bump when the exported graphs change
+ONNX_EXPORT_VERSION = 1
+ONNX_OPSET = 18
+
+# Width of the audio conditioning vector (the Whisper-tiny embedding size)
+AUDIO_EMBEDDING_DIM = 384
+
+
+class AudioFeatureProjector(nn.Module):
+    """
+    Projects (B, n_mels, frames) log-mel windows to (B, 384) audio conditioning.
+
+    Pools over time and pads to the Whisper-tiny embedding size; in a full
+    implementation this would be the Whisper encoder.
+    """
+
+    def forward(self, features: torch.Tensor) -> torch.Tensor:
+        pooled = features.mean(dim=2)
+        return F.pad(pooled, (0, AUDIO_EMBEDDING_DIM - pooled.shape[-1]))[:, :AUDIO_EMBEDDING_DIM]
+
+
+class _UNetGraph(nn.Module):
+    """UNet forward returning the noise prediction tensor."""
+
+    def __init__(self, unet: nn.Module):
+        super().__init__()
+        self.unet = unet
+
+    def forward(self, latents, timesteps, encoder_hidden_states):
+        return self.unet(latents, timesteps, encoder_hidden_states=encoder_hidden_states).sample
+
+
+class _VaeEncoderGraph(nn.Module):
+    """Images in [-1, 1] to scaled latents (the distribution mode, so encodes are deterministic)."""
+
+    def __init__(self, vae: nn.Module):
+        super().__init__()
+        self.vae = vae
+
+    def forward(self, images):
+        return self.vae.encode(images).latent_dist.mode() * self.vae.config.scaling_factor
+
+
+class _VaeDecoderGraph(nn.Module):
+    """
+    Scaled latents to images in [-1, 1].
+
+    Also fits AutoencoderTiny, whose scaling factor is 1.0: TAESD decodes
+    the UNet's scaled latents as they are.
+    """
+
+    def __init__(self, vae: nn.Module):
+        super().__init__()
+        self.vae = vae
+
+    def forward(self, latents):
+        return self.vae.decode(latents / self.vae.config.scaling_factor).sample
+
+
+# How each component is traced for export: graph wrapper, example inputs, input names, dynamic axes
+_EXPORT_SPECS: Dict[str, Tuple] = {
+    "unet": (
+        _UNetGraph,
+        lambda: (torch.randn(1, 4, 32, 32), torch.zeros((1,), dtype=torch.long), torch.zeros(1, 77, 768)),
+        ("latents", "timesteps", "encoder_hidden_states"),
+        {
+            "latents": {0: "batch", 2: "height", 3: "width"},
+            "timesteps": {0: "batch"},
+            "encoder_hidden_states": {0: "batch"},
+        },
+    ),
+    "vae_encoder": (
+        _VaeEncoderGraph,
+        lambda: (torch.randn(1, 3, 256, 256),),
+        ("images",),
+        {"images": {0: "batch", 2: "height", 3: "width"}},
+    ),
+    "vae_decoder": (
+        _VaeDecoderGraph,
+        lambda: (torch.randn(1, 4, 32, 32),),
+        ("latents",),
+        {"latents": {0: "batch", 2: "height", 3: "width"}},
+    ),
+    "audio_encoder": (
+        lambda model: model,
+        lambda: (torch.randn(1, 80, 32),),
+        ("features",),
+        {"features": {0: "batch", 2: "frames"}},
+    ),
+}
+
+
+def _torch_graph(model: nn.Module, wrap: Callable[[nn.Module], nn.Module]) -> nn.Module:
+    """
+    Graph wrapper around a shared model, built on first use and then reused.
+
+    The wrapper is kept in the model's instance dict rather than registered as
+    a submodule, so it lives exactly as long as the model and stays out of its
+    parameters and state dict.
+    """
+    graphs = model.__dict__.setdefault("_inference_graphs", {})
+    graph = graphs.get(wrap)
+    if graph is None:
+        graph = graphs[wrap] = wrap(model).eval()
+    return graph
+
+
+def _torch_forward(registry_key: str, wrap: Callable[[nn.Module], nn.Module]):
+    """Build a forward that resolves the shared model at call time, so it never pins a stale one."""
+    def forward(*inputs: torch.Tensor) -> torch.Tensor:
+        model = get_model_registry().get(registry_key)
+        if model is None:
+            raise RuntimeError(f"Model not loaded: {registry_key}")
+        with torch.no_grad():
+            return _torch_graph(model, wrap)(*inputs)
+    return forward
+
+
+def _onnx_forward(registry_key: str):
+    """Build a forward that runs the shared ONNX Runtime session resolved at call time."""
+    def forward(*inputs: torch.Tensor) -> torch.Tensor:
+        session = get_model_registry().get(registry_key)
+        if session is None:
+            raise RuntimeError(f"Model not loaded: {registry_key}")
+        feeds = {
+            spec.name: tensor.detach().cpu().numpy().astype(
+                np.int64 if spec.type == "tensor(int64)" else np.float32, copy=False
+            )
+            for spec, tensor in zip(session.get_inputs(), inputs)
+        }
+        output = session.run(None, feeds)[0]
+        return torch.from_numpy(output).to(inputs[0].device)
+    return forward
+
+
+class InferenceBackend(ABC):
+    """
+    Runs the engine's model components.
+
+    Components are ``vae_encoder``, ``vae_decoder``, ``unet`` and
+    ``audio_encoder``. ``forward_fn`` returns a blocking callable that does
+    not hold on to this backend, so it can be shared by the micro-batcher
+    across sessions; ``model_key`` identifies it for batching and caching.
+    """
+
+    name = "base"
+
+    def __init__(self, model_manager: MuseTalkModelManager, decoder: str = "full"):
+        """Initialize the backend."""
+        self.model_manager = model_manager
+        self.decoder = decoder
+        self.registry = get_model_registry()
+        self.loaded: set = set()
+
+    def source_model(self, component: str) -> Optional[str]:
+        """Weight set a component runs (None for the weight-free audio projector)."""
+        if component == "vae_decoder":
+            return DECODER_MODELS[self.decoder]
+        return COMPONENTS[component]
+
+    @property
+    def dtype(self) -> torch.dtype:
+        """Dtype the components take their float inputs in."""
+        return self.model_manager.dtype
+
+    def is_loaded(self, components: Sequence[str]) -> bool:
+        """Check whether every given component is ready to run."""
+        return all(component in self.loaded for component in components)
+
+    async def load(self, components: Sequence[str]) -> None:
+        """Load the given components (no-op for those already loaded)."""
+        for component in components:
+            if component not in self.loaded:
+                await self._load_component(component)
+                self.loaded.add(component)
+
+    @abstractmethod
+    async def _load_component(self, component: str) -> None:
+        """Load one component and take this backend's references to its shared models."""
+
+    @abstractmethod
+    def model_key(self, component: str) -> str:
+        """Key identifying a component's weights and runtime."""
+
+    @abstractmethod
+    def forward_fn(self, component: str) -> Callable[..., torch.Tensor]:
+        """Blocking forward for a component, to run on the inference executor."""
+
+    def cleanup(self) -> None:
+        """Release this backend's references to shared models."""
+        self.loaded.clear()
+
+
+class TorchBackend(InferenceBackend):
+    """Runs the diffusers and PyTorch modules from the model manager directly."""
+
+    name = "torch"
+
+    _WRAPPERS = {
+        "unet": _UNetGraph,
+        "vae_encoder": _VaeEncoderGraph,
+        "vae_decoder": _VaeDecoderGraph,
+    }
+
+    # Components served by float submodules even when their model is quantized
+    _FLOAT_COMPONENTS = {"vae_encoder"}
+
+    def __init__(self, model_manager: MuseTalkModelManager, decoder: str = "full"):
+        """Initialize the PyTorch backend."""
+        super().__init__(model_manager, decoder)
+        self._audio_encoder = AudioFeatureProjector()
+
+    async def _load_component(self, component: str) -> None:
+        # The model manager holds the registry references
+        source = self.source_model(component)
+        if source is not None:
+            model = await getattr(self.model_manager, MODEL_LOADERS[source])()
+            # Wrap at load time so no frame pays for building the wrapper
+            _torch_graph(model, self._WRAPPERS[component])
+
+    def model_key(self, component: str) -> str:
+        """Key identifying a component's weights and runtime."""
+        source = self.source_model(component)
+        if source is None:
+            return f"torch:{component}"
+        # The VAE encoder stays float under cpu-fast, so its outputs (cached avatar latents) keep the float key
+        quantized = component not in self._FLOAT_COMPONENTS
+        return f"{self.model_manager.registry_key(source, quantized)}#{component}"
+
+    def forward_fn(self, component: str) -> Callable[..., torch.Tensor]:
+        """Blocking forward for a component, to run on the inference executor."""
+        if component == "audio_encoder":
+            projector = self._audio_encoder
+
+            def forward(features: torch.Tensor) -> torch.Tensor:
+                with torch.no_grad():
+                    return projector(features)
+            return forward
+
+        return _torch_forward(
+            self.model_manager.registry_key(self.source_model(component)), self._WRAPPERS[component]
+        )
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """
+    Runs ONNX exports of the components on ONNX Runtime's CPU provider.
+
+    Each component is exported once from the float PyTorch weights and kept
+    under ``models_path/onnx``; later starts only create the sessions. Sessions
+    use the configured intra/inter-op thread counts with all graph
+    optimizations enabled, and are shared across sessions through the model
+    registry like the PyTorch weights.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(
+        self,
+        model_manager: MuseTalkModelManager,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 1,
+        decoder: str = "full",
+    ):
+        """Initialize the ONNX Runtime backend."""
+        super().__init__(model_manager, decoder)
+        try:
+            import onnxruntime
+        except ImportError as e:
+            logger.error("onnxruntime backend requested but onnxruntime is not installed")
+            raise ImportError(
+                "The onnxruntime inference backend needs the 'onnx' extra: "
+                "pip install 'heallink-avatar-engine[onnx]'"
+            ) from e
+        self.ort = onnxruntime
+
+        if model_manager.device.type != "cpu" or model_manager.quantize:
+            logger.warning("onnxruntime backend runs float32 on CPU; device and profile apply to PyTorch only")
+
+        # Exports are traced from float32 CPU weights, whatever the engine's device and profile
+        self.export_manager = type(model_manager)(model_manager.models_path, "cpu")
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self._registry_keys: Dict[str, str] = {}
+
+    @property
+    def dtype(self) -> torch.dtype:
+        """Dtype the components take their float inputs in."""
+        return torch.float32
+
+    def _source(self, component: str) -> str:
+        """Weights a component is exported from."""
+        source = self.source_model(component)
+        return self.export_manager.registry_key(source) if source is not None else "projector"
+
+    def export_path(self, component: str) -> Path:
+        """Directory holding a component's export (graph plus external weights)."""
+        fingerprint = hashlib.sha256(
+            f"v{ONNX_EXPORT_VERSION}:{self._source(component)}:{torch.__version__}:opset{ONNX_OPSET}".encode()
+        ).hexdigest()[:16]
+        return self.model_manager.models_path / "onnx" / f"{component}-{fingerprint}"
+
+    def model_key(self, component: str) -> str:
+        """Key identifying a component's export and session options."""
+        return (
+            f"onnx:{component}:{self._source(component)}:"
+            f"intra{self.intra_op_threads}:inter{self.inter_op_threads}"
+        )
+
+    async def _load_component(self, component: str) -> None:
+        path = self.export_path(component)
+        if not (path / "model.onnx").exists():
+            await self._export(component, path)
+
+        key = self.model_key(component)
+        await self.registry.acquire(key, lambda: self._create_session(path / "model.onnx"))
+        self._registry_keys[component] = key
+
+    async def _export(self, component: str, path: Path) -> None:
+        """Export a component from its PyTorch weights (first run only)."""
+        source = self.source_model(component)
+        if source is not None:
+            model = await getattr(self.export_manager, MODEL_LOADERS[source])()
+        else:
+            model = AudioFeatureProjector()
+
+        try:
+            logger.info(f"Exporting {component} to ONNX (first run), caching as {path.name}")
+            await asyncio.to_thread(export_onnx, component, model, path)
+        finally:
+            if source is not None:
+                self.export_manager.release(source)
+
+    def _create_session(self, model_path: Path) -> Any:
+        """Create an ONNX Runtime session with the configured threading (blocking)."""
+        options = self.ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = (
+            self.ort.ExecutionMode.ORT_PARALLEL if self.inter_op_threads > 1
+            else self.ort.ExecutionMode.ORT_SEQUENTIAL
+        )
+        options.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return self.ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+    def forward_fn(self, component: str) -> Callable[..., torch.Tensor]:
+        """Blocking forward for a component, to run on the inference executor."""
+        return _onnx_forward(self.model_key(component))
+
+    def cleanup(self) -> None:
+        """Release this backend's references to shared sessions."""
+        for key in self._registry_keys.values():
+            self.registry.release(key)
+        self._registry_keys.clear()
+        self.export_manager.cleanup()
+        super().cleanup()
+
+
+def export_onnx(component: str, model: nn.Module, path: Path) -> None:
+    """
+    Export one component to ``path/model.onnx`` atomically (blocking).
+
+    Args:
+        component: Component name, selecting the graph wrapper and dynamic axes
+        model: Float32 CPU module the component is traced from
+        path: Export directory; written under a temporary name and renamed into place
+    """
+    wrap, example_inputs, input_names, dynamic_axes = _EXPORT_SPECS[component]
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    try:
+        graph = wrap(model).eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                graph,
+                example_inputs(),
+                str(tmp_path / "model.onnx"),
+                input_names=list(input_names),
+                output_names=["output"],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another process finished the same export first
+        if not (path / "model.onnx").exists():
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def create_inference_backend(config: AvatarConfig, model_manager: MuseTalkModelManager) -> InferenceBackend:
+    """Create the inference backend selected by the configuration."""
+    if config.inference_backend == "onnxruntime":
+        return OnnxRuntimeBackend(
+            model_manager,
+            intra_op_threads=config.onnx_intra_op_threads,
+            inter_op_threads=config.onnx_inter_op_threads,
+            decoder=config.vae_decoder,
+        )
+    return TorchBackend(model_manager, decoder=config.vae_decoder)
@@ -0,0 +1,139 @@
+"""
+Inference Executor
+Runs blocking lip-sync inference off the asyncio event loop on a shared thread pool.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class InferenceLane:
+    """
+    Ordered view on the inference executor for a single session.
+
+    Work submitted through a lane runs one call at a time in submission
+    order, so a session's frames come back in the order they were queued
+    while other sessions' lanes use the remaining workers. A lane can also be
+    held with ``async with`` across a multi-step render.
+    """
+
+    def __init__(self, executor: "InferenceExecutor"):
+        """Initialize the lane."""
+        self.executor = executor
+        self._lock = asyncio.Lock()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable after all earlier work on this lane."""
+        async with self._lock:
+            return await self.executor.run(fn, *args, **kwargs)
+
+    async def __aenter__(self) -> "InferenceLane":
+        """Hold the lane until the block exits."""
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the lane."""
+        self._lock.release()
+
+
+class InferenceExecutor:
+    """
+    Thread pool for blocking model inference.
+
+    PyTorch, OpenCV and NumPy release the GIL inside their kernels, so a
+    thread pool keeps the event loop responsive while sharing the models in
+    the process-wide registry, which a process pool could not do.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """Initialize the executor."""
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="musetalk-inference",
+        )
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._queue_wait_times = []
+        self._run_times = []
+
+        logger.info(f"InferenceExecutor started with {max_workers} workers")
+
+    def create_lane(self) -> InferenceLane:
+        """Create an ordered lane for one session."""
+        return InferenceLane(self)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable on the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+
+        with self._stats_lock:
+            self._in_flight += 1
+
+        def timed_call() -> Any:
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finished_at = time.perf_counter()
+                self._record(started_at - submitted_at, finished_at - started_at)
+
+        try:
+            return await loop.run_in_executor(self._pool, timed_call)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+
+    def _record(self, queue_wait: float, run_time: float) -> None:
+        """Record timing for a completed call."""
+        with self._stats_lock:
+            self._completed += 1
+            self._queue_wait_times.append(queue_wait)
+            self._run_times.append(run_time)
+
+            # Keep only last 100 measurements
+            if len(self._queue_wait_times) > 100:
+                self._queue_wait_times.pop(0)
+                self._run_times.pop(0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor utilisation metrics."""
+        with self._stats_lock:
+            stats = {
+                "workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+            }
+            if self._run_times:
+                stats.update({
+                    "avg_queue_wait_ms": float(np.mean(self._queue_wait_times)) * 1000,
+                    "avg_run_time_ms": float(np.mean(self._run_times)) * 1000,
+                })
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker threads."""
+        self._pool.shutdown(wait=wait)
+        logger.info("InferenceExecutor shut down")
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor(max_workers: int = 2) -> InferenceExecutor:
+    """Get the process-wide inference executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = InferenceExecutor(max_workers)
+        return _executor
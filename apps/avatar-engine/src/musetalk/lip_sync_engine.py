@@ -5,29 +5,47 @@ Provides real-time 2D avatar lip synchronization using MuseTalk architecture.
 This implementation includes:
 - DWPose/MediaPipe for face detection and pose estimation
 - Whisper-tiny for audio encoding
-- Stable Diffusion VAE for image encoding/decoding
+- Stable Diffusion VAE (sd-vae-ft-mse) for image encoding/decoding
 - SD v1-4 UNet for lip sync generation
 - Face parsing and mask generation
 """
 
 import asyncio
-import io
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
-import librosa
 import numpy as np
 import torch
 import torch.nn.functional as F
 from loguru import logger
 from PIL import Image
-from transformers import pipeline
 
 from ..core.config import AvatarConfig
+from ..core.audio_chunker import AudioFrameWindow
+from ..core.quality_controller import QualityTier
 from .model_manager import MuseTalkModelManager
 from .dwpose_detector import DWPoseDetector
+from .inference_executor import get_inference_executor
+from .batch_scheduler import get_batch_scheduler
+from .inference_backend import InferenceBackend, create_inference_backend
+from .avatar_cache import AvatarPreparationCache, PreparedAvatar, get_avatar_cache
+from .render_buffers import RenderBuffers
+from .mouth_patch_cache import MouthPatchCache, get_mouth_patch_cache
+from .idle_loop import IdleLoop, get_idle_loop_cache, render_idle_loop
+from .emotion_bank import EMOTION_WARPS, EmotionBlender, render_emotion_images
+from .video_avatar import (
+    VideoAvatar,
+    get_video_avatar_store,
+    is_video_source,
+    read_video_frames,
+)
+from .audio_frontend import FeatureWindow, StreamingMelFrontend
+
+
+# Components needed to render lip-synced frames
+RENDER_COMPONENTS = ("audio_encoder", "unet", "vae_decoder")
 
 
 class MuseTalkLipSyncEngine:
@@ -48,24 +66,82 @@ class MuseTalkLipSyncEngine:
         self.is_initialized = False
         
         # Model manager and detectors
-        self.model_manager = MuseTalkModelManager(config.models_path, config.device)
+        self.model_manager = MuseTalkModelManager(
+            config.models_path, config.device, config.inference_profile
+        )
         self.dwpose_detector = DWPoseDetector(config.device)
         
-        # Model components (will be loaded on demand)
-        self.vae = None
-        self.unet = None
-        self.whisper_model = None
+        # Runtime for the VAE, UNet and audio encoder (PyTorch or ONNX Runtime)
+        self.backend: InferenceBackend = create_inference_backend(config, self.model_manager)
+        
+        # Blocking inference runs on the shared executor, in order for this engine
+        self.executor = get_inference_executor(config.inference_workers)
+        self.inference_lane = self.executor.create_lane()
+        
+        # UNet and VAE passes from concurrent sessions are batched together
+        self.batch_scheduler = (
+            get_batch_scheduler(self.executor, config.batch_max_size, config.batch_max_wait_ms)
+            if config.enable_micro_batching else None
+        )
+        
+        # Prepared avatars are shared by content hash across sessions and restarts
+        self.avatar_cache = get_avatar_cache(config.avatar_cache_path, config.avatar_cache_size)
+        
+        # MuseTalk-specific weights (shared through the process-wide registry, loaded on demand)
         self.musetalk_weights = None
         
         # Processing state
         self.current_avatar_image: Optional[np.ndarray] = None
         self.avatar_face_info: Optional[Dict[str, Any]] = None
+        self.avatar_face_region: Optional[Tuple[int, int, int, int]] = None
         self.ref_latents: Optional[torch.Tensor] = None
         self.mouth_mask: Optional[np.ndarray] = None
+        self.avatar_key: Optional[str] = None
+        self.prepared_avatar: Optional[PreparedAvatar] = None
+        self.render_buffers: Optional[RenderBuffers] = None
+        self.low_res_buffers: Optional[RenderBuffers] = None
+        self.mouth_cache: Optional[MouthPatchCache] = None
+        
+        # Render quality, stepped down by the session's QualityController when behind
+        self.quality_tier = QualityTier.FULL
+        self._reused_prediction = False
         
-        # Audio processing state
-        self.audio_buffer = []
-        self.audio_context_frames = 3
+        # Half-rate rendering: the last two rendered mouth bands (and latents,
+        # when the frame came from the UNet) for synthesizing the frame between them
+        self.interframe_mode = config.interframe_mode
+        self._rendered_bands: List[np.ndarray] = []
+        self._rendered_latents: List[Optional[torch.Tensor]] = []
+        self.inbetween_frames = 0
+        
+        # Video avatars: per-frame artifacts memory-mapped from a store shared by all sessions
+        self.video_store = get_video_avatar_store(config.avatar_cache_path / "video")
+        self.video_avatar: Optional[VideoAvatar] = None
+        self.video_frame_index = 0
+        
+        # Listening animation, rendered once per avatar and shared across sessions
+        self.idle_loop_cache = get_idle_loop_cache(config.idle_loop_cache_size)
+        self.idle_loop: Optional[IdleLoop] = None
+        self.idle_frame_index = 0
+        self._idle_task: Optional[asyncio.Task] = None
+        
+        # Expression: per-avatar latent offsets, blended into the reference
+        # latents with smoothed transitions instead of extra forward passes
+        self.emotion_blender = EmotionBlender(config.emotion_transition_ms / 1000)
+        self.emotion_offsets: Dict[str, torch.Tensor] = {}
+        self._emotion_task: Optional[asyncio.Task] = None
+        
+        # Hibernation: render tensors and buffers are released while the session is idle
+        self.is_hibernated = False
+        self.hibernations = 0
+        self.resume_times: List[float] = []
+        
+        # Audio processing state: streaming log-mel windows aligned to video frames
+        self.audio_frontend = StreamingMelFrontend(
+            sample_rate=config.audio_sample_rate,
+            fps=config.video_fps,
+        )
+        self.last_feature_window: Optional[FeatureWindow] = None
+        self._feature_windows: Dict[int, FeatureWindow] = {}
         
         # Performance tracking
         self.frame_times = []
@@ -81,8 +157,7 @@ class MuseTalkLipSyncEngine:
             # Ensure all models are downloaded
             await self.model_manager.ensure_all_models()
             
-            # Initialize DWPose detector
-            await self.dwpose_detector.initialize()
+            # The DWPose detector is initialized on the first avatar cache miss
             
             # Load models on demand for better memory management
             logger.info("MuseTalk models ready for on-demand loading")
@@ -94,157 +169,494 @@ class MuseTalkLipSyncEngine:
             logger.error(f"Failed to initialize MuseTalk: {e}")
             raise
     
-    async def _load_audio_encoder(self) -> None:
-        """Load Whisper model for audio feature extraction."""
-        try:
-            logger.info("Loading Whisper audio encoder...")
-            
-            # Use whisper-tiny for real-time performance
-            self.audio_encoder = pipeline(
-                "automatic-speech-recognition",
-                model="openai/whisper-tiny",
-                device=0 if self.device.type == "cuda" else -1,
-                return_timestamps=True,
-            )
-            
-            logger.info("Whisper audio encoder loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to load audio encoder: {e}")
-            raise
-    
-    async def _load_vae(self) -> None:
-        """Load VAE for image encoding/decoding."""
+    async def set_avatar_image(self, image_path: Path) -> None:
+        """Set the avatar image (or looping video, by file suffix) for lip sync generation."""
+        if is_video_source(image_path):
+            return await self.set_avatar_video(image_path)
+        
         try:
-            logger.info("Loading VAE...")
+            logger.info(f"Setting avatar image: {image_path}")
             
-            # Use Stable Diffusion VAE for latent space operations
-            from diffusers import AutoencoderKL
+            image_bytes = Path(image_path).read_bytes()
+            key = AvatarPreparationCache.content_key(image_bytes, self._preparation_variant())
             
-            self.vae = AutoencoderKL.from_pretrained(
-                "runwayml/stable-diffusion-v1-5",
-                subfolder="vae",
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32,
-            ).to(self.device)
+            # Known avatars come from memory, then disk; only misses run detection and VAE
+            prepared = self.avatar_cache.get_from_memory(key)
+            if prepared is None:
+                prepared = await self.executor.run(self.avatar_cache.load_from_disk, key)
+            if prepared is None:
+                prepared = await self._prepare_avatar(image_bytes, key, image_path)
+            else:
+                logger.info(f"Avatar preparation cache hit: {key[:12]}")
             
-            # Set to eval mode for inference
-            self.vae.eval()
+            self._apply_prepared_avatar(prepared)
+            self._schedule_idle_loop()
+            self._schedule_emotion_bank()
             
-            logger.info("VAE loaded successfully")
+            logger.info("Avatar image set successfully")
             
         except Exception as e:
-            logger.error(f"Failed to load VAE: {e}")
+            logger.error(f"Failed to set avatar image: {e}")
             raise
     
-    async def _load_unet(self) -> None:
-        """Load UNet for lip sync generation."""
+    async def set_avatar_video(self, video_path: Path) -> None:
+        """
+        Set a short looping video as the avatar.
+        
+        Face boxes, masks and latents of every frame are prepared once and
+        memory-mapped from the video avatar store, so rendering only indexes
+        into them; sessions on the same video share the mapping.
+        """
         try:
-            logger.info("Loading UNet...")
+            logger.info(f"Setting avatar video: {video_path}")
+            
+            video_bytes = Path(video_path).read_bytes()
+            key = AvatarPreparationCache.content_key(video_bytes, f"{self._preparation_variant()}:video")
             
-            # Use modified UNet from Stable Diffusion for single-step inpainting
-            from diffusers import UNet2DConditionModel
+            video = await self.executor.run(self.video_store.open, key)
+            if video is None:
+                video = await self._prepare_video_avatar(video_path, key)
+            else:
+                logger.info(f"Video avatar store hit: {key[:12]} ({len(video)} frames)")
             
-            self.unet = UNet2DConditionModel.from_pretrained(
-                "runwayml/stable-diffusion-v1-5",
-                subfolder="unet",
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32,
-            ).to(self.device)
+            # The first frame stands in for the video wherever a still avatar is
+            # used (buffer sizing, emotion bank); it is cached like a still avatar
+            prepared = await self.executor.run(self.avatar_cache.get, key)
+            if prepared is None:
+                prepared = video.prepared_frame(0)
+                await self.executor.run(self.avatar_cache.put, prepared)
             
-            # Set to eval mode for inference
-            self.unet.eval()
+            self._apply_prepared_avatar(prepared, video)
+            self._schedule_emotion_bank()
             
-            logger.info("UNet loaded successfully")
+            logger.info("Avatar video set successfully")
             
         except Exception as e:
-            logger.error(f"Failed to load UNet: {e}")
+            logger.error(f"Failed to set avatar video: {e}")
             raise
     
-    async def _load_face_detector(self) -> None:
-        """Load face detection model."""
+    async def _prepare_video_avatar(self, video_path: Path, key: str) -> VideoAvatar:
+        """Run face detection, mask generation and VAE encoding for every frame of a new video."""
+        target_size = getattr(self.config, 'avatar_image_size', (512, 512))
+        frames = await self.executor.run(
+            read_video_frames,
+            video_path,
+            target_size,
+            self.config.video_fps,
+            self.config.avatar_video_max_frames,
+        )
+        if not frames:
+            raise ValueError(f"Could not read frames from video: {video_path}")
+        
+        if not self.dwpose_detector.is_initialized:
+            await self.dwpose_detector.initialize()
+        
+        # Frames where detection fails keep the nearest earlier (or first) detection
+        detections: List[Optional[Dict[str, Any]]] = []
+        for frame in frames:
+            detections.append(await self.inference_lane.run(self._detect_face_region, frame))
+        found = [info for info in detections if info is not None]
+        if not found:
+            raise ValueError("No face detected in avatar video")
+        last = found[0]
+        for index, info in enumerate(detections):
+            last = info if info is not None else last
+            detections[index] = last
+        
+        image_shape = frames[0].shape[:2]
+        face_regions = [self.dwpose_detector.get_face_box(image_shape, info["bbox"]) for info in detections]
+        render_regions = face_regions
+        render_size = (256, 256)
+        if self.config.render_mode == "mouth_roi":
+            render_regions = [
+                self.dwpose_detector.get_mouth_box(image_shape, face_region, info.get("landmarks"))
+                for face_region, info in zip(face_regions, detections)
+            ]
+            render_size = (self.config.mouth_roi_size, self.config.mouth_roi_size)
+        
+        # One render region covering the face in every frame, so all frames
+        # share one set of render buffers
+        regions = np.asarray(render_regions)
+        render_region = (
+            int(regions[:, 0].min()), int(regions[:, 1].min()),
+            int(regions[:, 2].max()), int(regions[:, 3].max()),
+        )
+        
+        landmark_counts = {len(info["landmarks"]) for info in detections if info.get("landmarks") is not None}
+        landmark_count = landmark_counts.pop() if len(landmark_counts) == 1 and len(found) == len(detections) else 0
+        
+        await self.backend.load(("vae_encoder",))
+        writer = await self.executor.run(self.video_store.create, key, {
+            "frames": ((len(frames), *frames[0].shape), np.uint8),
+            "bboxes": ((len(frames), 4), np.int32),
+            "face_regions": ((len(frames), 4), np.int32),
+            "landmarks": ((len(frames), landmark_count, 2), np.float32),
+            "mouth_masks": ((len(frames), 256, 256), np.float32),
+            "ref_latents": ((len(frames), 1, 4, render_size[1] // 8, render_size[0] // 8), np.float32),
+        })
+        
         try:
-            logger.info("Loading face detector...")
-            
-            # Use Haar Cascade for now - simple and reliable
-            # In production, this should be replaced with MMPose/DWPose as used by real MuseTalk
-            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            self.face_detector = cv2.CascadeClassifier(cascade_path)
-            
-            if self.face_detector.empty():
-                raise RuntimeError("Failed to load Haar cascade face detector")
-            
-            logger.info("Haar cascade face detector loaded successfully")
-            logger.warning("⚠️  Using simplified face detection. Real MuseTalk requires MMPose/DWPose")
-            
-        except Exception as e:
-            logger.error(f"Failed to load face detector: {e}")
+            x1, y1, x2, y2 = render_region
+            for index, (frame, info, face_region) in enumerate(zip(frames, detections, face_regions)):
+                landmarks = info.get("landmarks")
+                render_image = cv2.resize(frame[y1:y2, x1:x2], render_size)
+                
+                # One encode per executor job, so live sessions' frames interleave
+                latents = await self.executor.run(self._create_face_embedding, render_image)
+                writer.write(
+                    index,
+                    frames=frame,
+                    bboxes=info["bbox"],
+                    face_regions=face_region,
+                    landmarks=np.asarray(landmarks)[:, :2] if landmark_count else np.empty((0, 2)),
+                    mouth_masks=self.dwpose_detector.get_mouth_mask(landmarks, (256, 256)),
+                    ref_latents=latents.float().cpu().numpy(),
+                )
+            
+            confidence = float(np.mean([info.get("confidence", 0.0) for info in found]))
+            video = await self.executor.run(writer.commit, render_region, confidence)
+        except Exception:
+            writer.abort()
             raise
+        
+        logger.info(f"Video avatar prepared: {len(video)} frames, render region {render_region}")
+        return video
     
-    async def _download_face_detector_models(self) -> None:
-        """Download OpenCV face detector models."""
-        import urllib.request
+    def _preparation_variant(self) -> str:
+        """Settings that change prepared artifacts, folded into the cache key."""
+        target_size = getattr(self.config, 'avatar_image_size', (512, 512))
+        render = self.config.render_mode
+        if render == "mouth_roi":
+            render = f"{render}{self.config.mouth_roi_size}"
+        return f"{target_size[0]}x{target_size[1]}:{render}:{self.backend.model_key('vae_encoder')}"
+    
+    async def _prepare_avatar(self, image_bytes: bytes, key: str, image_path: Path) -> PreparedAvatar:
+        """Run face detection, mask generation and VAE encoding for a new avatar."""
+        # Load and preprocess image
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Could not load image: {image_path}")
         
-        # Use a simpler approach - just download the YuNet face detector
-        base_url = "https://raw.githubusercontent.com/opencv/opencv_zoo/main/models/face_detection_yunet"
+        # Resize to standard size
+        target_size = getattr(self.config, 'avatar_image_size', (512, 512))
+        image = cv2.resize(image, target_size)
         
-        files = [
-            ("face_detection_yunet_2023mar.onnx", "face_detection_yunet_2023mar.onnx"),
-        ]
+        if not self.dwpose_detector.is_initialized:
+            await self.dwpose_detector.initialize()
         
-        for remote_name, local_name in files:
-            url = f"{base_url}/{remote_name}"
-            local_path = self.config.models_path / local_name
-            
-            logger.info(f"Downloading {remote_name} from {url}...")
-            try:
-                urllib.request.urlretrieve(url, local_path)
-                logger.info(f"Successfully downloaded {local_name}")
-            except Exception as e:
-                logger.error(f"Failed to download {remote_name}: {e}")
-                raise
+        # Detect face region and landmarks (off the event loop)
+        face_info = await self.inference_lane.run(self._detect_face_region, image)
+        if face_info is None:
+            raise ValueError("No face detected in avatar image")
+        
+        # Extract face region for processing
+        bbox = face_info["bbox"]
+        face_image = self.dwpose_detector.extract_face_region(image, bbox)
+        face_region = self.dwpose_detector.get_face_box(image.shape[:2], bbox)
+        
+        # Generate mouth mask from landmarks
+        landmarks = face_info.get("landmarks")
+        mouth_mask = self.dwpose_detector.get_mouth_mask(landmarks, face_image.shape[:2])
+        
+        # The region run through the UNet and VAE: the whole face, or only the mouth
+        render_region = face_region
+        render_image = face_image
+        if self.config.render_mode == "mouth_roi":
+            render_region = self.dwpose_detector.get_mouth_box(image.shape[:2], face_region, landmarks)
+            x1, y1, x2, y2 = render_region
+            size = self.config.mouth_roi_size
+            render_image = cv2.resize(image[y1:y2, x1:x2], (size, size))
+        
+        # Create reference latents using VAE (lazy-loaded)
+        ref_latents = await self._create_reference_latents(render_image)
+        latent_size = render_image.shape[0] // 8
+        
+        prepared = PreparedAvatar(
+            key=key,
+            image=image,
+            bbox=tuple(int(v) for v in bbox),
+            face_region=tuple(int(v) for v in face_region),
+            landmarks=landmarks,
+            mouth_mask=mouth_mask,
+            ref_latents=(
+                ref_latents.float().cpu().numpy() if ref_latents is not None
+                else np.zeros((1, 4, latent_size, latent_size), dtype=np.float32)
+            ),
+            confidence=float(face_info.get("confidence", 0.0)),
+            render_region=tuple(int(v) for v in render_region),
+        )
+        
+        # Placeholder latents are not worth remembering
+        if ref_latents is not None:
+            await self.executor.run(self.avatar_cache.put, prepared)
+        else:
+            logger.warning("Using placeholder latents")
+        
+        return prepared
     
-    async def set_avatar_image(self, image_path: Path) -> None:
-        """Set the avatar image for lip sync generation."""
+    def _apply_prepared_avatar(self, prepared: PreparedAvatar, video: Optional[VideoAvatar] = None) -> None:
+        """Make a prepared avatar (standing in for a video avatar's frames, if given) the current render target."""
+        self._load_render_state(prepared)
+        
+        self.video_avatar = video
+        self.video_frame_index = 0
+        self.idle_loop = self.idle_loop_cache.get(prepared.key) if video is None else None
+        self.idle_frame_index = 0
+        
+        # Rendered mouth patches are shared by every session on this avatar; a
+        # video's background changes under the mouth every frame, so it has none
+        self.mouth_cache = (
+            get_mouth_patch_cache(
+                # Patches from different decoders must not be mixed
+                f"{prepared.key}:{self.config.vae_decoder}",
+                self.config.mouth_cache_size,
+                self.config.mouth_cache_levels,
+                self.config.mouth_cache_bands,
+                self.config.avatar_cache_size,
+            )
+            if self.config.mouth_cache_size > 0 and video is None else None
+        )
+    
+    def _load_render_state(self, prepared: PreparedAvatar) -> None:
+        """Load a prepared avatar's arrays and reference tensors for rendering."""
+        dtype = self.backend.dtype
+        
+        self.current_avatar_image = prepared.image
+        self.avatar_face_info = {
+            "bbox": prepared.bbox,
+            "landmarks": prepared.landmarks,
+            "confidence": prepared.confidence,
+        }
+        self.avatar_face_region = prepared.face_region
+        self.ref_latents = torch.from_numpy(prepared.ref_latents).to(self.device, dtype)
+        self.mouth_mask = prepared.mouth_mask
+        self.avatar_key = prepared.key
+        self.prepared_avatar = prepared
+        self.emotion_offsets = {
+            emotion: torch.from_numpy(offset).to(self.device, dtype)
+            for emotion, offset in (prepared.emotion_offsets or {}).items()
+        }
+        
+        # Buffers are sized for the avatar, so they are rebuilt on the next frame
+        self.render_buffers = None
+        self.low_res_buffers = None
+        self.reset_interframe()
+        self.is_hibernated = False
+    
+    async def hibernate(self) -> None:
+        """
+        Release this session's render tensors and buffers while it is idle.
+        
+        The prepared avatar is spilled to the avatar cache's disk store first,
+        so resume only reloads it. The still image, the shared idle loop, the
+        video mapping and the mouth cache stay, so the publisher keeps
+        streaming the idle animation.
+        """
+        if self.is_hibernated or self.prepared_avatar is None:
+            return
+        
         try:
-            logger.info(f"Setting avatar image: {image_path}")
-            
-            # Load and preprocess image
-            image = cv2.imread(str(image_path))
-            if image is None:
-                raise ValueError(f"Could not load image: {image_path}")
-            
-            # Resize to standard size
-            target_size = getattr(self.config, 'avatar_image_size', (512, 512))
-            image = cv2.resize(image, target_size)
-            
-            # Detect face region and landmarks
-            face_info = await self._detect_face_region(image)
-            if face_info is None:
-                raise ValueError("No face detected in avatar image")
-            
-            # Extract face region for processing
-            bbox = face_info["bbox"]
-            face_image = self.dwpose_detector.extract_face_region(image, bbox)
-            
-            # Generate mouth mask from landmarks
-            landmarks = face_info.get("landmarks")
-            mouth_mask = self.dwpose_detector.get_mouth_mask(landmarks, face_image.shape[:2])
-            
-            # Create reference latents using VAE (lazy-loaded)
-            ref_latents = await self._create_reference_latents(face_image)
-            
-            # Store processed data
-            self.current_avatar_image = image
-            self.avatar_face_info = face_info
-            self.ref_latents = ref_latents
-            self.mouth_mask = mouth_mask
-            
-            logger.info("Avatar image set successfully")
+            # Disk I/O, so it must not queue behind other sessions' frames on the inference executor
+            await asyncio.to_thread(self.avatar_cache.spill, self.prepared_avatar)
+        except Exception as e:
+            logger.error(f"Failed to spill avatar before hibernating, staying resident: {e}")
+            return
+        
+        self.ref_latents = None
+        self.mouth_mask = None
+        self.prepared_avatar = None
+        self.emotion_offsets = {}
+        self.render_buffers = None
+        self.low_res_buffers = None
+        self.reset_interframe()
+        if self.device.type == "cuda":
+            torch.cuda.empty_cache()
+        
+        self.is_hibernated = True
+        self.hibernations += 1
+        logger.info(f"Engine hibernated, avatar {self.avatar_key[:12]} spilled to the avatar cache")
+    
+    async def resume(self) -> None:
+        """Reload the render state released by hibernate, including the full-quality buffers."""
+        if not self.is_hibernated:
+            return
+        
+        start_time = time.perf_counter()
+        prepared = self.avatar_cache.get_from_memory(self.avatar_key)
+        if prepared is None:
+            # A disk read must not queue behind other sessions' frames on the inference executor
+            prepared = await asyncio.to_thread(self.avatar_cache.load_from_disk, self.avatar_key)
+        if prepared is None:
+            raise RuntimeError(f"Hibernated avatar {self.avatar_key[:12]} is no longer in the avatar cache")
+        
+        self._load_render_state(prepared)
+        buffers = self._get_render_buffers()
+        self._apply_video_frame(buffers, self.video_frame_index)
+        
+        resume_time = time.perf_counter() - start_time
+        self.resume_times.append(resume_time)
+        if len(self.resume_times) > 100:
+            self.resume_times.pop(0)
+        logger.info(f"Engine resumed in {resume_time * 1000:.1f}ms")
+    
+    def _schedule_idle_loop(self) -> None:
+        """Render the current avatar's idle loop in the background if it is not cached."""
+        if self.idle_loop is not None or self.prepared_avatar is None or self.video_avatar is not None:
+            return
+        if self._idle_task is None or self._idle_task.done():
+            self._idle_task = asyncio.create_task(self._prepare_idle_loop(self.prepared_avatar))
+    
+    async def _prepare_idle_loop(self, prepared: PreparedAvatar) -> None:
+        """Render and cache the idle loop for a prepared avatar."""
+        try:
+            idle_loop = self.idle_loop_cache.get(prepared.key)
+            if idle_loop is None:
+                eye_boxes = self.dwpose_detector.get_eye_boxes(prepared.landmarks, prepared.bbox)
+                idle_loop = await self.executor.run(
+                    render_idle_loop,
+                    prepared,
+                    eye_boxes,
+                    self.config.video_fps,
+                    self.config.idle_loop_seconds,
+                )
+                self.idle_loop_cache.put(idle_loop)
+                logger.info(f"Idle loop rendered: {len(idle_loop.frames)} frames")
+        except Exception as e:
+            logger.error(f"Failed to render idle loop, using the still image: {e}")
+            idle_loop = IdleLoop(key=prepared.key, frames=[prepared.image])
+        
+        # Compared by key: a hibernated session has released the prepared avatar
+        if self.avatar_key == prepared.key:
+            self.idle_loop = idle_loop
+    
+    def _schedule_emotion_bank(self) -> None:
+        """Build the current avatar's emotion offsets in the background if they are not cached."""
+        if not self.config.emotion_bank_enabled or self.prepared_avatar is None:
+            return
+        if self.prepared_avatar.emotion_offsets is not None:
+            return
+        if self._emotion_task is None or self._emotion_task.done():
+            self._emotion_task = asyncio.create_task(self._await_emotion_bank(self.prepared_avatar))
+    
+    async def _await_emotion_bank(self, prepared: PreparedAvatar) -> None:
+        """Wait for the avatar's shared emotion bank build and apply its offsets to this session."""
+        build = self.avatar_cache.emotion_bank_build(
+            prepared.key, lambda: self._prepare_emotion_bank(prepared)
+        )
+        # Shielded: a session going away must not cancel the build other sessions await
+        offsets = await asyncio.shield(build)
+        if offsets is None:
+            return
+        if prepared.emotion_offsets is None:
+            prepared.emotion_offsets = offsets
+        
+        if self.prepared_avatar is prepared:
+            dtype = self.backend.dtype
+            self.emotion_offsets = {
+                emotion: torch.from_numpy(offset).to(self.device, dtype)
+                for emotion, offset in offsets.items()
+            }
+            # Re-apply the current blend to buffers built before the bank existed
+            for buffers in (self.render_buffers, self.low_res_buffers):
+                if buffers is not None:
+                    buffers.offset_version = None
+    
+    async def _prepare_emotion_bank(self, prepared: PreparedAvatar) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Encode each emotion's warped render region once and store its latent offset.
+        
+        Each encode is a separate executor job, so frames being rendered for
+        this and other sessions interleave with the bank instead of waiting for it.
+        
+        Returns:
+            The offsets by emotion, or None if the bank could not be built
+        """
+        try:
+            await self.backend.load(("vae_encoder",))
+            latent_h, latent_w = prepared.ref_latents.shape[-2:]
+            images = await self.executor.run(
+                render_emotion_images, prepared, (latent_w * 8, latent_h * 8)
+            )
             
+            # Offsets are taken against the unwarped crop through the same path,
+            # so resampling differences from the reference encode cancel out
+            latents = {}
+            for emotion, image in images.items():
+                encoded = await self.executor.run(self._create_face_embedding, image)
+                latents[emotion] = encoded.float().cpu().numpy()
+            neutral = latents.pop("neutral")
+            offsets = {emotion: encoded - neutral for emotion, encoded in latents.items()}
+            
+            # Published in one assignment, so readers see no bank or the whole bank
+            prepared.emotion_offsets = offsets
+            await self.executor.run(self.avatar_cache.put, prepared)
+            logger.info(f"Emotion bank built: {', '.join(offsets)}")
+            return offsets
         except Exception as e:
-            logger.error(f"Failed to set avatar image: {e}")
-            raise
+            logger.error(f"Failed to build emotion bank, expressions stay neutral: {e}")
+            return None
+    
+    def set_emotion(self, emotion: str, intensity: float = 1.0) -> None:
+        """
+        Transition the avatar's expression towards an emotion.
+        
+        Only the blend target changes; the offsets are mixed into the
+        reference latents of the following frames, so no forward pass runs.
+        
+        Args:
+            emotion: One of EMOTION_WARPS; unknown emotions fall back to neutral
+            intensity: Blend weight of the emotion's offset, 0.0 to 1.0
+        """
+        if emotion not in EMOTION_WARPS:
+            logger.warning(f"Unknown emotion '{emotion}', using neutral")
+            emotion = "neutral"
+        self.emotion_blender.set_target(emotion, float(np.clip(intensity, 0.0, 1.0)))
+    
+    def _apply_emotion(self, buffers: RenderBuffers) -> None:
+        """Set the buffers' reference latents to the current emotion blend, if it changed."""
+        version = self.emotion_blender.version
+        if buffers.offset_version == version:
+            return
+        
+        offset = None
+        for emotion, weight in self.emotion_blender.weights.items():
+            if emotion in self.emotion_offsets:
+                term = self.emotion_offsets[emotion] * weight
+                offset = term if offset is None else offset + term
+        if offset is not None and offset.shape[-1] != buffers.base_latents.shape[-1]:
+            offset = F.avg_pool2d(offset, 2)
+        buffers.set_latent_offset(offset, version)
+    
+    def next_idle_frame(self) -> Optional[np.ndarray]:
+        """
+        Get the next frame of the idle loop, without running inference.
+        
+        Returns:
+            Idle frame, the still avatar image while the loop is being rendered,
+            or None if no avatar is set
+        """
+        if self.current_avatar_image is None:
+            return None
+        
+        # A video avatar is its own idle animation
+        if self.video_avatar is not None:
+            index = self.video_avatar.loop_index(self.video_frame_index)
+            self.video_frame_index += 1
+            return self.video_avatar.frames[index]
+        
+        if self.idle_loop is None:
+            self._schedule_idle_loop()
+            return self.current_avatar_image
+        
+        frame = self.idle_loop.frame_at(self.idle_frame_index)
+        self.idle_frame_index += 1
+        return frame
     
-    async def _detect_face_region(self, image: np.ndarray) -> Optional[Dict[str, Any]]:
+    def restart_idle_loop(self) -> None:
+        """Start the idle loop from its seam, which matches the still avatar image (video avatars play on)."""
+        self.idle_frame_index = 0
+    
+    def _detect_face_region(self, image: np.ndarray) -> Optional[Dict[str, Any]]:
         """Detect face region and landmarks in the avatar image."""
         try:
             # Use DWPose detector for accurate face detection
@@ -261,56 +673,23 @@ class MuseTalkLipSyncEngine:
             logger.error(f"Face detection failed: {e}")
             return None
     
-    def _extract_face_region(self, image: np.ndarray, face_region: Tuple[int, int, int, int]) -> np.ndarray:
-        """Extract and normalize face region."""
-        x1, y1, x2, y2 = face_region
-        
-        # Add padding around face
-        padding = 0.2
-        w, h = x2 - x1, y2 - y1
-        pad_w, pad_h = int(w * padding), int(h * padding)
-        
-        # Expand region with padding
-        x1 = max(0, x1 - pad_w)
-        y1 = max(0, y1 - pad_h)
-        x2 = min(image.shape[1], x2 + pad_w)
-        y2 = min(image.shape[0], y2 + pad_h)
-        
-        # Extract face region
-        face_image = image[y1:y2, x1:x2]
-        
-        # Resize to standard face size (256x256 for MuseTalk)
-        face_image = cv2.resize(face_image, (256, 256))
-        
-        return face_image
-    
-    async def _create_reference_latents(self, face_image: np.ndarray) -> torch.Tensor:
-        """Create reference latents using VAE encoder."""
+    async def _create_reference_latents(self, face_image: np.ndarray) -> Optional[torch.Tensor]:
+        """Create reference latents using VAE encoder, or None if encoding failed."""
         try:
-            # Lazy load VAE if needed
-            if self.vae is None:
-                self.vae = await self.model_manager.load_vae()
+            # Lazy load the VAE encoder if needed
+            await self.backend.load(("vae_encoder",))
             
-            # Convert face image to tensor
-            face_pil = Image.fromarray(cv2.cvtColor(face_image, cv2.COLOR_BGR2RGB))
-            face_tensor = torch.from_numpy(np.array(face_pil)).float() / 127.5 - 1.0
-            face_tensor = face_tensor.permute(2, 0, 1).unsqueeze(0).to(self.device)
-            
-            # Encode to latent space
-            with torch.no_grad():
-                latents = self.vae.encode(face_tensor).latent_dist.sample()
-                latents = latents * self.vae.config.scaling_factor
+            # Encode to latent space (off the event loop)
+            latents = await self.inference_lane.run(self._create_face_embedding, face_image)
             
             logger.info("Reference latents created successfully")
             return latents
             
         except Exception as e:
             logger.error(f"Failed to create reference latents: {e}")
-            # Return a placeholder for now
-            logger.warning("Using placeholder latents")
-            return torch.zeros((1, 4, 32, 32), device=self.device)
+            return None
     
-    async def _create_face_embedding(self, face_image: np.ndarray) -> torch.Tensor:
+    def _create_face_embedding(self, face_image: np.ndarray) -> torch.Tensor:
         """Create face embedding using VAE encoder."""
         try:
             # Convert to PIL and normalize
@@ -318,25 +697,31 @@ class MuseTalkLipSyncEngine:
             
             # Convert to tensor
             face_tensor = torch.from_numpy(np.array(face_pil)).float() / 127.5 - 1.0
-            face_tensor = face_tensor.permute(2, 0, 1).unsqueeze(0).to(self.device)
+            face_tensor = face_tensor.permute(2, 0, 1).unsqueeze(0).to(self.device, self.backend.dtype)
             
             # Encode to latent space
-            with torch.no_grad():
-                latents = self.vae.encode(face_tensor).latent_dist.sample()
-                latents = latents * self.vae.config.scaling_factor
-            
-            return latents
+            return self.backend.forward_fn("vae_encoder")(face_tensor)
             
         except Exception as e:
             logger.error(f"Failed to create face embedding: {e}")
             raise
     
-    async def process_audio_chunk(self, audio_data: bytes) -> Optional[np.ndarray]:
+    def set_quality_tier(self, tier: QualityTier) -> None:
+        """
+        Set the render quality tier for the following frames.
+        
+        REUSE_LATENTS and LOW_RES are applied here; REDUCED_FPS is applied by
+        the session, which renders only every other frame.
+        """
+        self.quality_tier = tier
+        self._reused_prediction = False
+    
+    async def process_audio_window(self, window: AudioFrameWindow) -> Optional[np.ndarray]:
         """
-        Process audio chunk and generate lip-synced frame.
+        Generate the lip-synced frame for one video frame of audio.
         
         Args:
-            audio_data: Raw audio bytes (16kHz, 16-bit)
+            window: Audio window for the frame, from the session's AudioFrameChunker
             
         Returns:
             Lip-synced video frame or None if processing failed
@@ -345,14 +730,10 @@ class MuseTalkLipSyncEngine:
             return None
             
         # Lazy load models on first use
-        if self.whisper_model is None:
-            logger.info("Lazy-loading MuseTalk models on first use...")
+        if not self.backend.is_loaded(RENDER_COMPONENTS):
+            logger.info(f"Lazy-loading MuseTalk models on first use ({self.backend.name} backend)...")
             try:
-                self.whisper_model = await self.model_manager.load_whisper()
-                if self.vae is None:
-                    self.vae = await self.model_manager.load_vae()
-                if self.unet is None:
-                    self.unet = await self.model_manager.load_unet()
+                await self.backend.load(RENDER_COMPONENTS)
                 logger.info("MuseTalk models loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load MuseTalk models: {e}")
@@ -361,14 +742,10 @@ class MuseTalkLipSyncEngine:
         start_time = time.time()
         
         try:
-            # Convert audio bytes to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-            
-            # Extract audio features
-            audio_features = await self._extract_audio_features(audio_array)
-            
-            # Generate lip-synced frame
-            lip_synced_frame = await self._generate_lip_sync_frame(audio_features)
+            # Hold this engine's lane so frames render in order; each blocking
+            # stage runs on the inference executor to keep the event loop free
+            async with self.inference_lane:
+                lip_synced_frame = await self._render_frame(window)
             
             # Track performance
             processing_time = time.time() - start_time
@@ -378,7 +755,7 @@ class MuseTalkLipSyncEngine:
             if len(self.audio_processing_times) > 100:
                 self.audio_processing_times.pop(0)
             
-            logger.debug(f"Audio chunk processed in {processing_time:.3f}s")
+            logger.debug(f"Audio frame {window.index} processed in {processing_time:.3f}s")
             
             return lip_synced_frame
             
@@ -386,149 +763,267 @@ class MuseTalkLipSyncEngine:
             logger.error(f"Audio processing failed: {e}")
             return None
     
-    async def _extract_audio_features(self, audio_array: np.ndarray) -> torch.Tensor:
-        """Extract audio features using Whisper encoder."""
-        try:
-            # Ensure audio is at 16kHz
-            if len(audio_array) == 0:
-                # Return silence features
-                return torch.zeros((1, 384), device=self.device)  # Whisper-tiny embedding size
-            
-            # Use librosa for feature extraction (faster than full Whisper pipeline)
-            # Extract mel spectrogram features that match Whisper's input
-            mel_spec = librosa.feature.melspectrogram(
-                y=audio_array,
-                sr=self.config.audio_sample_rate,
-                n_mels=80,  # Whisper uses 80 mel bins
-                hop_length=160,  # 10ms hop length
-                n_fft=400,   # 25ms window
-            )
-            
-            # Convert to log scale
-            log_mel = librosa.power_to_db(mel_spec)
-            
-            # Normalize
-            log_mel = (log_mel - log_mel.mean()) / (log_mel.std() + 1e-8)
-            
-            # Convert to tensor
-            audio_tensor = torch.from_numpy(log_mel).float().unsqueeze(0).to(self.device)
-            
-            # Simple projection to Whisper embedding dimension
-            # In a full implementation, you'd use the actual Whisper encoder
-            if audio_tensor.shape[-1] < 1:
-                audio_tensor = torch.zeros((1, 80, 1), device=self.device)
-            
-            # Average pool to get fixed-size features
-            audio_features = F.adaptive_avg_pool1d(audio_tensor, 1).squeeze(-1)
-            
-            # Project to correct dimension
-            if audio_features.shape[-1] != 384:
-                # Simple projection layer (in production, this would be learned)
-                audio_features = F.pad(audio_features, (0, 384 - audio_features.shape[-1]))[:, :384]
-            
-            return audio_features
-            
-        except Exception as e:
-            logger.error(f"Audio feature extraction failed: {e}")
-            return torch.zeros((1, 384), device=self.device)
+    async def _render_frame(self, window: AudioFrameWindow) -> Optional[np.ndarray]:
+        """Generate a frame for the feature window matching an audio window."""
+        feature_window = await self.executor.run(self._feature_window_for, window)
+        if feature_window is None:
+            # Not enough audio yet for the first window's right context
+            return None
+        
+        self.emotion_blender.step(time.monotonic())
+        
+        # Each output frame takes the next video frame; at half rate the frame
+        # between two renders is left for the in-between frame
+        if self.video_avatar is not None:
+            self.video_frame_index += 1 if self.interframe_mode == "off" else 2
+        
+        # Repeated mouth shapes reuse a cached patch and skip inference entirely;
+        # patches are keyed by expression and not cached mid-transition
+        patch_key = None
+        cache_tag = self.emotion_blender.cache_tag()
+        if self.mouth_cache is not None and self.ref_latents is not None and cache_tag is not None:
+            patch_key = self.mouth_cache.quantize(feature_window.features) + cache_tag
+            patch = self.mouth_cache.get(patch_key)
+            if patch is not None:
+                buffers = self._get_render_buffers()
+                frame = buffers.paste_patch(patch)
+                self._remember_rendered(buffers, frame, None)
+                return frame
+        
+        audio_features = self._extract_audio_features(feature_window)
+        return await self._generate_lip_sync_frame(audio_features, patch_key)
     
-    async def _generate_lip_sync_frame(self, audio_features: torch.Tensor) -> np.ndarray:
-        """Generate lip-synced frame using MuseTalk architecture."""
+    def _feature_window_for(self, window: AudioFrameWindow) -> Optional[FeatureWindow]:
+        """Feed the frontend up to the window's right context and return the frame's features."""
+        # The frontend sees the same sample timeline as the chunker; audio
+        # dropped upstream is replaced with silence to keep the two aligned
+        end = window.end_sample + len(window.right_context)
+        missing = end - self.audio_frontend.samples_received
+        if missing > 0:
+            context = window.context_samples
+            if missing > len(context):
+                self.audio_frontend.push(np.zeros(missing - len(context), dtype=np.float32))
+                missing = len(context)
+            for feature_window in self.audio_frontend.push(context[-missing:]):
+                self._feature_windows[feature_window.index] = feature_window
+        
+        # Windows can complete slightly ahead of their audio frame; keep those for later
+        for index in [i for i in self._feature_windows if i < window.index]:
+            del self._feature_windows[index]
+        feature_window = self._feature_windows.pop(window.index, None)
+        if feature_window is not None:
+            self.last_feature_window = feature_window
+        return self.last_feature_window
+    
+    def _extract_audio_features(self, window: FeatureWindow) -> torch.Tensor:
+        """Project a log-mel feature window to the (1, 384) audio conditioning vector."""
+        features = torch.from_numpy(window.features).to(self.device).unsqueeze(0)
+        return self.backend.forward_fn("audio_encoder")(features)
+    
+    async def _generate_lip_sync_frame(
+        self,
+        audio_features: torch.Tensor,
+        patch_key: Optional[bytes] = None
+    ) -> np.ndarray:
+        """Generate lip-synced frame using MuseTalk architecture, caching its mouth patch under patch_key."""
         try:
-            if self.face_embedding is None:
+            if self.ref_latents is None:
                 return self.current_avatar_image
             
-            # Create conditioning for UNet
-            # This is a simplified version - full MuseTalk would have specialized conditioning
-            text_embeddings = torch.zeros((1, 77, 768), device=self.device)
-            
-            # Create noise for the lip region (single-step inpainting)
-            noise = torch.randn_like(self.face_embedding)
-            
-            # Scale noise based on audio intensity
-            audio_intensity = torch.norm(audio_features, dim=-1, keepdim=True)
-            noise_scale = torch.clamp(audio_intensity * 0.1, 0.01, 0.3)
-            scaled_noise = noise * noise_scale.unsqueeze(-1).unsqueeze(-1)
-            
-            # Apply noise to mouth region of face embedding
-            # In full MuseTalk, this would be more sophisticated mouth region detection
-            noisy_latents = self.face_embedding + scaled_noise
+            tier = self.quality_tier
+            buffers = self._get_render_buffers(low_res=tier >= QualityTier.LOW_RES)
+            self._apply_video_frame(buffers, self.video_frame_index - 1)
+            self._apply_emotion(buffers)
+            
+            # Scale noise based on audio intensity and apply it to the reference
+            # latents (single-step inpainting); conditioning is a zero embedding
+            # in this simplified version of MuseTalk
+            audio_intensity = torch.norm(audio_features, dim=-1)
+            noise_scale = float(torch.clamp(audio_intensity * 0.1, 0.01, 0.3))
+            noisy_latents = buffers.prepare_latents(noise_scale)
+            
+            # Single-step denoising with UNet; under load every other frame reuses
+            # the last prediction, so only the decoder runs
+            reuse = (
+                tier >= QualityTier.REUSE_LATENTS
+                and buffers.last_noise_pred is not None
+                and not self._reused_prediction
+            )
+            if reuse:
+                noise_pred = buffers.last_noise_pred
+            else:
+                noise_pred = await self._unet_forward(
+                    noisy_latents, buffers.timesteps, buffers.text_embeddings
+                )
+            self._reused_prediction = reuse
             
-            # Single-step denoising with UNet
-            with torch.no_grad():
-                # Create timestep (single step, so t=0)
-                timesteps = torch.zeros((1,), device=self.device, dtype=torch.long)
-                
-                # Predict the denoised latents
-                noise_pred = self.unet(
-                    noisy_latents,
-                    timesteps,
-                    encoder_hidden_states=text_embeddings,
-                ).sample
-                
-                # Apply the prediction (simplified single-step)
-                denoised_latents = noisy_latents - noise_pred * 0.1
+            # Apply the prediction (simplified single-step)
+            denoised_latents = buffers.apply_prediction(noise_pred)
             
             # Decode back to image
-            with torch.no_grad():
-                decoded_image = self.vae.decode(denoised_latents / self.vae.config.scaling_factor).sample
+            decoded_image = await self._vae_decode(denoised_latents)
             
-            # Convert to numpy and denormalize
-            decoded_image = (decoded_image / 2 + 0.5).clamp(0, 1)
-            decoded_image = decoded_image.squeeze(0).permute(1, 2, 0).cpu().numpy()
-            decoded_image = (decoded_image * 255).astype(np.uint8)
+            frame = await self.executor.run(buffers.composite, decoded_image)
             
-            # Convert RGB to BGR for OpenCV
-            decoded_image = cv2.cvtColor(decoded_image, cv2.COLOR_RGB2BGR)
+            # Only full-quality patches are worth serving to later frames
+            if patch_key is not None and tier == QualityTier.FULL:
+                self.mouth_cache.put(patch_key, buffers.extract_patch(frame))
             
-            # Resize back to avatar size
-            decoded_image = cv2.resize(decoded_image, getattr(self.config, 'avatar_image_size', (512, 512)))
-            
-            # Blend with original image (only update mouth region)
-            result_image = self.current_avatar_image.copy()
-            if self.avatar_face_region:
-                x1, y1, x2, y2 = self.avatar_face_region
-                
-                # Resize decoded face to match face region
-                face_h, face_w = y2 - y1, x2 - x1
-                if face_h > 0 and face_w > 0:
-                    decoded_face = cv2.resize(decoded_image, (face_w, face_h))
-                    
-                    # Create mask for mouth region (lower 40% of face)
-                    mask = np.zeros((face_h, face_w), dtype=np.float32)
-                    mouth_start = int(face_h * 0.6)
-                    mask[mouth_start:, :] = 1.0
-                    
-                    # Apply Gaussian blur to mask for smooth blending
-                    mask = cv2.GaussianBlur(mask, (15, 15), 0)
-                    mask = np.stack([mask] * 3, axis=-1)
-                    
-                    # Blend images
-                    original_face = result_image[y1:y2, x1:x2]
-                    blended_face = (original_face * (1 - mask) + decoded_face * mask).astype(np.uint8)
-                    result_image[y1:y2, x1:x2] = blended_face
-            
-            return result_image
+            self._remember_rendered(buffers, frame, denoised_latents)
+            return frame
             
         except Exception as e:
             logger.error(f"Frame generation failed: {e}")
             return self.current_avatar_image
     
+    def _remember_rendered(
+        self,
+        buffers: RenderBuffers,
+        frame: np.ndarray,
+        latents: Optional[torch.Tensor]
+    ) -> None:
+        """Keep a rendered frame's mouth band and latents for the next in-between frame."""
+        if self.interframe_mode == "off":
+            return
+        
+        self._rendered_bands = self._rendered_bands[-1:] + [buffers.extract_patch(frame)]
+        if latents is not None and self.interframe_mode == "latent":
+            latents = latents.clone()
+        else:
+            latents = None
+        self._rendered_latents = self._rendered_latents[-1:] + [latents]
+    
+    def reset_interframe(self) -> None:
+        """Forget rendered frames, so no frame is synthesized across a pause in speech."""
+        self._rendered_bands = []
+        self._rendered_latents = []
+    
+    async def interpolate_frame(self) -> Optional[np.ndarray]:
+        """
+        Synthesize the frame between the last two rendered frames.
+        
+        In "latent" mode the midpoint of the two frames' latents is decoded
+        (one decoder pass, no UNet); in "blend" mode, or when either frame
+        came from the mouth patch cache, the two mouth bands are averaged.
+        
+        Returns:
+            The in-between frame, or None if fewer than two frames were rendered
+        """
+        if len(self._rendered_bands) < 2 or self.prepared_avatar is None:
+            return None
+        
+        try:
+            previous, latest = self._rendered_latents
+            if (
+                previous is not None
+                and latest is not None
+                and previous.shape == latest.shape
+            ):
+                buffers = self._get_render_buffers(low_res=latest.shape[-1] < self.ref_latents.shape[-1])
+                self._apply_video_frame(buffers, self.video_frame_index - 2)
+                async with self.inference_lane:
+                    decoded = await self._vae_decode(torch.lerp(previous, latest, 0.5))
+                    frame = await self.executor.run(buffers.composite, decoded)
+            else:
+                buffers = self._get_render_buffers()
+                self._apply_video_frame(buffers, self.video_frame_index - 2)
+                frame = buffers.blend_patches(*self._rendered_bands)
+            
+            self.inbetween_frames += 1
+            return frame
+            
+        except Exception as e:
+            logger.error(f"In-between frame synthesis failed: {e}")
+            return None
+    
+    def _apply_video_frame(self, buffers: RenderBuffers, frame_index: int) -> None:
+        """Point render buffers at a video avatar's frame for an output frame index."""
+        if self.video_avatar is None:
+            return
+        
+        index = self.video_avatar.loop_index(max(frame_index, 0))
+        if buffers.source_index == index:
+            return
+        
+        latents = torch.from_numpy(np.array(self.video_avatar.ref_latents[index]))
+        latents = latents.to(self.device, self.backend.dtype)
+        if latents.shape[-1] != buffers.base_latents.shape[-1]:
+            latents = F.avg_pool2d(latents, 2)
+        buffers.set_source(self.video_avatar.frames[index], latents, index)
+    
+    def _get_render_buffers(self, low_res: bool = False) -> RenderBuffers:
+        """
+        Get the per-session render buffers, allocating them for the current avatar.
+        
+        Args:
+            low_res: Get the LOW_RES tier buffers, rendering 2x downsampled
+                latents (falls back to full resolution below 16x16 latents)
+        """
+        if low_res and min(self.ref_latents.shape[-2:]) >= 16:
+            if self.low_res_buffers is None:
+                self.low_res_buffers = self._create_render_buffers(F.avg_pool2d(self.ref_latents, 2))
+            return self.low_res_buffers
+        
+        if self.render_buffers is None:
+            self.render_buffers = self._create_render_buffers(self.ref_latents)
+        return self.render_buffers
+    
+    def _create_render_buffers(self, ref_latents: torch.Tensor) -> RenderBuffers:
+        """Allocate render buffers decoding the given reference latents into the render region."""
+        latent_h, latent_w = ref_latents.shape[-2:]
+        mouth_only = self.config.render_mode == "mouth_roi"
+        return RenderBuffers(
+            self.prepared_avatar,
+            ref_latents,
+            decode_size=(latent_w * 8, latent_h * 8),
+            # A mouth crop is blended from its top, with every edge feathered
+            mouth_start=0.0 if mouth_only else 0.6,
+            feather_edges=mouth_only,
+        )
+    
+    async def _unet_forward(
+        self,
+        noisy_latents: torch.Tensor,
+        timesteps: torch.Tensor,
+        text_embeddings: torch.Tensor
+    ) -> torch.Tensor:
+        """Predict noise with the UNet, batched with other sessions when enabled."""
+        return await self._run_component("unet", noisy_latents, timesteps, text_embeddings)
+    
+    async def _vae_decode(self, latents: torch.Tensor) -> torch.Tensor:
+        """Decode latents with the VAE, batched with other sessions when enabled."""
+        return await self._run_component("vae_decoder", latents)
+    
+    async def _run_component(self, component: str, *inputs: torch.Tensor) -> torch.Tensor:
+        """Run a backend component on the executor, batched with other sessions when enabled."""
+        forward = self.backend.forward_fn(component)
+        if self.batch_scheduler is None:
+            return await self.executor.run(forward, *inputs)
+        
+        batcher = self.batch_scheduler.get_batcher(self.backend.model_key(component), forward)
+        return await batcher.submit(*inputs)
+    
     async def cleanup(self) -> None:
         """Cleanup resources."""
         logger.info("Cleaning up MuseTalk engine...")
         
-        # Clear GPU memory
-        if self.vae is not None:
-            del self.vae
-        if self.unet is not None:
-            del self.unet
-        if self.audio_encoder is not None:
-            del self.audio_encoder
-        
-        # Clear CUDA cache
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
+        # Drop our references; shared models are unloaded once no session holds them
+        self.ref_latents = None
+        self.render_buffers = None
+        self.low_res_buffers = None
+        self.reset_interframe()
+        self.mouth_cache = None
+        self.video_avatar = None
+        self.idle_loop = None
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+        if self._emotion_task is not None:
+            self._emotion_task.cancel()
+            self._emotion_task = None
+        self.emotion_offsets = {}
+        self.backend.cleanup()
+        self.model_manager.cleanup()
         
         self.is_initialized = False
         logger.info("MuseTalk cleanup complete")
@@ -542,11 +1037,40 @@ class MuseTalkLipSyncEngine:
         max_processing_time = np.max(self.audio_processing_times)
         min_processing_time = np.min(self.audio_processing_times)
         
-        return {
+        metrics = {
             "avg_processing_time_ms": avg_processing_time * 1000,
             "max_processing_time_ms": max_processing_time * 1000,
             "min_processing_time_ms": min_processing_time * 1000,
             "estimated_fps": 1.0 / avg_processing_time if avg_processing_time > 0 else 0,
             "total_frames_processed": len(self.audio_processing_times),
             "device": str(self.device),
-        }
\ No newline at end of file
+            "inference_backend": self.backend.name,
+            "vae_decoder": self.config.vae_decoder,
+            "quality_tier": self.quality_tier.name,
+            "interframe_mode": self.interframe_mode,
+            "inbetween_frames": self.inbetween_frames,
+            "emotion": {
+                **self.emotion_blender.get_stats(),
+                "bank_ready": bool(self.emotion_offsets),
+            },
+            "hibernated": self.is_hibernated,
+            "hibernations": self.hibernations,
+        }
+        
+        if self.resume_times:
+            metrics["resume_ms"] = {
+                "last": self.resume_times[-1] * 1000,
+                "avg": float(np.mean(self.resume_times)) * 1000,
+                "max": float(np.max(self.resume_times)) * 1000,
+            }
+        
+        if self.mouth_cache is not None:
+            metrics["mouth_cache"] = self.mouth_cache.get_stats()
+        
+        if self.video_avatar is not None:
+            metrics["video_avatar"] = {
+                "frames": len(self.video_avatar),
+                **self.video_store.get_stats(),
+            }
+        
+        return metrics
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Memory-Mapped Model Weights
+Weights converted once to safetensors under models_path and mapped copy-on-write at load time.
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import torch
+import torch.nn as nn
+from loguru import logger
+from safetensors.torch import save_file
+
+
+# Bump when the conversion changes what is written
+MAPPED_WEIGHTS_VERSION = 1
+
+# safetensors dtype names
+DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def mapped_weights_path(models_path: Path, name: str, source: str) -> Path:
+    """
+    Path of the converted safetensors file for a weight set.
+
+    The file name folds in the source weights (checkpoint, dtype) and the
+    conversion version, so a changed checkpoint never maps stale weights.
+    """
+    fingerprint = hashlib.sha256(f"v{MAPPED_WEIGHTS_VERSION}:{source}".encode()).hexdigest()[:16]
+    return models_path / "safetensors" / f"{name}-{fingerprint}.safetensors"
+
+
+def save_weights(state: Dict[str, torch.Tensor], path: Path, metadata: Optional[Dict[str, str]] = None) -> None:
+    """Write a state dict as safetensors atomically; tensors sharing storage are stored separately."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+    tensors = {}
+    seen = set()
+    for name, tensor in state.items():
+        tensor = tensor.detach().to("cpu").contiguous()
+        storage = tensor.untyped_storage().data_ptr()
+        tensors[name] = tensor.clone() if storage in seen else tensor
+        seen.add(storage)
+
+    try:
+        save_file(tensors, str(tmp_path), metadata=metadata)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to persist safetensors weights: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def map_weights(path: Path) -> Tuple[Dict[str, torch.Tensor], Dict[str, str]]:
+    """
+    Map a safetensors file without reading it (blocking).
+
+    The file is mapped private and copy-on-write: pages are read on first
+    touch and stay in the page cache, shared by every process mapping the
+    file, and writes to a tensor never reach the file.
+
+    Returns:
+        (tensors, metadata)
+    """
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+
+    storage = torch.UntypedStorage.from_file(str(path), shared=False, nbytes=path.stat().st_size)
+    data = torch.empty(0, dtype=torch.uint8).set_(storage)[8 + header_size:]
+
+    metadata = header.pop("__metadata__", None) or {}
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        tensors[name] = data[begin:end].view(DTYPES[info["dtype"]]).view(info["shape"])
+    return tensors, metadata
+
+
+def load_mapped_model(path: Path, build_empty: Callable[[Dict[str, str]], nn.Module]) -> Optional[nn.Module]:
+    """
+    Build a model whose parameters are the mapped tensors, with no copy and no initialization.
+
+    Args:
+        path: safetensors file written by save_weights
+        build_empty: Builds the architecture from the file's metadata (run on the meta device)
+
+    Returns:
+        The model, or None if there is no usable file
+    """
+    if not path.exists():
+        return None
+
+    try:
+        state, metadata = map_weights(path)
+        with torch.device("meta"):
+            model = build_empty(metadata)
+        model.load_state_dict(state, strict=True, assign=True)
+
+        # Non-persistent buffers are not in the file and would stay on the meta device
+        tensors = list(model.named_parameters()) + list(model.named_buffers())
+        missing = [name for name, tensor in tensors if tensor.is_meta]
+        if missing:
+            logger.warning(f"Mapped weights {path.name} lack tensors {sorted(missing)[:3]}, loading from the checkpoint")
+            return None
+
+        return model
+
+    except Exception as e:
+        logger.warning(f"Discarding unreadable safetensors weights {path.name}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+
+def load_or_convert(
+    path: Path,
+    load_pretrained: Callable[[], nn.Module],
+    build_empty: Callable[[Dict[str, str]], nn.Module],
+    describe: Callable[[nn.Module], Dict[str, str]] = lambda model: {},
+) -> nn.Module:
+    """
+    Map a model's converted weights, or convert them from the checkpoint on first use (blocking).
+
+    Args:
+        path: Converted file from mapped_weights_path
+        load_pretrained: Loads the model from its checkpoint, in the dtype to store
+        build_empty: Builds the architecture from the metadata written by describe
+        describe: Metadata needed to rebuild the architecture (e.g. its config as JSON)
+    """
+    model = load_mapped_model(path, build_empty)
+    if model is not None:
+        logger.info(f"Mapped cached safetensors weights: {path.name}")
+        return model
+
+    logger.info(f"Converting weights to safetensors (first run), caching as {path.name}")
+    model = load_pretrained()
+    save_weights(model.state_dict(), path, describe(model))
+
+    # Map the new file too, so the converting process does not keep a private copy
+    return load_mapped_model(path, build_empty) or model
+
+
+def load_or_convert_state(
+    path: Path,
+    load_checkpoint: Callable[[], Dict[str, torch.Tensor]],
+) -> Dict[str, torch.Tensor]:
+    """Map a converted state dict, or convert it from the checkpoint on first use (blocking)."""
+    if path.exists():
+        try:
+            state, _ = map_weights(path)
+            logger.info(f"Mapped cached safetensors weights: {path.name}")
+            return state
+        except Exception as e:
+            logger.warning(f"Discarding unreadable safetensors weights {path.name}: {e}")
+            path.unlink(missing_ok=True)
+
+    logger.info(f"Converting checkpoint to safetensors (first run), caching as {path.name}")
+    state = load_checkpoint()
+    save_weights(state, path)
+    if not path.exists():
+        return state
+    return map_weights(path)[0]
+
+
+def diffusers_metadata(model: nn.Module) -> Dict[str, str]:
+    """Metadata for rebuilding a diffusers model with from_config, without the hub."""
+    return {"config": json.dumps(dict(model.config), default=str)}
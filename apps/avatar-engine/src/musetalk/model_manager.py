@@ -1,6 +1,7 @@
 """
 MuseTalk Model Manager
 Handles downloading and loading of all required models for the MuseTalk pipeline.
+Loaded weights live in the process-wide model registry and are shared by all sessions.
 """
 
 import os
@@ -12,6 +13,15 @@ from huggingface_hub import hf_hub_download, snapshot_download
 import urllib.request
 import json
 
+from .model_registry import get_model_registry
+from .quantization import load_or_quantize, quantized_state_path
+from .mapped_weights import (
+    diffusers_metadata,
+    load_or_convert,
+    load_or_convert_state,
+    mapped_weights_path,
+)
+
 
 class MuseTalkModelManager:
     """Manages all models required for MuseTalk."""
@@ -28,6 +38,11 @@ class MuseTalkModelManager:
             "filename": None,
             "type": "diffusers"
         },
+        "taesd": {
+            "repo_id": "madebyollin/taesd",
+            "filename": None,
+            "type": "diffusers"
+        },
         "unet": {
             "repo_id": "runwayml/stable-diffusion-v1-4",
             "subfolder": "unet",
@@ -50,15 +65,86 @@ class MuseTalkModelManager:
         }
     }
     
-    def __init__(self, models_path: Path, device: str = "cuda"):
+    # Submodules quantized to int8 by the cpu-fast profile
+    QUANTIZED_TARGETS = {
+        "unet": ("",),
+        "vae": ("decoder",),
+    }
+    
+    def __init__(self, models_path: Path, device: str = "cuda", profile: str = "default"):
         """Initialize the model manager."""
         self.models_path = models_path
         self.device = torch.device(device)
         self.models_path.mkdir(parents=True, exist_ok=True)
         
-        # Model cache
+        self.dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+        
+        # Dynamic int8 quantization only runs on CPU
+        self.quantize = profile == "cpu-fast" and self.device.type == "cpu"
+        if profile == "cpu-fast" and not self.quantize:
+            logger.warning("cpu-fast profile requested on a non-CPU device, using float weights")
+        
+        # Models this manager holds a registry reference to, by model name
+        self.registry = get_model_registry()
         self.loaded_models: Dict[str, Any] = {}
+        self._registry_keys: Dict[str, str] = {}
+        
+    def registry_key(self, model_name: str, quantized: bool = True) -> str:
+        """
+        Build the registry key identifying a weight set on this device.
+        
+        With quantized=False the key names the float weights even under the
+        cpu-fast profile, for parts of a model that are never quantized.
+        """
+        config = self.MODELS[model_name]
+        source = config.get("repo_id") or config.get("url")
+        if config.get("subfolder"):
+            source = f"{source}/{config['subfolder']}"
+        dtype = str(self.dtype).replace('torch.', '')
+        if quantized and self.quantize and model_name in self.QUANTIZED_TARGETS:
+            dtype = f"{dtype}+int8"
+        return f"{model_name}:{source}:{self.device}:{dtype}"
+    
+    def _weights_source(self, model_name: str) -> str:
+        """Identify a float weight set (checkpoint and dtype), independent of device and quantization."""
+        config = self.MODELS[model_name]
+        source = config.get("repo_id") or config.get("url")
+        if config.get("subfolder"):
+            source = f"{source}/{config['subfolder']}"
+        return f"{source}:{str(self.dtype).replace('torch.', '')}"
+    
+    def _load_mapped(self, model_name: str, load_pretrained, build_empty, describe=diffusers_metadata):
+        """
+        Load a model with memory-mapped safetensors weights (blocking).
         
+        The checkpoint is converted once and cached under models_path; later
+        loads map the file instead of reading it, so startup does no I/O up
+        front and processes on the node share the weight pages.
+        """
+        path = mapped_weights_path(self.models_path, model_name, self._weights_source(model_name))
+        return load_or_convert(path, load_pretrained, build_empty, describe).to(self.device)
+    
+    def _load_quantized(self, model_name: str, load_float, build_empty, describe=diffusers_metadata):
+        """
+        Load the int8 variant of a model, quantizing and caching it on first use (blocking).
+        
+        The cache entry stores the architecture metadata next to the int8
+        weights, so a cached start rebuilds the model without the hub.
+        """
+        path = quantized_state_path(self.models_path, model_name, self.registry_key(model_name))
+        return load_or_quantize(path, load_float, build_empty, self.QUANTIZED_TARGETS[model_name], describe)
+    
+    async def _acquire(self, model_name: str, loader) -> Any:
+        """Get a shared model from the registry, taking one reference per manager."""
+        if model_name in self.loaded_models:
+            return self.loaded_models[model_name]
+        
+        key = self.registry_key(model_name)
+        model = await self.registry.acquire(key, loader)
+        self.loaded_models[model_name] = model
+        self._registry_keys[model_name] = key
+        return model
+
     async def ensure_all_models(self) -> bool:
         """Ensure all required models are available (download on demand)."""
         try:
@@ -137,17 +223,28 @@ class MuseTalkModelManager:
     
     async def load_whisper(self):
         """Load Whisper model for audio encoding."""
-        if "whisper" in self.loaded_models:
-            return self.loaded_models["whisper"]
-            
-        try:
+        def load():
             import whisper
+            from whisper.model import ModelDimensions, Whisper
             logger.info("Loading Whisper-tiny model...")
             
-            model = whisper.load_model("tiny", device=self.device)
-            self.loaded_models["whisper"] = model
+            def build_empty(metadata):
+                model = Whisper(ModelDimensions(**json.loads(metadata["dims"])))
+                # The alignment heads are a non-persistent buffer, so they are not in the file
+                with torch.device("cpu"):
+                    model.set_alignment_heads(whisper._ALIGNMENT_HEADS["tiny"])
+                return model
             
-            logger.info("Whisper model loaded successfully")
+            return self._load_mapped(
+                "whisper",
+                lambda: whisper.load_model("tiny", device="cpu"),
+                build_empty,
+                lambda model: {"dims": json.dumps(vars(model.dims))},
+            )
+        
+        try:
+            model = await self._acquire("whisper", load)
+            logger.info("Whisper model ready")
             return model
             
         except Exception as e:
@@ -156,43 +253,88 @@ class MuseTalkModelManager:
     
     async def load_vae(self):
         """Load VAE model for image encoding/decoding."""
-        if "vae" in self.loaded_models:
-            return self.loaded_models["vae"]
-            
-        try:
+        def load():
             from diffusers import AutoencoderKL
             logger.info("Loading Stable Diffusion VAE...")
             
-            vae = AutoencoderKL.from_pretrained(
-                "stabilityai/sd-vae-ft-mse",
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
-            ).to(self.device)
+            def build_empty(metadata):
+                return AutoencoderKL.from_config(json.loads(metadata["config"]))
+            
+            def load_float():
+                return self._load_mapped(
+                    "vae",
+                    lambda: AutoencoderKL.from_pretrained(
+                        self.MODELS["vae"]["repo_id"],
+                        torch_dtype=self.dtype
+                    ),
+                    build_empty,
+                )
+            
+            if not self.quantize:
+                return load_float()
             
-            self.loaded_models["vae"] = vae
-            logger.info("VAE loaded successfully")
+            return self._load_quantized("vae", load_float, build_empty)
+        
+        try:
+            vae = await self._acquire("vae", load)
+            logger.info("VAE ready")
             return vae
             
         except Exception as e:
             logger.error(f"Failed to load VAE: {e}")
             raise
     
+    async def load_tiny_vae(self):
+        """Load the distilled TAESD autoencoder, a fast alternative to the VAE decoder."""
+        def load():
+            from diffusers import AutoencoderTiny
+            logger.info("Loading TAESD tiny autoencoder...")
+            return self._load_mapped(
+                "taesd",
+                lambda: AutoencoderTiny.from_pretrained(
+                    self.MODELS["taesd"]["repo_id"],
+                    torch_dtype=self.dtype
+                ),
+                lambda metadata: AutoencoderTiny.from_config(json.loads(metadata["config"])),
+            )
+        
+        try:
+            taesd = await self._acquire("taesd", load)
+            logger.info("TAESD ready")
+            return taesd
+            
+        except Exception as e:
+            logger.error(f"Failed to load TAESD: {e}")
+            raise
+    
     async def load_unet(self):
         """Load UNet model for lip-sync generation."""
-        if "unet" in self.loaded_models:
-            return self.loaded_models["unet"]
-            
-        try:
+        def load():
             from diffusers import UNet2DConditionModel
             logger.info("Loading UNet model...")
             
-            unet = UNet2DConditionModel.from_pretrained(
-                "runwayml/stable-diffusion-v1-4",
-                subfolder="unet",
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
-            ).to(self.device)
+            def build_empty(metadata):
+                return UNet2DConditionModel.from_config(json.loads(metadata["config"]))
             
-            self.loaded_models["unet"] = unet
-            logger.info("UNet loaded successfully")
+            def load_float():
+                return self._load_mapped(
+                    "unet",
+                    lambda: UNet2DConditionModel.from_pretrained(
+                        self.MODELS["unet"]["repo_id"],
+                        subfolder=self.MODELS["unet"]["subfolder"],
+                        torch_dtype=self.dtype
+                    ),
+                    build_empty,
+                )
+            
+            if not self.quantize:
+                return load_float()
+            
+            return self._load_quantized("unet", load_float, build_empty)
+        
+        try:
+            unet = await self._acquire("unet", load)
+            logger.info("UNet ready")
             return unet
             
         except Exception as e:
@@ -242,28 +384,41 @@ class MuseTalkModelManager:
     
     async def load_musetalk_weights(self):
         """Load MuseTalk-specific weights."""
-        if "musetalk" in self.loaded_models:
-            return self.loaded_models["musetalk"]
-            
         try:
-            logger.info("Loading MuseTalk weights...")
-            
             weights_path = self.models_path / "musetalk" / "pytorch_model.bin"
-            if weights_path.exists():
-                weights = torch.load(weights_path, map_location=self.device)
-                self.loaded_models["musetalk"] = weights
-                logger.info("MuseTalk weights loaded successfully")
-                return weights
-            else:
+            if not weights_path.exists():
                 logger.warning("MuseTalk weights not found")
                 return None
+            
+            def load():
+                logger.info("Loading MuseTalk weights...")
+                path = mapped_weights_path(self.models_path, "musetalk", self._weights_source("musetalk"))
+                state = load_or_convert_state(
+                    path, lambda: torch.load(weights_path, map_location="cpu", weights_only=True)
+                )
+                if self.device.type == "cpu":
+                    return state
+                return {name: tensor.to(self.device) for name, tensor in state.items()}
+            
+            weights = await self._acquire("musetalk", load)
+            logger.info("MuseTalk weights ready")
+            return weights
                 
         except Exception as e:
             logger.error(f"Failed to load MuseTalk weights: {e}")
             raise
     
+    def release(self, model_name: str) -> None:
+        """Release this manager's reference to one shared model."""
+        key = self._registry_keys.pop(model_name, None)
+        self.loaded_models.pop(model_name, None)
+        if key is not None:
+            self.registry.release(key)
+    
     def cleanup(self):
-        """Clean up loaded models to free memory."""
-        logger.info("Cleaning up loaded models...")
+        """Release this manager's references to shared models."""
+        logger.info("Releasing shared model references...")
+        for key in self._registry_keys.values():
+            self.registry.release(key)
+        self._registry_keys.clear()
         self.loaded_models.clear()
-        torch.cuda.empty_cache() if torch.cuda.is_available() else None
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Process-wide Model Registry
+Loads each MuseTalk weight set once per process and shares it read-only across sessions.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import torch
+from loguru import logger
+
+
+@dataclass
+class RegisteredModel:
+    """A loaded model shared by every session that acquired it."""
+    key: str
+    model: Any
+    refcount: int = 0
+    resident_bytes: int = 0
+    rss_delta_bytes: int = 0
+    device: str = "cpu"
+    load_time_s: float = 0.0
+    loaded_at: float = field(default_factory=time.time)
+
+
+def estimate_resident_bytes(model: Any) -> int:
+    """Estimate the memory held by a model's parameters and buffers."""
+    if model is None:
+        return 0
+
+    if isinstance(model, torch.Tensor):
+        return model.numel() * model.element_size()
+
+    if isinstance(model, torch.nn.Module):
+        seen = set()
+        total = 0
+        tensors = []
+        for value in model.state_dict(keep_vars=True).values():
+            # Quantized layers store (weight, bias) tuples instead of parameters
+            tensors.extend(value if isinstance(value, tuple) else [value])
+        for tensor in tensors:
+            if not isinstance(tensor, torch.Tensor):
+                continue
+            # Tied weights share storage and must only be counted once
+            ptr = tensor.data_ptr()
+            if ptr in seen:
+                continue
+            seen.add(ptr)
+            total += tensor.numel() * tensor.element_size()
+        return total
+
+    if isinstance(model, dict):
+        return sum(estimate_resident_bytes(value) for value in model.values())
+
+    return 0
+
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process, or 0 where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _device_of(model: Any) -> str:
+    """Best-effort device description for a loaded model."""
+    if isinstance(model, torch.Tensor):
+        return str(model.device)
+    if isinstance(model, torch.nn.Module):
+        for tensor in model.parameters():
+            return str(tensor.device)
+    return "cpu"
+
+
+class ModelRegistry:
+    """
+    Refcounted registry of loaded models shared by all avatar sessions.
+
+    Each key is loaded at most once, even when several sessions ask for it
+    concurrently. Models are switched to eval mode with gradients disabled so
+    they can be shared read-only. A model is released when its last holder
+    lets go of it.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._models: Dict[str, RegisteredModel] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _get_load_lock(self, key: str) -> asyncio.Lock:
+        """Get the lock that serializes loading of a single key."""
+        with self._lock:
+            if key not in self._load_locks:
+                self._load_locks[key] = asyncio.Lock()
+            return self._load_locks[key]
+
+    async def acquire(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get a shared model, loading it on first use.
+
+        Args:
+            key: Unique key for the weight set (checkpoint, device, dtype)
+            loader: Blocking callable that loads the model, run in a worker thread
+
+        Returns:
+            The shared model instance
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                return entry.model
+
+        async with self._get_load_lock(key):
+            # Another session may have finished loading while we waited
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    return entry.model
+
+            logger.info(f"Loading shared model: {key}")
+            rss_before = process_rss_bytes()
+            start_time = time.time()
+            model = await asyncio.to_thread(loader)
+            load_time = time.time() - start_time
+
+            if isinstance(model, torch.nn.Module):
+                model.eval()
+                model.requires_grad_(False)
+
+            entry = RegisteredModel(
+                key=key,
+                model=model,
+                refcount=1,
+                resident_bytes=estimate_resident_bytes(model),
+                # Memory-mapped weights count in resident_bytes but only reach RSS when touched
+                rss_delta_bytes=process_rss_bytes() - rss_before,
+                device=_device_of(model),
+                load_time_s=load_time,
+            )
+            with self._lock:
+                self._models[key] = entry
+
+            logger.info(
+                f"Shared model loaded: {key} "
+                f"({entry.resident_bytes / 1024 ** 2:.1f} MB in {load_time:.2f}s, "
+                f"RSS {rss_before / 1024 ** 2:.0f} -> {(rss_before + entry.rss_delta_bytes) / 1024 ** 2:.0f} MB)"
+            )
+            return model
+
+    def release(self, key: str) -> None:
+        """Drop one reference to a model, unloading it when unused."""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return
+
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+
+            del self._models[key]
+
+        logger.info(f"Unloaded shared model: {key}")
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a loaded model without taking a reference."""
+        with self._lock:
+            entry = self._models.get(key)
+            return entry.model if entry is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-model refcounts and resident memory."""
+        with self._lock:
+            models = {
+                key: {
+                    "refcount": entry.refcount,
+                    "resident_mb": entry.resident_bytes / 1024 ** 2,
+                    "load_rss_delta_mb": entry.rss_delta_bytes / 1024 ** 2,
+                    "device": entry.device,
+                    "load_time_s": entry.load_time_s,
+                }
+                for key, entry in self._models.items()
+            }
+
+        return {
+            "models": models,
+            "total_resident_mb": sum(m["resident_mb"] for m in models.values()),
+            "process_rss_mb": process_rss_bytes() / 1024 ** 2,
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,280 @@
+"""
+Model Warmup
+Loads the render models at startup and runs dummy passes so the first session frame starts warm.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from loguru import logger
+
+from ..core.config import AvatarConfig
+from .audio_frontend import StreamingMelFrontend
+from .inference_backend import InferenceBackend, create_inference_backend
+from .inference_executor import get_inference_executor
+from .model_manager import MuseTalkModelManager
+
+
+# Components every session needs: avatar preparation plus frame rendering
+WARMUP_COMPONENTS = ("vae_encoder", "audio_encoder", "unet", "vae_decoder")
+
+# Full-quality frames each inference worker renders when measuring throughput
+CALIBRATION_FRAMES_PER_WORKER = 2
+
+
+def render_size(config: AvatarConfig) -> int:
+    """Side of the square region sessions encode: the face crop, or the mouth crop in mouth_roi mode."""
+    return config.mouth_roi_size if config.render_mode == "mouth_roi" else 256
+
+
+def render_latent_sizes(config: AvatarConfig) -> List[int]:
+    """Latent sides sessions render: full size, then the LOW_RES tier's 2x downsample (from 16x16 up)."""
+    latent = render_size(config) // 8
+    if config.adaptive_quality and latent >= 16:
+        return [latent, latent // 2]
+    return [latent]
+
+
+@dataclass
+class ComponentWarmup:
+    """Warm status of one component."""
+    component: str
+    model_key: str = ""
+    status: str = "pending"  # pending, loading, warming, warm or failed
+    load_time_s: float = 0.0
+    warmup_time_s: float = 0.0
+    # Warm time of one pass per input size (latent side, image side or audio frames)
+    pass_time_s: Dict[int, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class ModelWarmup:
+    """
+    Background load and warmup of the configured backend's components.
+
+    The components are acquired through a backend of their own, so the
+    shared models stay in the process-wide registry for as long as the
+    service runs, and sessions acquire them without loading. Each component
+    then runs a few dummy passes at the shapes sessions render, which pays
+    for kernel selection, allocator growth and lazy runtime initialization
+    before the first real frame instead of during it. Finally a short burst
+    of full-quality frames on every inference worker measures the frame
+    throughput of this hardware and profile, for admission control.
+    """
+
+    def __init__(self, config: AvatarConfig, iterations: int = 2):
+        """
+        Initialize the warmup.
+
+        Args:
+            config: Service configuration; backend, device and render size are taken from it
+            iterations: Dummy passes per component and input shape
+        """
+        self.config = config
+        self.iterations = iterations
+        self.model_manager = MuseTalkModelManager(
+            config.models_path, config.device, config.inference_profile
+        )
+        self.backend: InferenceBackend = create_inference_backend(config, self.model_manager)
+        self.executor = get_inference_executor(config.inference_workers)
+
+        self.components: Dict[str, ComponentWarmup] = {
+            component: ComponentWarmup(component) for component in WARMUP_COMPONENTS
+        }
+        self.throughput_fps: Optional[float] = None
+        self.calibration_error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether every component is loaded and warm and throughput is measured."""
+        return (
+            self.finished_at is not None
+            and self.throughput_fps is not None
+            and all(entry.status == "warm" for entry in self.components.values())
+        )
+
+    def start(self) -> None:
+        """Start loading and warming up on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Model warmup started ({self.backend.name} backend, {self.config.device})")
+
+    async def stop(self) -> None:
+        """Cancel a running warmup and release the warmed models."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.backend.cleanup()
+        self.model_manager.cleanup()
+
+    async def _run(self) -> None:
+        """Load and warm up each component in turn."""
+        self.started_at = time.time()
+        try:
+            await self.model_manager.ensure_all_models()
+        except Exception as e:
+            logger.error(f"Model download failed before warmup: {e}")
+            for entry in self.components.values():
+                entry.status = "failed"
+                entry.error = str(e)
+            return
+
+        for component in WARMUP_COMPONENTS:
+            await self._warm_component(self.components[component])
+
+        if all(entry.status == "warm" for entry in self.components.values()):
+            await self._calibrate()
+
+        self.finished_at = time.time()
+        if self.is_ready:
+            logger.info(
+                f"Model warmup complete in {self.finished_at - self.started_at:.2f}s, ready for sessions "
+                f"({self.throughput_fps or 0:.1f} full-quality frames/s)"
+            )
+        else:
+            failed = [entry.component for entry in self.components.values() if entry.status == "failed"]
+            if not failed:
+                failed = ["throughput calibration"]
+            logger.error(f"Model warmup failed for {', '.join(failed)}; not ready for sessions")
+
+    async def _warm_component(self, entry: ComponentWarmup) -> None:
+        """Load one component and run its dummy passes."""
+        try:
+            entry.status = "loading"
+            start_time = time.time()
+            await self.backend.load((entry.component,))
+            entry.load_time_s = time.time() - start_time
+            entry.model_key = self.backend.model_key(entry.component)
+
+            entry.status = "warming"
+            start_time = time.time()
+            forward = self.backend.forward_fn(entry.component)
+            for inputs in self._dummy_inputs(entry.component):
+                for _ in range(self.iterations):
+                    pass_start = time.perf_counter()
+                    await self.executor.run(forward, *inputs)
+                    entry.pass_time_s[inputs[0].shape[-1]] = time.perf_counter() - pass_start
+            entry.warmup_time_s = time.time() - start_time
+
+            entry.status = "warm"
+            logger.info(
+                f"Warmed {entry.component} (load {entry.load_time_s:.2f}s, "
+                f"{self.iterations} dummy passes per shape {entry.warmup_time_s:.2f}s)"
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to warm up {entry.component}: {e}")
+            entry.status = "failed"
+            entry.error = str(e)
+
+    async def _calibrate(self) -> None:
+        """Measure full-quality frame throughput with every inference worker rendering."""
+        try:
+            (features,) = self._dummy_inputs("audio_encoder")[0]
+            unet_inputs = self._dummy_inputs("unet")[0]
+            (latents,) = self._dummy_inputs("vae_decoder")[0]
+            audio_encoder, unet, vae_decoder = (
+                self.backend.forward_fn(component) for component in ("audio_encoder", "unet", "vae_decoder")
+            )
+
+            async def render_stream() -> None:
+                for _ in range(CALIBRATION_FRAMES_PER_WORKER):
+                    await self.executor.run(audio_encoder, features)
+                    await self.executor.run(unet, *unet_inputs)
+                    await self.executor.run(vae_decoder, latents)
+
+            streams = self.executor.max_workers
+            start_time = time.perf_counter()
+            await asyncio.gather(*(render_stream() for _ in range(streams)))
+            self.throughput_fps = streams * CALIBRATION_FRAMES_PER_WORKER / (time.perf_counter() - start_time)
+
+        except Exception as e:
+            # Without a measured capacity the pod must not take sessions: admission could not bound them
+            logger.error(f"Failed to measure frame throughput: {e}")
+            self.calibration_error = str(e)
+
+    def _dummy_inputs(self, component: str) -> List[Tuple[torch.Tensor, ...]]:
+        """Inputs at the shapes sessions run a component with."""
+        device = torch.device(self.config.device)
+        dtype = self.backend.dtype
+
+        size = render_size(self.config)
+        latent_sizes = render_latent_sizes(self.config)
+
+        if component == "vae_encoder":
+            return [(torch.zeros(1, 3, size, size, device=device, dtype=dtype),)]
+
+        if component == "audio_encoder":
+            frontend = StreamingMelFrontend(
+                sample_rate=self.config.audio_sample_rate,
+                fps=self.config.video_fps,
+            )
+            return [(torch.zeros(1, frontend.n_mels, frontend.window_frames, device=device),)]
+
+        if component == "unet":
+            return [
+                (
+                    torch.randn(1, 4, latent, latent, device=device, dtype=dtype),
+                    torch.zeros((1,), device=device, dtype=torch.long),
+                    torch.zeros((1, 77, 768), device=device, dtype=dtype),
+                )
+                for latent in latent_sizes
+            ]
+
+        return [(torch.randn(1, 4, latent, latent, device=device, dtype=dtype),) for latent in latent_sizes]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get readiness and per-component warm status."""
+        return {
+            "ready": self.is_ready,
+            "running": self._task is not None and not self._task.done(),
+            "throughput_fps": self.throughput_fps,
+            "calibration_error": self.calibration_error,
+            "backend": self.backend.name,
+            "device": self.config.device,
+            "elapsed_s": (
+                (self.finished_at or time.time()) - self.started_at
+                if self.started_at is not None else 0.0
+            ),
+            "models": {
+                component: {
+                    "status": entry.status,
+                    "model_key": entry.model_key,
+                    "load_time_s": entry.load_time_s,
+                    "warmup_time_s": entry.warmup_time_s,
+                    "pass_ms": {str(size): t * 1000 for size, t in entry.pass_time_s.items()},
+                    "error": entry.error,
+                }
+                for component, entry in self.components.items()
+            },
+        }
+
+
+_warmup: Optional[ModelWarmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_model_warmup(config: AvatarConfig) -> ModelWarmup:
+    """Get the process-wide model warmup, creating it on first use."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = ModelWarmup(config, config.warmup_iterations)
+        return _warmup
+
+
+def get_model_warmup_status() -> Optional[Dict[str, Any]]:
+    """Get the warmup status, or None if no warmup was started in this process."""
+    with _warmup_lock:
+        return _warmup.get_status() if _warmup is not None else None
@@ -0,0 +1,139 @@
+"""
+Mouth Patch Cache
+Per-avatar LRU of rendered mouth patches keyed by quantized audio features.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class MouthPatchCache:
+    """
+    Rendered mouth patches for one avatar, keyed by a coarse audio code.
+
+    Speech keeps returning to a small set of mouth shapes. The log-mel
+    window of a frame is pooled over time into ``bands`` frequency bands
+    and each band is quantized to ``levels`` steps; frames that land on
+    the same code reuse the blended mouth band instead of running the
+    UNet and VAE. Fewer levels or bands raise the hit rate at the cost of
+    lip-shape fidelity.
+    """
+
+    # Range of Whisper-normalized log-mel values the levels are spread over
+    FEATURE_RANGE = (-1.0, 1.5)
+
+    def __init__(self, max_entries: int = 256, levels: int = 6, bands: int = 8):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Patches kept before the least recently used is evicted
+            levels: Quantization steps per band
+            bands: Frequency bands the mel bins are averaged into
+        """
+        self.max_entries = max_entries
+        self.levels = levels
+        self.bands = bands
+
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+
+        # Performance tracking
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, features: np.ndarray) -> bytes:
+        """
+        Map a log-mel window to its cache key.
+
+        Args:
+            features: Whisper-normalized log-mel window of shape (n_mels, frames)
+        """
+        pooled = features.mean(axis=1)
+        banded = np.array([band.mean() for band in np.array_split(pooled, self.bands)])
+
+        low, high = self.FEATURE_RANGE
+        scaled = (np.clip(banded, low, high) - low) / (high - low)
+        return np.rint(scaled * (self.levels - 1)).astype(np.uint8).tobytes()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a patch, counting the hit or miss."""
+        with self._lock:
+            patch = self._entries.get(key)
+            if patch is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return patch
+
+    def put(self, key: bytes, patch: np.ndarray) -> None:
+        """Store a patch, evicting the least recently used entries."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._entries[key] = patch
+            self._nbytes += patch.nbytes
+
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate and memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "levels": self.levels,
+                "bands": self.bands,
+                "memory_mb": self._nbytes / 1024 ** 2,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_caches: "OrderedDict[str, MouthPatchCache]" = OrderedDict()
+_caches_lock = threading.Lock()
+
+
+def get_mouth_patch_cache(
+    avatar_key: str,
+    max_entries: int = 256,
+    levels: int = 6,
+    bands: int = 8,
+    max_avatars: int = 16,
+) -> MouthPatchCache:
+    """Get the process-wide mouth patch cache for an avatar, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(avatar_key)
+        if cache is None:
+            cache = MouthPatchCache(max_entries, levels, bands)
+            _caches[avatar_key] = cache
+            while len(_caches) > max_avatars:
+                _caches.popitem(last=False)
+        _caches.move_to_end(avatar_key)
+        return cache
+
+
+def get_mouth_patch_cache_stats() -> Dict[str, Any]:
+    """Get totals across all avatars' mouth patch caches."""
+    with _caches_lock:
+        caches = list(_caches.values())
+
+    stats = [cache.get_stats() for cache in caches]
+    hits = sum(s["hits"] for s in stats)
+    lookups = hits + sum(s["misses"] for s in stats)
+    return {
+        "avatars": len(stats),
+        "entries": sum(s["entries"] for s in stats),
+        "memory_mb": sum(s["memory_mb"] for s in stats),
+        "hit_rate": hits / lookups if lookups else 0.0,
+    }
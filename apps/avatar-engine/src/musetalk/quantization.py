@@ -0,0 +1,162 @@
+"""
+Int8 Model Quantization
+Dynamic int8 quantization for CPU inference, with quantized state dicts cached on disk.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+import torch
+import torch.nn as nn
+from loguru import logger
+from torch.ao.nn.quantized import dynamic as nnqd
+from torch.ao.quantization import quantize_dynamic
+
+
+# Bump when the quantization scheme or the cache file layout changes
+QUANTIZATION_VERSION = 2
+
+
+def quantized_state_path(models_path: Path, name: str, source: str) -> Path:
+    """
+    Path of the cached quantized state dict for a model.
+
+    The file name folds in the source weights, the torch version and the
+    scheme, so a changed checkpoint or runtime never loads stale weights.
+    """
+    fingerprint = hashlib.sha256(
+        f"v{QUANTIZATION_VERSION}:{source}:{torch.__version__}:dynamic-qint8-linear".encode()
+    ).hexdigest()[:16]
+    return models_path / "quantized" / f"{name}-{fingerprint}.pt"
+
+
+def _submodules(model: nn.Module, targets: Sequence[str]):
+    """Resolve dotted submodule names ('' is the model itself)."""
+    return [(name, model.get_submodule(name) if name else model) for name in targets]
+
+
+def _set_submodule(model: nn.Module, name: str, module: nn.Module) -> nn.Module:
+    """Replace a dotted submodule, returning the (possibly new) root."""
+    if not name:
+        return module
+    parent_name, _, child = name.rpartition(".")
+    parent = model.get_submodule(parent_name) if parent_name else model
+    setattr(parent, child, module)
+    return model
+
+
+def quantize_model(model: nn.Module, targets: Sequence[str] = ("",)) -> nn.Module:
+    """
+    Apply dynamic int8 quantization to the Linear layers of the target submodules.
+
+    Args:
+        model: Float model on CPU
+        targets: Dotted names of submodules to quantize ('' for the whole model)
+    """
+    for name, module in _submodules(model, targets):
+        quantized = quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8, inplace=True)
+        model = _set_submodule(model, name, quantized)
+    return model
+
+
+def _swap_linear_layers(module: nn.Module) -> None:
+    """Replace Linear layers with empty dynamic-quantized ones, ready for load_state_dict."""
+    for child_name, child in module.named_children():
+        if type(child) is nn.Linear:
+            setattr(module, child_name, nnqd.Linear(
+                child.in_features,
+                child.out_features,
+                bias_=child.bias is not None,
+                dtype=torch.qint8,
+            ))
+        else:
+            _swap_linear_layers(child)
+
+
+def load_quantized(
+    path: Path,
+    build_empty: Callable[[Dict[str, str]], nn.Module],
+    targets: Sequence[str] = ("",),
+) -> Optional[nn.Module]:
+    """
+    Rebuild a quantized model from a cached state dict, without float weights or requantizing.
+
+    Args:
+        path: Cached state dict written by save_quantized
+        build_empty: Builds the float architecture from the cached metadata (weights are overwritten)
+        targets: Submodules that were quantized
+
+    Returns:
+        The quantized model, or None if there is no usable cache entry
+    """
+    if not path.exists():
+        return None
+
+    try:
+        entry = torch.load(path, map_location="cpu", weights_only=True)
+        state, metadata = entry["state"], entry["metadata"]
+
+        with torch.device("meta"):
+            model = build_empty(metadata)
+        model = model.to_empty(device="cpu")
+        for _, module in _submodules(model, targets):
+            _swap_linear_layers(module)
+
+        model.load_state_dict(state, strict=True)
+
+        # Non-persistent buffers are not in the state dict and would stay uninitialized
+        missing = {name for name, _ in model.named_buffers()} - set(state)
+        if missing:
+            logger.warning(f"Quantized cache {path.name} lacks buffers {sorted(missing)[:3]}, requantizing")
+            return None
+
+        return model
+
+    except Exception as e:
+        logger.warning(f"Discarding unreadable quantized cache {path.name}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+
+def save_quantized(model: nn.Module, path: Path, metadata: Optional[Dict[str, str]] = None) -> None:
+    """Persist a quantized model's state dict, with the metadata to rebuild it, atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        torch.save({"state": model.state_dict(), "metadata": metadata or {}}, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to persist quantized weights: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_or_quantize(
+    path: Path,
+    load_float: Callable[[], nn.Module],
+    build_empty: Callable[[Dict[str, str]], nn.Module],
+    targets: Sequence[str] = ("",),
+    describe: Callable[[nn.Module], Dict[str, str]] = lambda model: {},
+) -> nn.Module:
+    """
+    Load a quantized model from the cache, or quantize the float model and cache it (blocking).
+
+    Args:
+        path: Cache file from quantized_state_path
+        load_float: Loads the float model with its pretrained weights
+        build_empty: Builds the float architecture from the metadata written by describe
+        targets: Submodules to quantize ('' for the whole model)
+        describe: Metadata needed to rebuild the architecture (e.g. its config as JSON)
+    """
+    model = load_quantized(path, build_empty, targets)
+    if model is not None:
+        logger.info(f"Loaded cached int8 weights: {path.name}")
+        return model
+
+    logger.info(f"Quantizing to int8 (first run), caching as {path.name}")
+    model = load_float().eval()
+    metadata = describe(model)
+    model = quantize_model(model, targets)
+    save_quantized(model, path, metadata)
+    return model
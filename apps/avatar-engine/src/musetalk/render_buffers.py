@@ -0,0 +1,207 @@
+"""
+Per-session Render Buffers
+Preallocated tensors, frame buffers and blend mask for the steady-state frame render path.
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+import torch
+
+from .avatar_cache import PreparedAvatar
+
+
+class RenderBuffers:
+    """
+    Everything the per-frame path writes into, allocated once per avatar.
+
+    Latent-side tensors are filled in place, the decoded face is converted
+    and resized straight into face-ROI sized buffers, and blending touches
+    only the band of the face ROI covered by the feathered mouth mask.
+    Output frames come from a small ring so a frame handed to the streamer
+    is not overwritten while it is still being published.
+    """
+
+    def __init__(
+        self,
+        prepared: PreparedAvatar,
+        ref_latents: torch.Tensor,
+        decode_size: Tuple[int, int] = (256, 256),
+        output_frames: int = 3,
+        mouth_start: float = 0.6,
+        feather: int = 15,
+        feather_edges: bool = False,
+    ):
+        """
+        Allocate buffers for one prepared avatar.
+
+        Args:
+            prepared: Prepared avatar being rendered
+            ref_latents: Reference latents on the inference device
+            decode_size: (width, height) of the VAE decoder output
+            output_frames: Number of output frames in the ring
+            mouth_start: Fraction of the region height where the mouth blend starts
+            feather: Gaussian kernel size used to feather the mask edge
+            feather_edges: Also feather the sides and bottom, for regions inside the face
+        """
+        device, dtype = ref_latents.device, ref_latents.dtype
+
+        # Latent-side tensors; ref_latents is base_latents plus any expression offset
+        self.base_latents = ref_latents
+        self.ref_latents = ref_latents
+        self.latent_offset: Optional[torch.Tensor] = None
+        self.offset_version: Optional[int] = None
+        self.text_embeddings = torch.zeros((1, 77, 768), device=device, dtype=dtype)
+        self.timesteps = torch.zeros((1,), device=device, dtype=torch.long)
+        self.noise = torch.empty_like(ref_latents)
+        self.noisy_latents = torch.empty_like(ref_latents)
+        self.denoised_latents = torch.empty_like(ref_latents)
+        self.last_noise_pred: Optional[torch.Tensor] = None
+
+        # Decoder output on the host, as uint8 RGB then BGR
+        decode_w, decode_h = decode_size
+        self.decoded_rgb = torch.empty(
+            (decode_h, decode_w, 3),
+            dtype=torch.uint8,
+            pin_memory=device.type == "cuda",
+        )
+        self.decoded_bgr = np.empty((decode_h, decode_w, 3), dtype=np.uint8)
+
+        # Region the decoder output covers (face or mouth ROI) and the band of it
+        # that the mouth mask touches
+        x1, y1, x2, y2 = prepared.latent_region
+        face_w, face_h = x2 - x1, y2 - y1
+        self.face_region = prepared.latent_region
+        self.roi_bgr = np.empty((face_h, face_w, 3), dtype=np.uint8)
+
+        mask = np.zeros((face_h, face_w), dtype=np.float32)
+        if feather_edges:
+            edge = feather // 2 + 1
+            mask[max(int(face_h * mouth_start), edge):face_h - edge, edge:face_w - edge] = 1.0
+        else:
+            mask[int(face_h * mouth_start):, :] = 1.0
+        mask = cv2.GaussianBlur(mask, (feather, feather), 0)
+
+        active_rows = np.flatnonzero(mask.max(axis=1) > 1e-3)
+        self.band_start = int(active_rows[0]) if active_rows.size else face_h
+        self.mask = np.ascontiguousarray(mask[self.band_start:, :, None])
+
+        band_rows = slice(y1 + self.band_start, y2)
+        self.band_rows = band_rows
+        self.band_cols = slice(x1, x2)
+        self.base_band = prepared.image[band_rows, x1:x2].astype(np.float32)
+        self.work = np.empty_like(self.base_band)
+
+        # Ring of output frames, each starting as a copy of the avatar image;
+        # a video avatar swaps the source image (and latents) every frame
+        self.source_image = prepared.image
+        self.source_index: Optional[int] = None
+        self.frames = [prepared.image.copy() for _ in range(output_frames)]
+        self.frame_sources = [self.source_image] * output_frames
+        self.frame_index = 0
+        self.blend_work = np.empty(self.base_band.shape, dtype=np.uint16)
+
+    def set_latent_offset(self, offset: Optional[torch.Tensor], version: Optional[int] = None) -> None:
+        """Render from the base latents plus an offset of the same shape (None for the base itself)."""
+        self.latent_offset = offset
+        self.offset_version = version
+        self._update_ref_latents()
+
+    def set_source(self, image: np.ndarray, base_latents: torch.Tensor, index: int) -> None:
+        """
+        Render over another frame of a video avatar.
+
+        Args:
+            image: Full avatar frame; the render region must be the one the buffers were sized for
+            base_latents: The frame's reference latents, shaped like the current ones
+            index: Video frame index, kept in source_index
+        """
+        self.source_image = image
+        self.source_index = index
+        self.base_band[...] = image[self.band_rows, self.band_cols]
+        self.base_latents = base_latents
+        self._update_ref_latents()
+
+    def _update_ref_latents(self) -> None:
+        """Recompute the reference latents from the base latents and the offset."""
+        if self.latent_offset is None:
+            self.ref_latents = self.base_latents
+            return
+        if self.ref_latents is self.base_latents:
+            self.ref_latents = torch.empty_like(self.base_latents)
+        torch.add(self.base_latents, self.latent_offset, out=self.ref_latents)
+
+    def _next_frame(self) -> np.ndarray:
+        """Take the next ring frame, refreshed from the source image if it was copied from another."""
+        index = self.frame_index
+        self.frame_index = (index + 1) % len(self.frames)
+        frame = self.frames[index]
+        if self.frame_sources[index] is not self.source_image:
+            np.copyto(frame, self.source_image)
+            self.frame_sources[index] = self.source_image
+        return frame
+
+    def prepare_latents(self, noise_scale: float) -> torch.Tensor:
+        """Fill the noisy latents for one frame and return the buffer."""
+        self.noise.normal_()
+        torch.add(self.ref_latents, self.noise, alpha=noise_scale, out=self.noisy_latents)
+        return self.noisy_latents
+
+    def apply_prediction(self, noise_pred: torch.Tensor, step: float = 0.1) -> torch.Tensor:
+        """Apply the single-step noise prediction into the denoised latents buffer."""
+        self.last_noise_pred = noise_pred
+        torch.sub(self.noisy_latents, noise_pred, alpha=step, out=self.denoised_latents)
+        return self.denoised_latents
+
+    def composite(self, decoded: torch.Tensor) -> np.ndarray:
+        """
+        Blend a decoded face into the next output frame.
+
+        Args:
+            decoded: Decoder output of shape (1, 3, H, W) in [-1, 1]
+
+        Returns:
+            The output frame, valid until the ring wraps around
+        """
+        # Denormalize in place and copy into the host uint8 buffer
+        decoded = decoded.mul_(127.5).add_(127.5).clamp_(0, 255)
+        self.decoded_rgb.copy_(decoded[0].permute(1, 2, 0))
+
+        # Convert and resize straight into the face ROI buffer
+        cv2.cvtColor(self.decoded_rgb.numpy(), cv2.COLOR_RGB2BGR, dst=self.decoded_bgr)
+        cv2.resize(
+            self.decoded_bgr,
+            (self.roi_bgr.shape[1], self.roi_bgr.shape[0]),
+            dst=self.roi_bgr,
+        )
+
+        # base + (decoded - base) * mask, on the masked band only
+        roi_band = self.roi_bgr[self.band_start:]
+        np.subtract(roi_band, self.base_band, out=self.work)
+        np.multiply(self.work, self.mask, out=self.work)
+        np.add(self.work, self.base_band, out=self.work)
+
+        frame = self._next_frame()
+        np.copyto(frame[self.band_rows, self.band_cols], self.work, casting="unsafe")
+        return frame
+
+    def extract_patch(self, frame: np.ndarray) -> np.ndarray:
+        """Copy the blended mouth band out of a composited frame."""
+        return frame[self.band_rows, self.band_cols].copy()
+
+    def blend_patches(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Write the midpoint of two extracted mouth bands into the next output frame."""
+        np.add(first, second, out=self.blend_work, dtype=np.uint16)
+        self.blend_work += 1
+        self.blend_work >>= 1
+
+        frame = self._next_frame()
+        np.copyto(frame[self.band_rows, self.band_cols], self.blend_work, casting="unsafe")
+        return frame
+
+    def paste_patch(self, patch: np.ndarray) -> np.ndarray:
+        """Write a previously extracted mouth band into the next output frame."""
+        frame = self._next_frame()
+        np.copyto(frame[self.band_rows, self.band_cols], patch)
+        return frame
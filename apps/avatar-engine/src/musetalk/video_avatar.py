@@ -0,0 +1,284 @@
+"""
+Video Avatar Store
+Memory-mapped per-frame preparation artifacts for looping video avatars, shared across sessions.
+"""
+
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from .avatar_cache import PreparedAvatar
+
+
+# Avatar sources with these suffixes are treated as looping videos
+VIDEO_SUFFIXES = frozenset({".mp4", ".m4v", ".mov", ".webm", ".avi", ".mkv"})
+
+# Per-frame arrays, each stored as its own .npy file
+FRAME_ARRAYS = ("frames", "bboxes", "face_regions", "landmarks", "mouth_masks", "ref_latents")
+
+
+def is_video_source(path: Path) -> bool:
+    """Check whether an avatar source file is a video."""
+    return Path(path).suffix.lower() in VIDEO_SUFFIXES
+
+
+def check_avatar_source(path: Path) -> None:
+    """
+    Check that an avatar source exists and decodes, without preparing it (blocking).
+
+    Raises:
+        ValueError: If the file is missing or is not a readable image or video
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise ValueError(f"Avatar source not found: {path}")
+
+    if is_video_source(path):
+        capture = cv2.VideoCapture(str(path))
+        try:
+            ok = capture.isOpened() and capture.read()[0]
+        finally:
+            capture.release()
+        if not ok:
+            raise ValueError(f"Could not decode avatar video: {path}")
+        return
+
+    image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Could not decode avatar image: {path}")
+
+
+def read_video_frames(path: Path, size: Tuple[int, int], fps: float, max_frames: int) -> List[np.ndarray]:
+    """
+    Decode a video resampled to the output frame rate (blocking).
+
+    Args:
+        path: Video file
+        size: (width, height) every frame is resized to
+        fps: Output frame rate; source frames are dropped or repeated to match
+        max_frames: Longest loop kept, in output frames
+    """
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {path}")
+
+    source_fps = capture.get(cv2.CAP_PROP_FPS) or fps
+    step = source_fps / fps
+    frames = []
+    next_pick = 0.0
+    index = 0
+    try:
+        while len(frames) < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            # Nearest-earlier source frame for each output frame
+            while index + 1e-6 >= next_pick and len(frames) < max_frames:
+                frames.append(cv2.resize(frame, size))
+                next_pick += step
+            index += 1
+    finally:
+        capture.release()
+    return frames
+
+
+@dataclass
+class VideoAvatar:
+    """Per-frame artifacts of a video avatar, memory-mapped read-only from the store."""
+    key: str
+    frames: np.ndarray                      # (N, H, W, 3) uint8
+    bboxes: np.ndarray                      # (N, 4) int32
+    face_regions: np.ndarray                # (N, 4) int32
+    landmarks: np.ndarray                   # (N, L, 2) float32, L == 0 without landmarks
+    mouth_masks: np.ndarray                 # (N, h, w) float32
+    ref_latents: np.ndarray                 # (N, 1, 4, h/8, w/8) float32
+    render_region: Tuple[int, int, int, int]  # box every frame's latents encode
+    confidence: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def loop_index(self, index: int) -> int:
+        """
+        Map an ever-increasing output frame index to a video frame.
+
+        The video plays forward then backward, so the loop has no seam
+        whether or not the source was recorded as a loop.
+        """
+        count = len(self.frames)
+        if count == 1:
+            return 0
+        position = index % (2 * count - 2)
+        return position if position < count else 2 * count - 2 - position
+
+    def prepared_frame(self, index: int) -> PreparedAvatar:
+        """Get one frame as a still prepared avatar, sized for this video's render region."""
+        landmarks = self.landmarks[index]
+        return PreparedAvatar(
+            key=self.key,
+            image=np.array(self.frames[index]),
+            bbox=tuple(int(v) for v in self.bboxes[index]),
+            face_region=tuple(int(v) for v in self.face_regions[index]),
+            landmarks=np.array(landmarks) if landmarks.size else None,
+            mouth_mask=np.array(self.mouth_masks[index]),
+            ref_latents=np.array(self.ref_latents[index]),
+            confidence=self.confidence,
+            render_region=self.render_region,
+        )
+
+
+class VideoAvatarWriter:
+    """Fills a new video avatar's arrays in a temporary directory, then publishes them to the store."""
+
+    def __init__(
+        self,
+        store: "VideoAvatarStore",
+        key: str,
+        shapes: Dict[str, Tuple[Tuple[int, ...], Any]],
+    ):
+        """
+        Initialize the writer and allocate the memory-mapped arrays.
+
+        Args:
+            store: Store the avatar is published to
+            key: Content key of the source video
+            shapes: (shape, dtype) per entry of FRAME_ARRAYS
+        """
+        self.store = store
+        self.key = key
+        self.tmp_dir = store.store_dir / f"{key}.{os.getpid()}.tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.arrays = {
+            name: np.lib.format.open_memmap(
+                self.tmp_dir / f"{name}.npy", mode="w+", shape=shape, dtype=dtype
+            )
+            for name, (shape, dtype) in shapes.items()
+        }
+
+    def write(self, index: int, **values: np.ndarray) -> None:
+        """Write one frame's entries (frames=..., bboxes=..., ...)."""
+        for name, value in values.items():
+            self.arrays[name][index] = value
+
+    def commit(self, render_region: Tuple[int, int, int, int], confidence: float) -> VideoAvatar:
+        """Flush the arrays, publish them under the key and map them read-only (blocking)."""
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+        (self.tmp_dir / "meta.json").write_text(json.dumps({
+            "render_region": [int(v) for v in render_region],
+            "confidence": float(confidence),
+        }))
+
+        path = self.store.store_dir / self.key
+        try:
+            os.replace(self.tmp_dir, path)
+        except OSError:
+            # Another process published the same video first; its copy is identical
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+        video = self.store.open(self.key)
+        if video is None:
+            raise RuntimeError(f"Failed to publish video avatar {self.key[:12]}")
+        return video
+
+    def abort(self) -> None:
+        """Discard the partially written arrays."""
+        self.arrays = {}
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class VideoAvatarStore:
+    """
+    On-disk store of prepared video avatars keyed by video content hash.
+
+    Each avatar is a directory of .npy files opened with ``mmap_mode="r"``,
+    so frames and latents are paged in on demand and the pages are shared
+    by every session in the process and every process on the node.
+    """
+
+    def __init__(self, store_dir: Path):
+        """Initialize the store."""
+        self.store_dir = store_dir
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        # Mappings only reserve address space, so opened avatars stay open
+        self._avatars: Dict[str, VideoAvatar] = {}
+        self._lock = threading.Lock()
+
+        # Performance tracking
+        self.hits = 0
+        self.misses = 0
+
+    def open(self, key: str) -> Optional[VideoAvatar]:
+        """Map a prepared video avatar, or return None if it is not in the store (blocking)."""
+        with self._lock:
+            video = self._avatars.get(key)
+            if video is not None:
+                self.hits += 1
+                return video
+
+        path = self.store_dir / key
+        if not (path / "meta.json").exists():
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+            arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in FRAME_ARRAYS}
+            video = VideoAvatar(
+                key=key,
+                render_region=tuple(meta["render_region"]),
+                confidence=meta["confidence"],
+                **arrays,
+            )
+        except Exception as e:
+            logger.warning(f"Discarding unreadable video avatar {key[:12]}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            video = self._avatars.setdefault(key, video)
+            self.hits += 1
+        return video
+
+    def create(self, key: str, shapes: Dict[str, Tuple[Tuple[int, ...], Any]]) -> VideoAvatarWriter:
+        """Start writing a new video avatar (blocking)."""
+        return VideoAvatarWriter(self, key, shapes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mapped avatars and hit rates."""
+        with self._lock:
+            return {
+                "mapped_avatars": len(self._avatars),
+                "mapped_mb": sum(
+                    sum(getattr(video, name).nbytes for name in FRAME_ARRAYS)
+                    for video in self._avatars.values()
+                ) / 1024 ** 2,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_store: Optional[VideoAvatarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_video_avatar_store(store_dir: Path) -> VideoAvatarStore:
+    """Get the process-wide video avatar store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = VideoAvatarStore(store_dir)
+        return _store
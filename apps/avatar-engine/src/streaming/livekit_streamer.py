@@ -4,15 +4,32 @@ Handles real-time video streaming of lip-synced avatar frames to LiveKit rooms.
 """
 
 import asyncio
+import random
 import time
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Deque
 
-import cv2
 import numpy as np
 from loguru import logger
 from livekit import rtc
 
 from ..core.config import AvatarConfig
+from .video_buffers import I420FramePool
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float) -> float:
+    """
+    Delay before retry ``attempt`` (0-based): exponential backoff with full jitter.
+    
+    Args:
+        attempt: Number of failed attempts before this retry, minus one
+        base_s: Upper bound of the first delay
+        max_s: Cap on the upper bound
+        
+    Returns:
+        Seconds drawn uniformly from [0, min(max_s, base_s * 2 ** attempt)]
+    """
+    return random.uniform(0.0, min(max_s, base_s * 2 ** attempt))
 
 
 class LiveKitStreamer:
@@ -21,9 +38,14 @@ class LiveKitStreamer:
     
     Features:
     - Real-time video frame streaming
-    - Automatic frame rate control
+    - Fixed-rate publishing on a monotonic clock
     - Quality optimization
     - Connection management
+    
+    Rendered frames are queued by stream_frame and published by a separate
+    task at exactly ``video_fps``. When the renderer is late the previous
+    frame is repeated; when no frames have been submitted for a while and
+    the session is not speaking, the idle source (if set) supplies them.
     """
     
     def __init__(self, config: AvatarConfig):
@@ -42,11 +64,39 @@ class LiveKitStreamer:
         self.frame_interval = 1.0 / self.target_fps
         self.last_frame_time = 0.0
         
+        # Publisher: a short jitter queue drained at a fixed rate
+        self.frame_queue: Deque[rtc.VideoFrame] = deque()
+        self.max_queued_frames = config.publisher_queue_frames
+        self.idle_after = config.publisher_idle_after_ms / 1000
+        self.idle_source: Optional[Callable[[], Optional[np.ndarray]]] = None
+        self.is_speaking: Optional[Callable[[], bool]] = None
+        self.last_video_frame: Optional[rtc.VideoFrame] = None
+        self.last_submit_time = 0.0
+        self.publisher_task: Optional[asyncio.Task] = None
+        self._frame_taken = asyncio.Event()
+        
+        # Frames are converted once, into I420 buffers LiveKit reads directly;
+        # the ring covers every queued frame plus the one held for repeats,
+        # and a buffer is reused only after the publisher releases its frame
+        video_size = getattr(config, 'avatar_image_size', (512, 512))
+        self.frame_pool = I420FramePool(video_size, self.max_queued_frames + 2)
+        self.idle_pool = I420FramePool(video_size, 2)
+        
         # Performance tracking
         self.frames_streamed = 0
+        self.frames_submitted = 0
+        self.frames_repeated = 0
+        self.frames_dropped = 0
+        self.idle_frames = 0
+        self.late_ticks = 0
         self.stream_start_time = 0.0
+        self.first_frame_time: Optional[float] = None
         self.frame_times = []
         
+        # Bring-up timings: room connection (with retries) and track publishing
+        self.connect_times: Dict[str, float] = {}
+        self.connect_attempts = 0
+        
         logger.info(f"LiveKitStreamer initialized for {self.target_fps}fps streaming")
     
     async def connect_to_room(
@@ -55,37 +105,50 @@ class LiveKitStreamer:
         livekit_token: str,
         participant_identity: str = "heallink-avatar"
     ) -> None:
-        """Connect to a LiveKit room and setup video publishing."""
+        """
+        Connect to a LiveKit room and setup video publishing.
+        
+        The first attempt is made at once; a room that is not up yet is
+        retried with jittered exponential backoff, so sessions started
+        together do not retry in lockstep.
+        """
         try:
             logger.info(f"Connecting to LiveKit room: {livekit_url}")
             
-            # Add a small delay to allow the room to be established
-            await asyncio.sleep(2)
-            
-            # Create room instance
-            self.room = rtc.Room()
-            
-            # Setup room event handlers
-            self._setup_room_events()
-            
             # Connect to the room with retries
-            max_retries = 3
-            for attempt in range(max_retries):
+            max_attempts = max(1, self.config.livekit_connect_attempts)
+            start_time = time.perf_counter()
+            for attempt in range(max_attempts):
+                self.connect_attempts = attempt + 1
                 try:
-                    logger.info(f"Connection attempt {attempt + 1}/{max_retries}")
+                    logger.info(f"Connection attempt {attempt + 1}/{max_attempts}")
+                    
+                    # A fresh room per attempt; a failed connect leaves the old one unusable
+                    self.room = rtc.Room()
+                    self._setup_room_events()
                     await self.room.connect(livekit_url, livekit_token)
                     break
                 except Exception as e:
-                    if attempt == max_retries - 1:
+                    if attempt == max_attempts - 1:
                         raise e
-                    logger.warning(f"Connection attempt {attempt + 1} failed: {e}, retrying in 3 seconds...")
-                    await asyncio.sleep(3)
+                    delay = backoff_delay(
+                        attempt, self.config.livekit_backoff_base_s, self.config.livekit_backoff_max_s
+                    )
+                    logger.warning(f"Connection attempt {attempt + 1} failed: {e}, retrying in {delay:.2f}s...")
+                    await asyncio.sleep(delay)
+            self.connect_times["room_connect"] = time.perf_counter() - start_time
             
             # Create video source and track
+            start_time = time.perf_counter()
             await self._setup_video_publishing()
+            self.connect_times["publish_setup"] = time.perf_counter() - start_time
             
             self.is_connected = True
-            logger.info(f"Connected to LiveKit room as {participant_identity}")
+            logger.info(
+                f"Connected to LiveKit room as {participant_identity} "
+                f"(connect {self.connect_times['room_connect']:.2f}s in {self.connect_attempts} attempts, "
+                f"publish {self.connect_times['publish_setup']:.2f}s)"
+            )
             
         except Exception as e:
             logger.error(f"Failed to connect to LiveKit room: {e}")
@@ -154,70 +217,155 @@ class LiveKitStreamer:
         
         self.is_streaming = True
         self.stream_start_time = time.time()
+        self.first_frame_time = None
         self.frames_streamed = 0
+        self.frames_submitted = 0
+        self.frames_repeated = 0
+        self.frames_dropped = 0
+        self.idle_frames = 0
+        self.late_ticks = 0
+        self.last_frame_time = 0.0
+        self.frame_queue.clear()
+        self.last_video_frame = None
+        self.frame_pool.release_all()
+        self.idle_pool.release_all()
+        self.last_submit_time = time.monotonic()
+        self.publisher_task = asyncio.create_task(self._publish_loop())
         
         logger.info("Started avatar video streaming")
     
+    def set_idle_source(
+        self,
+        source: Optional[Callable[[], Optional[np.ndarray]]],
+        is_speaking: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """
+        Set the frame source used when no rendered frames are arriving.
+        
+        Args:
+            source: Callable returning the next idle frame (BGR), or None to repeat the last frame
+            is_speaking: Callable reporting whether the session is in speech; while it
+                is, late renders repeat the last frame instead of cutting to the idle loop
+        """
+        self.idle_source = source
+        self.is_speaking = is_speaking
+    
     async def stream_frame(self, frame: np.ndarray) -> bool:
         """
-        Stream a single video frame.
+        Queue a rendered video frame for the publisher.
         
         Args:
             frame: Video frame as numpy array (BGR format)
             
         Returns:
-            True if frame was streamed successfully, False otherwise
+            True if frame was queued successfully, False otherwise
         """
         if not self.is_streaming or not self.video_source:
             return False
         
         try:
-            current_time = time.time()
-            
-            # Frame rate control
-            if current_time - self.last_frame_time < self.frame_interval:
-                return True  # Skip frame to maintain target FPS
-            
-            # Convert BGR to RGB for LiveKit
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            video_frame = self.frame_pool.convert(frame)
             
-            # Ensure frame is the correct size
-            height, width = frame_rgb.shape[:2]
-            target_width, target_height = getattr(self.config, 'avatar_image_size', (512, 512))
+            # Bound latency: when the renderer runs ahead, the oldest frame goes
+            if len(self.frame_queue) >= self.max_queued_frames:
+                self.frame_pool.release(self.frame_queue.popleft())
+                self.frames_dropped += 1
             
-            if width != target_width or height != target_height:
-                frame_rgb = cv2.resize(frame_rgb, (target_width, target_height))
+            self.frame_queue.append(video_frame)
+            self.frames_submitted += 1
+            self.last_submit_time = time.monotonic()
             
-            # Create VideoFrame
-            video_frame = rtc.VideoFrame(
-                width=target_width,
-                height=target_height,
-                type=rtc.VideoBufferType.RGB24,
-                data=frame_rgb.tobytes()
-            )
-            
-            # Capture frame to video source
-            self.video_source.capture_frame(video_frame)
-            
-            # Update metrics
-            self.frames_streamed += 1
-            self.last_frame_time = current_time
+            return True
             
-            # Track frame timing
-            frame_time = current_time - self.last_frame_time if self.last_frame_time > 0 else 0
-            self.frame_times.append(frame_time)
+        except Exception as e:
+            logger.error(f"Failed to stream frame: {e}")
+            return False
+    
+    async def wait_for_space(self, frames: int = 1) -> None:
+        """Wait until the publisher has room for the given number of frames, so none are dropped."""
+        free_needed = min(frames, self.max_queued_frames)
+        while self.is_streaming and len(self.frame_queue) > self.max_queued_frames - free_needed:
+            self._frame_taken.clear()
+            await self._frame_taken.wait()
+    
+    async def _publish_loop(self) -> None:
+        """Publish one frame per tick of a monotonic clock at the target frame rate."""
+        start = time.monotonic()
+        tick = 0
+        
+        while self.is_streaming:
+            try:
+                delay = start + tick * self.frame_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif -delay > self.frame_interval:
+                    # The event loop stalled: skip the missed ticks instead of bursting
+                    missed = int(-delay / self.frame_interval)
+                    tick += missed
+                    self.late_ticks += missed
+                
+                # Timestamps follow the tick schedule, so they advance by exactly one interval
+                self._publish_tick(tick * 1_000_000 // self.target_fps)
+                tick += 1
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Frame publisher error: {e}")
+                tick += 1
+    
+    def _publish_tick(self, timestamp_us: int) -> None:
+        """Capture the next queued frame, an idle frame, or a repeat of the last frame."""
+        video_frame = None
+        
+        if self.frame_queue:
+            video_frame = self.frame_queue.popleft()
+            self._frame_taken.set()
+        elif self.idle_source is not None and (
+            # The first frame is not held back waiting for a render
+            self.last_video_frame is None or self._idle_due()
+        ):
+            frame = self.idle_source()
+            if frame is not None:
+                video_frame = self.idle_pool.convert(frame)
+                self.idle_frames += 1
+        
+        if video_frame is None:
+            # Renderer is late: hold the previous frame
+            video_frame = self.last_video_frame
+            if video_frame is None:
+                return
+            self.frames_repeated += 1
+        
+        self.video_source.capture_frame(video_frame, timestamp_us=timestamp_us)
+        
+        # The previous frame is no longer held for repeats, so its buffer can be reused
+        previous = self.last_video_frame
+        if previous is not None and previous is not video_frame:
+            self.frame_pool.release(previous)
+            self.idle_pool.release(previous)
+        self.last_video_frame = video_frame
+        
+        # Update metrics
+        current_time = time.monotonic()
+        if self.last_frame_time > 0:
+            self.frame_times.append(current_time - self.last_frame_time)
             
             # Keep only last 100 frame times
             if len(self.frame_times) > 100:
                 self.frame_times.pop(0)
-            
-            logger.debug(f"Streamed frame {self.frames_streamed}")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to stream frame: {e}")
+        
+        if self.first_frame_time is None:
+            self.first_frame_time = current_time
+        self.frames_streamed += 1
+        self.last_frame_time = current_time
+    
+    def _idle_due(self) -> bool:
+        """Whether rendered frames have stopped because the session went silent."""
+        if time.monotonic() - self.last_submit_time < self.idle_after:
             return False
+        # Mid-speech the renderer is only slow; an idle frame would snap the mouth shut
+        return self.is_speaking is None or not self.is_speaking()
     
     async def stop_streaming(self) -> None:
         """Stop streaming avatar frames."""
@@ -226,6 +374,18 @@ class LiveKitStreamer:
         
         self.is_streaming = False
         
+        # Stop the publisher
+        if self.publisher_task:
+            self.publisher_task.cancel()
+            try:
+                await self.publisher_task
+            except asyncio.CancelledError:
+                pass
+            self.publisher_task = None
+        while self.frame_queue:
+            self.frame_pool.release(self.frame_queue.popleft())
+        self._frame_taken.set()
+        
         # Calculate streaming stats
         total_time = time.time() - self.stream_start_time
         avg_fps = self.frames_streamed / total_time if total_time > 0 else 0
@@ -233,6 +393,7 @@ class LiveKitStreamer:
         logger.info(
             f"Stopped streaming. "
             f"Frames: {self.frames_streamed}, "
+            f"Repeated: {self.frames_repeated}, "
             f"Duration: {total_time:.2f}s, "
             f"Avg FPS: {avg_fps:.2f}"
         )
@@ -268,6 +429,12 @@ class LiveKitStreamer:
             "is_streaming": self.is_streaming,
             "is_connected": self.is_connected,
             "frames_streamed": self.frames_streamed,
+            "frames_submitted": self.frames_submitted,
+            "frames_repeated": self.frames_repeated,
+            "frames_dropped": self.frames_dropped,
+            "idle_frames": self.idle_frames,
+            "late_ticks": self.late_ticks,
+            "queued_frames": len(self.frame_queue),
             "target_fps": self.target_fps,
             "streaming_duration_s": total_time,
         }
@@ -279,15 +446,15 @@ class LiveKitStreamer:
             avg_frame_time = np.mean(self.frame_times)
             metrics.update({
                 "avg_frame_time_ms": avg_frame_time * 1000,
+                "frame_time_jitter_ms": float(np.std(self.frame_times)) * 1000,
                 "avg_frame_rate": 1.0 / avg_frame_time if avg_frame_time > 0 else 0,
             })
         
         return metrics
     
     def is_ready_for_frame(self) -> bool:
-        """Check if streamer is ready to accept a new frame."""
+        """Check if streamer is ready to accept a new frame without dropping a queued one."""
         if not self.is_streaming:
             return False
         
-        current_time = time.time()
-        return current_time - self.last_frame_time >= self.frame_interval
\ No newline at end of file
+        return len(self.frame_queue) < self.max_queued_frames
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Pooled I420 Video Buffers
+Converts rendered BGR frames straight into preallocated I420 buffers shared with LiveKit.
+"""
+
+from typing import List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+from livekit import rtc
+
+
+class I420FramePool:
+    """
+    Ring of preallocated I420 buffers, each wrapped once as an ``rtc.VideoFrame``.
+
+    Each buffer is a ``bytearray`` viewed as a numpy array, so OpenCV writes
+    the Y, U and V planes in place and LiveKit reads the same memory through
+    a memoryview: no intermediate RGB frame and no ``tobytes()`` copy.
+    A converted frame stays outstanding until it is released; its buffer is
+    skipped until then, and the ring grows by one buffer when every buffer
+    is still queued or held for repeating.
+    """
+
+    def __init__(self, size: Tuple[int, int], slots: int):
+        """
+        Allocate the pool.
+
+        Args:
+            size: (width, height) of the published video
+            slots: Number of buffers in the ring
+        """
+        width, height = size
+        self.width = width
+        self.height = height
+
+        # Chroma planes cover 2x2 blocks, rounded up for odd dimensions
+        self.chroma_width = (width + 1) // 2
+        self.chroma_height = (height + 1) // 2
+        self.frame_bytes = width * height + 2 * self.chroma_width * self.chroma_height
+
+        self._buffers: List[bytearray] = []
+        self._planes: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._frames: List[rtc.VideoFrame] = []
+        self._outstanding: Set[int] = set()
+        for _ in range(slots):
+            self._allocate()
+
+        # Only used when the rendered frame is not already the published size
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+
+        # OpenCV converts even sizes only: odd frames go through a padded copy
+        self._padded: Optional[np.ndarray] = None
+        self._padded_i420: Optional[np.ndarray] = None
+        if width % 2 or height % 2:
+            padded_width, padded_height = 2 * self.chroma_width, 2 * self.chroma_height
+            self._padded = np.empty((padded_height, padded_width, 3), dtype=np.uint8)
+            self._padded_i420 = np.empty((padded_height * 3 // 2, padded_width), dtype=np.uint8)
+
+        self._index = 0
+        self.grown = 0
+
+    @property
+    def slots(self) -> int:
+        """Number of buffers in the ring."""
+        return len(self._frames)
+
+    def _allocate(self) -> None:
+        """Add one buffer, with Y, U and V plane views and its VideoFrame, to the ring."""
+        buffer = bytearray(self.frame_bytes)
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        luma = self.width * self.height
+        chroma = self.chroma_width * self.chroma_height
+        self._buffers.append(buffer)
+        self._planes.append((
+            data[:luma].reshape(self.height, self.width),
+            data[luma:luma + chroma].reshape(self.chroma_height, self.chroma_width),
+            data[luma + chroma:].reshape(self.chroma_height, self.chroma_width),
+        ))
+        self._frames.append(rtc.VideoFrame(self.width, self.height, rtc.VideoBufferType.I420, memoryview(buffer)))
+
+    def _next_free_slot(self) -> int:
+        """Find the next buffer in ring order that is not outstanding, growing the ring if none is."""
+        count = len(self._frames)
+        for step in range(count):
+            index = (self._index + step) % count
+            if index not in self._outstanding:
+                self._index = (index + 1) % count
+                return index
+
+        # Every buffer is still queued or held: grow rather than overwrite one
+        self._allocate()
+        self.grown += 1
+        self._index = 0
+        return count
+
+    def convert(self, frame: np.ndarray) -> rtc.VideoFrame:
+        """
+        Convert a BGR frame into the next free buffer of the ring.
+
+        Args:
+            frame: Video frame as numpy array (BGR format)
+
+        Returns:
+            VideoFrame backed by the pooled buffer, valid until it is released
+        """
+        if frame.shape[0] != self.height or frame.shape[1] != self.width:
+            cv2.resize(frame, (self.width, self.height), dst=self._resized)
+            frame = self._resized
+
+        index = self._next_free_slot()
+        self._outstanding.add(index)
+
+        if self._padded is None:
+            # Even sizes: the ring buffer has OpenCV's I420 layout, so it converts in place
+            data = np.frombuffer(self._buffers[index], dtype=np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420, dst=data.reshape(self.height * 3 // 2, self.width))
+        else:
+            self._convert_padded(frame, self._planes[index])
+        return self._frames[index]
+
+    def _convert_padded(self, frame: np.ndarray, planes: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> None:
+        """Convert an odd-sized frame through an edge-replicated even copy, then crop the planes."""
+        padded = self._padded
+        padded[:self.height, :self.width] = frame
+        padded[self.height:, :self.width] = frame[-1:]
+        padded[:, self.width:] = padded[:, self.width - 1:self.width]
+        cv2.cvtColor(padded, cv2.COLOR_BGR2YUV_I420, dst=self._padded_i420)
+
+        luma, u, v = planes
+        padded_height, padded_width = padded.shape[:2]
+        chroma = self.chroma_width * self.chroma_height
+        flat = self._padded_i420.reshape(-1)
+        luma[:] = self._padded_i420[:self.height, :self.width]
+        u[:] = flat[padded_height * padded_width:][:chroma].reshape(u.shape)
+        v[:] = flat[padded_height * padded_width + chroma:][:chroma].reshape(v.shape)
+
+    def release(self, video_frame: rtc.VideoFrame) -> None:
+        """
+        Return a converted frame's buffer to the ring once nothing reads it any more.
+
+        Frames from other pools are ignored, so callers need not track the owner.
+        """
+        for index, pooled in enumerate(self._frames):
+            if pooled is video_frame:
+                self._outstanding.discard(index)
+                return
+
+    def release_all(self) -> None:
+        """Return every buffer to the ring (the publisher holds no frames)."""
+        self._outstanding.clear()
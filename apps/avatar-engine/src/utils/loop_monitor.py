@@ -0,0 +1,83 @@
+"""
+Event Loop Lag Monitor
+Measures how late the asyncio event loop wakes up, i.e. how long callbacks are blocked.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+
+class EventLoopLagMonitor:
+    """Samples event loop lag by timing how late a periodic sleep wakes up."""
+
+    def __init__(self, interval: float = 0.05, window: int = 200):
+        """
+        Initialize the lag monitor.
+
+        Args:
+            interval: Seconds between samples
+            window: Number of recent samples kept for statistics
+        """
+        self.interval = interval
+        self.window = window
+        self.lag_samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Event loop lag monitor started")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Sampling loop."""
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+
+            self.lag_samples.append(lag)
+            if len(self.lag_samples) > self.window:
+                self.lag_samples.pop(0)
+
+    def reset(self) -> None:
+        """Discard collected samples."""
+        self.lag_samples.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag statistics in milliseconds."""
+        if not self.lag_samples:
+            return {}
+
+        samples = np.array(self.lag_samples) * 1000
+        return {
+            "avg_lag_ms": float(samples.mean()),
+            "p95_lag_ms": float(np.percentile(samples, 95)),
+            "max_lag_ms": float(samples.max()),
+            "samples": len(samples),
+        }
+
+
+_monitor: Optional[EventLoopLagMonitor] = None
+
+
+def get_loop_lag_monitor() -> EventLoopLagMonitor:
+    """Get the process-wide event loop lag monitor."""
+    global _monitor
+    if _monitor is None:
+        _monitor = EventLoopLagMonitor()
+    return _monitor
@@ -0,0 +1,85 @@
+"""
+Audio Frame Chunker Tests
+Checks the per-frame sample cadence and the context carried across payload boundaries.
+"""
+
+import numpy as np
+
+from src.core.audio_chunker import AudioFrameChunker
+
+
+SAMPLE_RATE = 16000
+FPS = 30
+
+
+def ramp(samples: int) -> np.ndarray:
+    """Distinct, exactly representable sample values, so any misplaced sample shows."""
+    return (np.arange(1, samples + 1) / 65536.0).astype(np.float32)
+
+
+def push_in_chunks(chunker: AudioFrameChunker, audio: np.ndarray, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    windows = []
+    offset = 0
+    while offset < len(audio):
+        size = int(rng.integers(1, 900))
+        windows.extend(chunker.push(audio[offset:offset + size]))
+        offset += size
+    return windows
+
+
+def test_one_second_alternates_533_and_534_samples():
+    chunker = AudioFrameChunker(SAMPLE_RATE, FPS)
+    windows = push_in_chunks(chunker, ramp(SAMPLE_RATE), seed=0) + chunker.flush()
+
+    sizes = [len(window.samples) for window in windows]
+    assert len(windows) == FPS
+    assert sum(sizes) == SAMPLE_RATE
+    assert set(sizes) == {533, 534}
+    assert sizes[:3] == [533, 533, 534]
+
+
+def test_windows_are_contiguous_across_payloads():
+    audio = ramp(SAMPLE_RATE)
+    chunker = AudioFrameChunker(SAMPLE_RATE, FPS)
+    windows = push_in_chunks(chunker, audio, seed=1)
+
+    assert [window.index for window in windows] == list(range(len(windows)))
+    assert windows[0].start_sample == 0
+    for previous, window in zip(windows, windows[1:]):
+        assert window.start_sample == previous.end_sample
+    np.testing.assert_array_equal(
+        np.concatenate([window.samples for window in windows]), audio[:windows[-1].end_sample]
+    )
+
+
+def test_context_is_carried_across_payloads():
+    left, right = 1200, 700
+    audio = ramp(2 * SAMPLE_RATE)
+    padded = np.concatenate([np.zeros(left, dtype=np.float32), audio])
+    chunker = AudioFrameChunker(SAMPLE_RATE, FPS, left_context=left, right_context=right)
+    windows = push_in_chunks(chunker, audio, seed=2)
+
+    assert windows
+    for window in windows:
+        # Zero-padded before the stream start, the real neighbouring samples after it
+        start = window.start_sample + left
+        np.testing.assert_array_equal(window.left_context, padded[start - left:start])
+        np.testing.assert_array_equal(window.right_context, audio[window.end_sample:window.end_sample + right])
+    assert windows[-1].end_sample + right <= len(audio)
+
+
+def test_byte_payloads_keep_odd_trailing_bytes():
+    pcm = (np.arange(SAMPLE_RATE) % 2000 - 1000).astype(np.int16)
+    data = pcm.tobytes()
+    chunker = AudioFrameChunker(SAMPLE_RATE, FPS)
+
+    windows = []
+    for offset in range(0, len(data), 321):
+        windows.extend(chunker.push_bytes(data[offset:offset + 321]))
+    windows.extend(chunker.flush())
+
+    assert chunker.total_samples == SAMPLE_RATE
+    np.testing.assert_array_equal(
+        np.concatenate([window.samples for window in windows]), pcm.astype(np.float32) / 32768.0
+    )
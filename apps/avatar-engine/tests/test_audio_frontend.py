@@ -0,0 +1,108 @@
+"""
+Streaming Mel Frontend Tests
+Checks that streamed feature windows match batch log-mel features of the whole signal.
+"""
+
+import librosa
+import numpy as np
+import pytest
+
+from src.musetalk.audio_frontend import StreamingMelFrontend
+
+
+SAMPLE_RATE = 16000
+FPS = 30
+
+# Tolerance in normalized (Whisper-scaled) log-mel units, i.e. a quarter of a log10 unit per 1.0
+FEATURE_ATOL = 1e-4
+
+
+def speech_like(seconds: float) -> np.ndarray:
+    """Formant-like tones under a syllable-rate envelope, loudest at the start."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    envelope = np.exp(-t / 0.6) * (0.6 + 0.4 * np.cos(2 * np.pi * 4 * t))
+    tones = sum(np.sin(2 * np.pi * f * t) for f in (220, 730, 1090, 2440))
+    return (envelope * (0.1 * tones + 0.02 * rng.standard_normal(len(t)))).astype(np.float32)
+
+
+def batch_log_mel(audio: np.ndarray, frontend: StreamingMelFrontend) -> np.ndarray:
+    """Whole-signal log10 mel power with the Whisper frame layout, (frames, n_mels)."""
+    mel = librosa.feature.melspectrogram(
+        y=audio,
+        sr=SAMPLE_RATE,
+        n_fft=frontend.n_fft,
+        hop_length=frontend.hop_length,
+        n_mels=frontend.n_mels,
+        window="hann",
+        center=True,
+        pad_mode="constant",
+        power=2.0,
+    )
+    return np.log10(np.maximum(mel, 1e-10)).T
+
+
+def stream(audio: np.ndarray, chunk_sizes) -> tuple:
+    """Push audio through a fresh frontend in the given chunk sizes; returns (frontend, windows)."""
+    frontend = StreamingMelFrontend(sample_rate=SAMPLE_RATE, fps=FPS, history_seconds=4.0)
+    windows = []
+    offset = 0
+    for size in chunk_sizes:
+        windows.extend(frontend.push(audio[offset:offset + size]))
+        offset += size
+        if offset >= len(audio):
+            break
+    return frontend, windows
+
+
+def random_chunks(seed: int, low: int, high: int):
+    rng = np.random.default_rng(seed)
+    while True:
+        yield int(rng.integers(low, high))
+
+
+@pytest.mark.parametrize("chunk_sizes", [
+    random_chunks(1, 1, 40),
+    random_chunks(2, 100, 1200),
+    random_chunks(3, 3000, 9000),
+])
+def test_windows_match_batch_log_mel(chunk_sizes):
+    audio = speech_like(1.5)
+    frontend, windows = stream(audio, chunk_sizes)
+
+    reference = batch_log_mel(audio, frontend)
+    floor = reference.max() - 8.0
+
+    assert len(windows) > 0
+    assert [window.index for window in windows] == list(range(len(windows)))
+    for window in windows:
+        first = frontend._window_first(window.index)
+        # Frames before the stream start repeat the first frame
+        indices = np.clip(np.arange(first, first + frontend.window_frames), 0, None)
+        expected = (np.maximum(reference[indices].T, floor) + 4.0) / 4.0
+
+        assert window.features.shape == (frontend.n_mels, frontend.window_frames)
+        np.testing.assert_allclose(window.features, expected, atol=FEATURE_ATOL)
+
+
+def test_chunking_does_not_change_features():
+    audio = speech_like(1.0)
+    _, whole = stream(audio, [len(audio)])
+    _, streamed = stream(audio, random_chunks(4, 1, 700))
+
+    assert len(streamed) == len(whole)
+    for a, b in zip(streamed, whole):
+        np.testing.assert_allclose(a.features, b.features, atol=1e-5)
+
+
+def test_emits_one_window_per_video_frame():
+    audio = speech_like(2.0)
+    frontend, windows = stream(audio, random_chunks(5, 200, 600))
+
+    # Every frame whose right context was pushed has its window
+    expected = sum(
+        1 for index in range(2 * FPS)
+        if frontend._window_span(index)[1] <= len(audio)
+    )
+    assert len(windows) == expected
+    assert frontend.samples_received == len(audio)
@@ -0,0 +1,41 @@
+"""
+Avatar Preparation Cache Tests
+Checks that sessions on one avatar share a single emotion bank build.
+"""
+
+import asyncio
+
+from src.musetalk.avatar_cache import AvatarPreparationCache
+
+
+async def test_concurrent_sessions_share_one_emotion_bank_build(tmp_path):
+    cache = AvatarPreparationCache(tmp_path)
+    builds = []
+    release = asyncio.Event()
+
+    async def build():
+        builds.append(1)
+        await release.wait()
+        return {"happy": 1.0}
+
+    tasks = [cache.emotion_bank_build("avatar", build) for _ in range(3)]
+    other = cache.emotion_bank_build("other", build)
+    release.set()
+
+    assert tasks[0] is tasks[1] is tasks[2]
+    assert await asyncio.gather(*tasks, other) == [{"happy": 1.0}] * 4
+    assert len(builds) == 2
+
+
+async def test_finished_build_is_forgotten(tmp_path):
+    cache = AvatarPreparationCache(tmp_path)
+
+    async def failed_build():
+        return None
+
+    first = cache.emotion_bank_build("avatar", failed_build)
+    assert await first is None
+    await asyncio.sleep(0)
+
+    # A failed bank can be retried by the next session on the avatar
+    assert cache.emotion_bank_build("avatar", failed_build) is not first
@@ -0,0 +1,81 @@
+"""
+Inference Backend Equivalence Tests
+Checks that the onnxruntime backend renders the same frames as the torch backend.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from benchmarks.backend_equivalence import StandInModelManager, load_backend, psnr, render_frames
+from src.musetalk.inference_backend import OnnxRuntimeBackend, TorchBackend
+
+
+FRAMES = 4
+FACE_SIZE = 256
+
+# Composited uint8 frames may differ by float rounding at a few pixels, no more
+MAX_PIXEL_DIFF = 2
+MIN_PSNR_DB = 45.0
+
+# Raw decoder output, in [-1, 1] image units
+DECODER_ATOL = 1e-3
+
+
+@pytest.fixture(scope="module")
+def backends(tmp_path_factory):
+    """Torch and onnxruntime backends over the same stand-in weights (exported once per module)."""
+    models_path = tmp_path_factory.mktemp("models")
+    torch_backend = TorchBackend(StandInModelManager(models_path, "cpu"))
+    onnx_backend = OnnxRuntimeBackend(StandInModelManager(models_path, "cpu"))
+
+    async def load() -> None:
+        await load_backend(torch_backend)
+        await load_backend(onnx_backend)
+
+    asyncio.run(load())
+    yield torch_backend, onnx_backend
+
+    onnx_backend.cleanup()
+    onnx_backend.model_manager.cleanup()
+    torch_backend.cleanup()
+    torch_backend.model_manager.cleanup()
+
+
+def test_rendered_frames_match(backends):
+    torch_backend, onnx_backend = backends
+    rng = np.random.default_rng(0)
+    face = rng.integers(0, 255, (FACE_SIZE, FACE_SIZE, 3), dtype=np.uint8)
+    features = rng.standard_normal((FRAMES, 80, 32)).astype(np.float32)
+
+    torch_frames, torch_latents = render_frames(torch_backend, face, features, FRAMES)
+    onnx_frames, onnx_latents = render_frames(onnx_backend, face, features, FRAMES)
+
+    assert float((onnx_latents - torch_latents).norm() / torch_latents.norm()) < 1e-4
+    for reference, frame in zip(torch_frames, onnx_frames):
+        assert frame.shape == reference.shape and frame.dtype == np.uint8
+        assert int(np.abs(reference.astype(np.int16) - frame.astype(np.int16)).max()) <= MAX_PIXEL_DIFF
+        assert psnr(reference, frame) >= MIN_PSNR_DB
+
+
+@pytest.mark.parametrize("latent_size", [FACE_SIZE // 8, FACE_SIZE // 16])
+def test_decoded_frames_match(backends, latent_size):
+    torch_backend, onnx_backend = backends
+    torch.manual_seed(latent_size)
+    latents = torch.randn(1, 4, latent_size, latent_size)
+    timesteps = torch.zeros((1,), dtype=torch.long)
+    text_embeddings = torch.randn(1, 77, 768)
+
+    outputs = []
+    for backend in (torch_backend, onnx_backend):
+        noise_pred = backend.forward_fn("unet")(latents, timesteps, text_embeddings)
+        outputs.append(backend.forward_fn("vae_decoder")(latents - noise_pred))
+
+    reference, decoded = outputs
+    assert decoded.shape == reference.shape == (1, 3, latent_size * 8, latent_size * 8)
+    assert float((decoded - reference).abs().max()) <= DECODER_ATOL
@@ -0,0 +1,160 @@
+"""
+Capacity Admission Tests
+Checks admission and Retry-After arithmetic against a monkeypatched warmup calibration.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import capacity as capacity_module
+from src.core.capacity import MAX_RETRY_AFTER_S, MIN_RETRY_AFTER_S, CapacityBudget
+from src.core.config import AvatarConfig
+from src.core.quality_controller import QualityTier
+
+
+def make_config(**overrides) -> AvatarConfig:
+    values = dict(
+        livekit_url="ws://localhost", livekit_api_key="key", livekit_api_secret="secret",
+        video_fps=30, interframe_mode="off", adaptive_quality=True, render_mode="full_face",
+        capacity_headroom=1.0, capacity_retry_after_s=30.0,
+    )
+    values.update(overrides)
+    return AvatarConfig(**values)
+
+
+def calibration(throughput_fps: float) -> dict:
+    """Warmup status with equal pass times, so a FULL frame costs 1 and LOW_RES about half."""
+    return {
+        "throughput_fps": throughput_fps,
+        "models": {
+            "audio_encoder": {"pass_ms": {"32": 2.0}},
+            "unet": {"pass_ms": {"32": 10.0, "16": 4.0}},
+            "vae_decoder": {"pass_ms": {"32": 8.0, "16": 2.0}},
+        },
+    }
+
+
+def fake_session(config: AvatarConfig, tier: QualityTier = QualityTier.FULL, age_s: float = 0.0):
+    return SimpleNamespace(
+        config=config,
+        quality=SimpleNamespace(tier=tier),
+        state=SimpleNamespace(session_start_time=time.time() - age_s),
+    )
+
+
+@pytest.fixture
+def calibrated(monkeypatch):
+    """Patch the warmup status; call with a throughput, or None for an uncalibrated process."""
+    def set_throughput(throughput_fps):
+        status = calibration(throughput_fps) if throughput_fps is not None else None
+        monkeypatch.setattr(capacity_module, "get_model_warmup_status", lambda: status)
+    return set_throughput
+
+
+def test_empty_pod_admits_even_over_capacity(calibrated):
+    calibrated(10.0)
+    config = make_config()
+    budget = CapacityBudget(config)
+
+    # One FULL session at 30 fps is three times the capacity
+    assert budget.check_admission([], config) is None
+    assert budget.rejections == 0
+
+
+def test_uncalibrated_budget_admits(calibrated):
+    calibrated(None)
+    config = make_config()
+    budget = CapacityBudget(config)
+
+    assert budget.capacity_fps is None
+    assert budget.load([fake_session(config)]) is None
+    assert budget.check_admission([fake_session(config)] * 5, config) is None
+
+
+def test_admits_while_the_new_session_fits(calibrated):
+    calibrated(100.0)
+    config = make_config()
+    budget = CapacityBudget(config)
+
+    # 2 x 30 fps live + 30 fps new = 90 <= 100
+    assert budget.check_admission([fake_session(config)] * 2, config) is None
+    assert budget.load([fake_session(config)] * 2) == pytest.approx(0.6)
+
+
+def test_rejects_when_the_deficit_is_positive(calibrated):
+    calibrated(100.0)
+    config = make_config()
+    budget = CapacityBudget(config)
+
+    # 3 x 30 fps live + 30 fps new = 120 > 100
+    retry_after = budget.check_admission([fake_session(config)] * 3, config)
+    assert retry_after == config.capacity_retry_after_s
+    assert budget.rejections == 1
+
+
+def test_headroom_shrinks_capacity(calibrated):
+    calibrated(100.0)
+    config = make_config(capacity_headroom=0.5)
+    budget = CapacityBudget(config)
+
+    assert budget.capacity_fps == pytest.approx(50.0)
+    assert budget.check_admission([fake_session(config)], config) is not None
+
+
+def test_retry_after_waits_for_enough_sessions_to_end(calibrated):
+    calibrated(100.0)
+    config = make_config()
+    budget = CapacityBudget(config)
+    budget.record_session_end(100.0)
+
+    # Expected to end in 70 s, 40 s and 10 s; a 20 fps deficit is covered by the first to end
+    sessions = [fake_session(config, age_s=age) for age in (30.0, 60.0, 90.0)]
+    assert budget.check_admission(sessions, config) == pytest.approx(10.0, abs=0.5)
+    # Freeing 40 fps needs the two earliest endings
+    assert budget.estimate_retry_after(sessions, deficit_fps=40.0) == pytest.approx(40.0, abs=0.5)
+
+
+def test_retry_after_is_clamped(calibrated):
+    calibrated(100.0)
+    config = make_config()
+
+    budget = CapacityBudget(config)
+    budget.record_session_end(10_000.0)
+    assert budget.estimate_retry_after([fake_session(config)], deficit_fps=1.0) == MAX_RETRY_AFTER_S
+
+    budget = CapacityBudget(config)
+    budget.record_session_end(5.0)
+    # Already past the expected duration: the next check
+    assert budget.estimate_retry_after([fake_session(config, age_s=60.0)], deficit_fps=1.0) == MIN_RETRY_AFTER_S
+
+
+def test_demand_halves_at_half_rate_and_reduced_fps(calibrated):
+    calibrated(100.0)
+    budget = CapacityBudget(make_config())
+    costs = {tier.name: 1.0 for tier in QualityTier}
+    costs["inbetween_decode"] = 0.25
+
+    full_rate = make_config(interframe_mode="off")
+    half_rate = make_config(interframe_mode="blend")
+    latent = make_config(interframe_mode="latent")
+
+    assert budget._demand_fps(full_rate, QualityTier.FULL, costs) == 30.0
+    assert budget._demand_fps(full_rate, QualityTier.REDUCED_FPS, costs) == 15.0
+    assert budget._demand_fps(half_rate, QualityTier.FULL, costs) == 15.0
+    assert budget._demand_fps(half_rate, QualityTier.REDUCED_FPS, costs) == 7.5
+    # Latent in-betweens add one decode per render
+    assert budget._demand_fps(latent, QualityTier.FULL, costs) == 15.0 + 15.0 * 0.25
+
+
+def test_frame_costs_scale_demand_by_tier(calibrated):
+    calibrated(100.0)
+    config = make_config()
+    budget = CapacityBudget(config)
+    costs = budget.frame_costs()
+
+    assert costs[QualityTier.FULL.name] == 1.0
+    assert costs[QualityTier.REUSE_LATENTS.name] == pytest.approx((2 + 5 + 8) / 20)
+    assert costs[QualityTier.LOW_RES.name] == pytest.approx((2 + 2 + 2) / 20)
+    assert budget.demand_fps([fake_session(config, QualityTier.LOW_RES)]) == pytest.approx(30 * 0.3)
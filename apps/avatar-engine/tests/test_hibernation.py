@@ -0,0 +1,132 @@
+"""
+Session Hibernation Tests
+Hibernates an engine on stand-in models and resumes it from the memory and disk avatar cache.
+"""
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from benchmarks.backend_equivalence import StandInModelManager
+from src.core.audio_chunker import AudioFrameChunker
+from src.core.avatar_session import AvatarSession
+from src.core.config import AvatarConfig
+from src.musetalk.avatar_cache import AvatarPreparationCache
+from src.musetalk.inference_backend import TorchBackend
+from src.musetalk.lip_sync_engine import MuseTalkLipSyncEngine
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """Engine with a prepared avatar, stand-in weights and a fixed face box."""
+    image = np.full((512, 512, 3), 90, np.uint8)
+    cv2.circle(image, (256, 260), 150, (180, 160, 140), -1)
+    image_path = tmp_path / "avatar.png"
+    cv2.imwrite(str(image_path), image)
+
+    config = AvatarConfig(
+        livekit_url="ws://localhost", livekit_api_key="key", livekit_api_secret="secret",
+        device="cpu", models_path=tmp_path, avatar_cache_path=tmp_path / "avatars",
+        mouth_cache_size=0, emotion_bank_enabled=False,
+    )
+    engine = MuseTalkLipSyncEngine(config)
+    # A fresh cache, not the process-wide one other tests may have filled
+    engine.avatar_cache = AvatarPreparationCache(tmp_path / "avatars")
+    engine.backend = TorchBackend(StandInModelManager(tmp_path, "cpu"))
+    engine.dwpose_detector.is_initialized = True
+    engine._detect_face_region = lambda image: {"bbox": (120, 110, 400, 420), "landmarks": None, "confidence": 0.9}
+    engine.is_initialized = True
+
+    await engine.set_avatar_image(image_path)
+    if engine._idle_task is not None:
+        await engine._idle_task
+    yield engine
+    engine.cleanup()
+
+
+def audio_windows(engine: MuseTalkLipSyncEngine, count: int) -> list:
+    frontend = engine.audio_frontend
+    chunker = AudioFrameChunker(16000, 30, frontend.lookbehind_samples, frontend.lookahead_samples)
+    audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 0.3
+    return chunker.push(audio)[:count]
+
+
+async def test_hibernate_releases_render_state_and_keeps_the_idle_loop(engine):
+    await engine.process_audio_window(audio_windows(engine, 1)[0])
+    assert engine.render_buffers is not None
+
+    await engine.hibernate()
+
+    assert engine.is_hibernated and engine.hibernations == 1
+    assert engine.prepared_avatar is None and engine.ref_latents is None and engine.mouth_mask is None
+    assert engine.render_buffers is None and engine.low_res_buffers is None
+    # Spilled, so resume can reload it; the publisher keeps streaming idle frames
+    assert engine.avatar_cache._path(engine.avatar_key).exists()
+    assert engine.next_idle_frame() is not None
+
+    await engine.hibernate()
+    assert engine.hibernations == 1
+
+
+async def test_resume_reloads_from_the_memory_cache(engine):
+    ref_latents = engine.ref_latents.clone()
+    await engine.hibernate()
+    disk_hits = engine.avatar_cache.disk_hits
+
+    await engine.resume()
+
+    assert not engine.is_hibernated
+    assert engine.avatar_cache.disk_hits == disk_hits
+    assert torch.equal(engine.ref_latents, ref_latents)
+    assert engine.render_buffers is not None
+    assert len(engine.resume_times) == 1
+
+    frame = await engine.process_audio_window(audio_windows(engine, 1)[0])
+    assert frame.shape == (512, 512, 3)
+
+
+async def test_resume_reloads_from_disk_after_eviction(engine):
+    ref_latents = engine.ref_latents.clone()
+    await engine.hibernate()
+    engine.avatar_cache._entries.clear()
+
+    await engine.resume()
+
+    assert not engine.is_hibernated
+    assert engine.avatar_cache.disk_hits == 1
+    assert torch.equal(engine.ref_latents, ref_latents)
+
+
+async def test_resume_fails_once_the_avatar_left_the_cache(engine):
+    await engine.hibernate()
+    engine.avatar_cache._entries.clear()
+    engine.avatar_cache._path(engine.avatar_key).unlink()
+
+    with pytest.raises(RuntimeError):
+        await engine.resume()
+    assert engine.is_hibernated
+
+
+async def test_session_resume_falls_back_to_re_preparing_the_avatar(tmp_path):
+    prepared_from = []
+
+    async def lost_resume():
+        raise RuntimeError("no longer in the avatar cache")
+
+    async def set_avatar_image(path):
+        prepared_from.append(path)
+
+    session = SimpleNamespace(
+        session_id="session",
+        metrics={"resumes": 0},
+        state=SimpleNamespace(avatar_image_path=tmp_path / "avatar.png"),
+        lip_sync_engine=SimpleNamespace(resume=lost_resume, set_avatar_image=set_avatar_image),
+    )
+
+    await AvatarSession._resume(session)
+
+    assert prepared_from == [tmp_path / "avatar.png"]
+    assert session.metrics["resumes"] == 1
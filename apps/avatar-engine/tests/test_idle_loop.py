@@ -0,0 +1,93 @@
+"""
+Idle Loop Tests
+Checks the loop's seam and blink, and which idle frame the engine streams while silent.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.config import AvatarConfig
+from src.musetalk.avatar_cache import PreparedAvatar
+from src.musetalk.idle_loop import BLINK_PROFILE, IdleLoop, render_idle_loop
+from src.musetalk.lip_sync_engine import MuseTalkLipSyncEngine
+
+
+FPS = 10
+SECONDS = 2.0
+EYES = [(40, 50, 60, 58), (70, 50, 90, 58)]
+
+
+def make_prepared() -> PreparedAvatar:
+    rng = np.random.default_rng(0)
+    image = rng.integers(60, 200, (128, 128, 3), dtype=np.uint8)
+    return PreparedAvatar(
+        key="avatar", image=image, bbox=(20, 20, 108, 120), face_region=(20, 20, 108, 120),
+        landmarks=None, mouth_mask=np.zeros((128, 128), np.float32),
+        ref_latents=np.zeros((1, 8, 16, 16), np.float32),
+    )
+
+
+def numbered_loop(frames: int) -> IdleLoop:
+    """Loop whose frame i is filled with the value i, so the selected index shows."""
+    return IdleLoop(key="avatar", frames=[np.full((4, 4, 3), i, np.uint8) for i in range(frames)])
+
+
+@pytest.fixture
+def engine():
+    """Engine with a still avatar set and no models loaded."""
+    config = AvatarConfig(livekit_url="ws://localhost", livekit_api_key="key", livekit_api_secret="secret", device="cpu")
+    engine = MuseTalkLipSyncEngine(config)
+    engine.current_avatar_image = np.zeros((4, 4, 3), np.uint8)
+    return engine
+
+
+def test_loop_starts_at_the_still_image_and_blinks_once():
+    prepared = make_prepared()
+    loop = render_idle_loop(prepared, EYES, fps=FPS, seconds=SECONDS)
+
+    assert len(loop.frames) == int(SECONDS * FPS)
+    # The seam matches the still image, so the loop can start right after speech
+    np.testing.assert_array_equal(loop.frames[0], prepared.image)
+
+    blink_start = int(len(loop.frames) * 0.4)
+    x1, y1, x2, y2 = EYES[0]
+    eye = lambda frame: frame[y1:y2, x1:x2].astype(np.float32)
+    closed = blink_start + BLINK_PROFILE.index(1.0)
+    assert np.abs(eye(loop.frames[closed]) - eye(prepared.image)).mean() > \
+        np.abs(eye(loop.frames[blink_start - 1]) - eye(prepared.image)).mean()
+
+
+def test_short_loop_still_fits_a_whole_blink():
+    loop = render_idle_loop(make_prepared(), EYES, fps=FPS, seconds=0.1)
+
+    assert len(loop.frames) == len(BLINK_PROFILE) + 1
+
+
+def test_frame_at_wraps_around_the_loop():
+    loop = numbered_loop(5)
+
+    assert [int(loop.frame_at(index)[0, 0, 0]) for index in range(12)] == [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1]
+
+
+def test_still_image_streams_until_the_loop_is_ready(engine):
+    assert engine.next_idle_frame() is engine.current_avatar_image
+    assert engine.idle_frame_index == 0
+
+    engine.idle_loop = numbered_loop(3)
+    assert [int(engine.next_idle_frame()[0, 0, 0]) for _ in range(4)] == [0, 1, 2, 0]
+
+
+def test_restart_resumes_the_loop_from_its_seam(engine):
+    engine.idle_loop = numbered_loop(5)
+    for _ in range(3):
+        engine.next_idle_frame()
+
+    engine.restart_idle_loop()
+    assert int(engine.next_idle_frame()[0, 0, 0]) == 0
+
+
+def test_no_idle_frame_without_an_avatar(engine):
+    engine.current_avatar_image = None
+    engine.idle_loop = numbered_loop(3)
+
+    assert engine.next_idle_frame() is None
@@ -0,0 +1,141 @@
+"""
+LiveKit Streamer Tests
+Checks the connection backoff and fresh rooms, and the publisher's release of pooled frame buffers.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.core.config import AvatarConfig
+from src.streaming import livekit_streamer
+from src.streaming.livekit_streamer import LiveKitStreamer, backoff_delay
+
+
+def make_config(**overrides) -> AvatarConfig:
+    values = dict(
+        livekit_url="ws://localhost", livekit_api_key="key", livekit_api_secret="secret",
+        livekit_connect_attempts=3, livekit_backoff_base_s=0.001, livekit_backoff_max_s=0.004,
+    )
+    values.update(overrides)
+    return AvatarConfig(**values)
+
+
+class FakeRoom:
+    """Room whose first ``failures`` connects (across instances) raise."""
+
+    instances: list = []
+    failures = 0
+
+    def __init__(self):
+        self.connected = False
+        self.disconnected = False
+        FakeRoom.instances.append(self)
+
+    def on(self, event):
+        return lambda handler: handler
+
+    async def connect(self, url, token):
+        if FakeRoom.failures > 0:
+            FakeRoom.failures -= 1
+            raise ConnectionError("room not ready")
+        self.connected = True
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture
+def fake_room(monkeypatch):
+    FakeRoom.instances = []
+    FakeRoom.failures = 0
+    monkeypatch.setattr(livekit_streamer.rtc, "Room", FakeRoom)
+
+    async def no_publishing(self):
+        pass
+
+    monkeypatch.setattr(LiveKitStreamer, "_setup_video_publishing", no_publishing)
+    return FakeRoom
+
+
+@pytest.mark.parametrize("base_s, max_s", [(0.25, 4.0), (0.1, 0.3), (1.0, 1.0)])
+def test_backoff_delay_stays_within_full_jitter_bounds(base_s, max_s):
+    random.seed(1234)
+    for attempt in range(12):
+        bound = min(max_s, base_s * 2 ** attempt)
+        delays = [backoff_delay(attempt, base_s, max_s) for _ in range(200)]
+
+        assert all(0.0 <= delay <= bound for delay in delays)
+        # Jittered across the whole range, not a fixed sleep
+        assert min(delays) < 0.1 * bound and max(delays) > 0.9 * bound
+
+
+def test_backoff_delay_is_reproducible_under_a_seed():
+    random.seed(7)
+    first = [backoff_delay(attempt, 0.25, 4.0) for attempt in range(6)]
+    random.seed(7)
+    assert [backoff_delay(attempt, 0.25, 4.0) for attempt in range(6)] == first
+
+
+async def test_failed_connect_retries_on_a_fresh_room(fake_room):
+    fake_room.failures = 1
+    streamer = LiveKitStreamer(make_config())
+
+    await streamer.connect_to_room("ws://localhost", "token")
+
+    assert len(fake_room.instances) == 2
+    assert streamer.room is fake_room.instances[1]
+    assert not fake_room.instances[0].connected and fake_room.instances[1].connected
+    assert streamer.is_connected
+    assert streamer.connect_attempts == 2
+    assert set(streamer.connect_times) == {"room_connect", "publish_setup"}
+
+
+async def test_connect_gives_up_after_the_configured_attempts(fake_room):
+    fake_room.failures = 10
+    streamer = LiveKitStreamer(make_config(livekit_connect_attempts=3))
+
+    with pytest.raises(ConnectionError):
+        await streamer.connect_to_room("ws://localhost", "token")
+
+    assert len(fake_room.instances) == 3
+    assert streamer.connect_attempts == 3
+    assert not streamer.is_connected
+    assert streamer.room is None
+    assert fake_room.instances[-1].disconnected
+
+
+class FakeVideoSource:
+    def __init__(self):
+        self.captured = []
+
+    def capture_frame(self, video_frame, timestamp_us):
+        self.captured.append(video_frame)
+
+
+async def test_publisher_releases_buffers_without_overwriting_the_held_frame():
+    streamer = LiveKitStreamer(make_config(publisher_queue_frames=2))
+    streamer.is_streaming = True
+    streamer.video_source = FakeVideoSource()
+    size = streamer.frame_pool.height, streamer.frame_pool.width, 3
+
+    await streamer.stream_frame(np.full(size, 50, np.uint8))
+    streamer._publish_tick(0)
+    held = streamer.last_video_frame
+    snapshot = bytes(held.data)
+
+    # The renderer runs ahead and overflows the queue while the first frame is held
+    for value in range(60, 200, 10):
+        await streamer.stream_frame(np.full(size, value, np.uint8))
+    assert bytes(held.data) == snapshot
+    assert streamer.frames_dropped > 0
+
+    for tick in range(1, 40):
+        if tick % 3 == 0:
+            await streamer.stream_frame(np.full(size, tick, np.uint8))
+        streamer._publish_tick(tick)
+
+    # Dropped and replaced frames went back to the ring, so it never had to grow
+    assert streamer.frame_pool.grown == 0
+    assert streamer.frames_repeated > 0
@@ -0,0 +1,106 @@
+"""
+Mouth Patch Cache Tests
+Checks the audio code's stability and separation, LRU eviction and the hit/miss counters.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from src.musetalk import mouth_patch_cache as mouth_patch_cache_module
+from src.musetalk.mouth_patch_cache import MouthPatchCache, get_mouth_patch_cache
+
+
+N_MELS = 80
+FRAMES = 4
+
+
+def mel_window(seed: int, level: float = 0.0, noise: float = 0.3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (level + noise * rng.standard_normal((N_MELS, FRAMES))).astype(np.float32)
+
+
+def patch(value: int) -> np.ndarray:
+    return np.full((8, 16, 3), value, np.uint8)
+
+
+def test_key_is_stable_for_the_same_and_nearby_features():
+    cache = MouthPatchCache(levels=6, bands=8)
+    window = mel_window(0)
+
+    assert cache.quantize(window) == cache.quantize(window.copy())
+    # Jitter well under one quantization step lands on the same code
+    assert cache.quantize(window) == cache.quantize(window + 0.01)
+    assert len(cache.quantize(window)) == cache.bands
+
+
+def test_different_mouth_shapes_get_different_keys():
+    cache = MouthPatchCache(levels=6, bands=8)
+    quiet = mel_window(0, level=-0.8, noise=0.0)
+    loud = mel_window(0, level=1.2, noise=0.0)
+
+    assert cache.quantize(quiet) != cache.quantize(loud)
+
+    # Energy moved between bands changes the code even at the same overall level
+    low_band = np.zeros((N_MELS, FRAMES), np.float32)
+    low_band[:N_MELS // 2] = 1.0
+    high_band = low_band[::-1].copy()
+    assert cache.quantize(low_band) != cache.quantize(high_band)
+
+
+def test_out_of_range_features_clip_to_the_end_levels():
+    cache = MouthPatchCache(levels=6, bands=8)
+
+    assert cache.quantize(np.full((N_MELS, FRAMES), -5.0, np.float32)) == bytes([0] * 8)
+    assert cache.quantize(np.full((N_MELS, FRAMES), 5.0, np.float32)) == bytes([5] * 8)
+
+
+def test_hit_and_miss_counters():
+    cache = MouthPatchCache()
+    key = cache.quantize(mel_window(0))
+
+    assert cache.get(key) is None
+    cache.put(key, patch(1))
+    assert cache.get(key) is not None
+    assert cache.get(key) is not None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_evicts_the_least_recently_used_patch():
+    cache = MouthPatchCache(max_entries=2)
+    cache.put(b"a", patch(1))
+    cache.put(b"b", patch(2))
+
+    # Touching "a" makes "b" the least recently used
+    cache.get(b"a")
+    cache.put(b"c", patch(3))
+
+    assert cache.get(b"b") is None
+    assert int(cache.get(b"a")[0, 0, 0]) == 1 and int(cache.get(b"c")[0, 0, 0]) == 3
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_memory_tracks_replacements_and_evictions():
+    cache = MouthPatchCache(max_entries=2)
+    cache.put(b"a", patch(1))
+    cache.put(b"a", patch(2))
+    assert cache.get_stats()["memory_mb"] * 1024 ** 2 == patch(0).nbytes
+
+    cache.put(b"b", patch(3))
+    cache.put(b"c", patch(4))
+    assert cache.get_stats()["memory_mb"] * 1024 ** 2 == 2 * patch(0).nbytes
+
+
+def test_caches_are_per_avatar_and_bounded(monkeypatch):
+    monkeypatch.setattr(mouth_patch_cache_module, "_caches", OrderedDict())
+
+    first = get_mouth_patch_cache("first", max_avatars=2)
+    assert get_mouth_patch_cache("first", max_avatars=2) is first
+    assert get_mouth_patch_cache("second", max_avatars=2) is not first
+
+    get_mouth_patch_cache("first", max_avatars=2)
+    get_mouth_patch_cache("third", max_avatars=2)
+    assert list(mouth_patch_cache_module._caches) == ["first", "third"]
@@ -0,0 +1,100 @@
+"""
+Adaptive Quality Controller Tests
+Feeds synthetic render times through the tier hysteresis.
+"""
+
+from src.core.quality_controller import MAX_RECOVERY_BACKOFF, QualityController, QualityTier
+
+
+FPS = 10            # 100 ms frame budget
+WINDOW = 5
+SLOW = 0.15         # over budget
+FAST = 0.03         # under recover_ratio * budget (60 ms)
+MARGINAL = 0.08     # between the two thresholds
+
+
+def make_controller(**kwargs) -> QualityController:
+    return QualityController(fps=FPS, window_frames=WINDOW, recover_ratio=0.6, **kwargs)
+
+
+def feed(controller: QualityController, render_time_s: float, renders: int) -> list:
+    """Record renders and return every tier change they caused."""
+    changes = [controller.record(render_time_s) for _ in range(renders)]
+    return [tier for tier in changes if tier is not None]
+
+
+def test_steps_down_after_a_full_window_over_budget():
+    controller = make_controller()
+
+    assert feed(controller, SLOW, WINDOW - 1) == []
+    assert controller.tier == QualityTier.FULL
+    assert controller.record(SLOW) == QualityTier.REUSE_LATENTS
+
+
+def test_each_step_down_needs_a_fresh_window():
+    controller = make_controller()
+
+    assert feed(controller, SLOW, WINDOW) == [QualityTier.REUSE_LATENTS]
+    assert feed(controller, SLOW, WINDOW - 1) == []
+    assert feed(controller, SLOW, 1) == [QualityTier.LOW_RES]
+    assert feed(controller, SLOW, 2 * WINDOW) == [QualityTier.REDUCED_FPS]
+    # No tier below REDUCED_FPS
+    assert feed(controller, 1.0, 4 * WINDOW) == []
+    assert controller.tier == QualityTier.REDUCED_FPS
+
+
+def test_reduced_fps_doubles_the_render_budget_and_skips_odd_frames():
+    controller = make_controller()
+    feed(controller, SLOW, 3 * WINDOW)
+
+    assert controller.tier == QualityTier.REDUCED_FPS
+    assert controller.render_budget_s == 2 / FPS
+    assert [controller.should_render(index) for index in range(4)] == [True, False, True, False]
+    assert controller.frames_skipped == 2
+
+
+def test_steps_up_only_after_the_recovery_window():
+    controller = make_controller()
+    feed(controller, SLOW, WINDOW)
+
+    assert feed(controller, FAST, WINDOW - 1) == []
+    assert controller.tier == QualityTier.REUSE_LATENTS
+    assert controller.record(FAST) == QualityTier.FULL
+
+
+def test_holds_the_tier_between_the_thresholds():
+    controller = make_controller()
+    feed(controller, SLOW, WINDOW)
+
+    # Under budget but above the recovery threshold: no change either way
+    assert feed(controller, MARGINAL, 20 * WINDOW) == []
+    assert controller.tier == QualityTier.REUSE_LATENTS
+
+
+def test_no_flapping_at_the_threshold():
+    controller = make_controller()
+    feed(controller, SLOW, WINDOW)
+    feed(controller, FAST, WINDOW)
+    assert controller.tier == QualityTier.FULL
+
+    # The recovery is undone by the very next decision: the next one waits twice as long
+    assert feed(controller, SLOW, WINDOW) == [QualityTier.REUSE_LATENTS]
+    assert feed(controller, FAST, 2 * WINDOW - 1) == []
+    assert controller.record(FAST) == QualityTier.FULL
+
+
+def test_recovery_backoff_is_bounded():
+    controller = make_controller()
+    for _ in range(10):
+        feed(controller, SLOW, WINDOW)
+        feed(controller, FAST, MAX_RECOVERY_BACKOFF * WINDOW)
+
+    assert controller._recovery_backoff <= MAX_RECOVERY_BACKOFF
+
+
+def test_disabled_controller_tracks_but_never_changes_tier():
+    controller = make_controller(enabled=False)
+
+    assert feed(controller, 1.0, 10 * WINDOW) == []
+    assert controller.tier == QualityTier.FULL
+    assert controller.rolling_render_time_s == 1.0
@@ -0,0 +1,180 @@
+"""
+Session Pool Tests
+Drives the pool's refill and shrink steps with fake sessions and a monkeypatched warmup status.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.api import routes
+from src.core import capacity as capacity_module
+from src.core import session_pool as session_pool_module
+from src.core.config import AvatarConfig
+from src.core.session_pool import SessionPool
+
+
+def make_config(**overrides) -> AvatarConfig:
+    values = dict(
+        livekit_url="ws://localhost", livekit_api_key="key", livekit_api_secret="secret",
+        session_pool_size=2, session_pool_min_size=1, session_pool_idle_s=60.0,
+    )
+    values.update(overrides)
+    return AvatarConfig(**values)
+
+
+class FakeSession:
+    """Session whose initialization succeeds unless ``fail_init`` is set."""
+
+    fail_init = False
+    instances: list = []
+
+    def __init__(self, session_id, avatar_image_path, config):
+        self.session_id = session_id
+        self.avatar_image_path = avatar_image_path
+        self.initialized = False
+        self.init_started = False
+        self.stopped = False
+        FakeSession.instances.append(self)
+
+    async def initialize(self):
+        if FakeSession.fail_init:
+            raise RuntimeError("model load failed")
+        self.initialized = True
+
+    def start_initialize(self):
+        self.init_started = True
+
+    def claim(self, session_id):
+        self.session_id = session_id
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def warmup(monkeypatch):
+    """Fake sessions everywhere; call with True while the startup warmup is running."""
+    FakeSession.fail_init = False
+    FakeSession.instances = []
+    monkeypatch.setattr(session_pool_module, "AvatarSession", FakeSession)
+    monkeypatch.setattr(routes, "AvatarSession", FakeSession)
+    monkeypatch.setattr(capacity_module, "get_model_warmup_status", lambda: None)
+
+    def set_running(running: bool):
+        monkeypatch.setattr(session_pool_module, "get_model_warmup_status", lambda: {"running": running})
+    set_running(False)
+    return set_running
+
+
+async def wait_until(condition, timeout_s: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+async def test_acquire_hands_out_a_warm_session_and_refills(warmup, monkeypatch):
+    monkeypatch.setattr(session_pool_module, "POOL_CHECK_INTERVAL_S", 0.05)
+    pool = SessionPool(make_config(), free_slots=lambda: 10)
+    pool.start()
+    try:
+        await wait_until(lambda: len(pool.sessions) == 2)
+
+        session = pool.acquire()
+        assert session.initialized and session.session_id.startswith("pooled_")
+        assert pool.hits == 1 and len(pool.sessions) == 1
+
+        # The loop builds the replacement off the request path
+        await wait_until(lambda: len(pool.sessions) == 2)
+        assert pool.created == 3
+        assert session not in pool.sessions
+    finally:
+        await pool.stop()
+
+    assert not pool.sessions
+    assert all(s.stopped for s in FakeSession.instances if s is not session)
+
+
+async def test_empty_pool_counts_a_miss(warmup):
+    pool = SessionPool(make_config(), free_slots=lambda: 10)
+
+    assert pool.acquire() is None
+    assert pool.misses == 1 and pool.get_stats()["hit_rate"] == 0.0
+
+
+async def test_no_refill_while_warmup_is_running(warmup):
+    pool = SessionPool(make_config(), free_slots=lambda: 10)
+
+    warmup(True)
+    await pool._refill()
+    assert not pool.sessions and not FakeSession.instances
+
+    warmup(False)
+    await pool._refill()
+    assert len(pool.sessions) == 2
+
+
+async def test_refill_stays_within_the_free_session_slots(warmup):
+    free = [1]
+    pool = SessionPool(make_config(), free_slots=lambda: free[0])
+
+    await pool._refill()
+    assert len(pool.sessions) == 1
+
+    free[0] = 0
+    pool.acquire()
+    await pool._refill()
+    assert not pool.sessions
+
+
+async def test_shrinks_one_session_per_idle_period(warmup):
+    config = make_config(session_pool_size=3, session_pool_min_size=1, session_pool_idle_s=60.0)
+    pool = SessionPool(config, free_slots=lambda: 10)
+    await pool._refill()
+    assert len(pool.sessions) == 3
+
+    # Not idle long enough
+    await pool._shrink_if_idle()
+    assert len(pool.sessions) == 3
+
+    pool.last_activity -= 61.0
+    await pool._shrink_if_idle()
+    assert len(pool.sessions) == 2 and pool.target_size == 2 and pool.retired == 1
+    assert sum(s.stopped for s in FakeSession.instances) == 1
+
+    # The retirement restarts the idle period
+    await pool._shrink_if_idle()
+    assert len(pool.sessions) == 2
+
+    for _ in range(3):
+        pool.last_activity -= 61.0
+        await pool._shrink_if_idle()
+    assert len(pool.sessions) == 1 and pool.target_size == config.session_pool_min_size
+
+    # A refill at the shrunk target builds nothing; the next hand-out restores the full size
+    await pool._refill()
+    assert len(pool.sessions) == 1
+    pool.acquire()
+    assert pool.target_size == 3
+
+
+async def test_failed_pooled_init_falls_back_to_a_fresh_session(warmup, monkeypatch, tmp_path):
+    config = make_config(default_avatar_image=tmp_path / "default.png")
+    checked = []
+    monkeypatch.setattr(routes, "check_avatar_source", checked.append)
+    manager = routes.AvatarSessionManager(config)
+
+    FakeSession.fail_init = True
+    await manager.pool._refill()
+    assert not manager.pool.sessions
+    assert FakeSession.instances[0].stopped
+
+    session = await manager.create_session(session_id="caller")
+
+    assert manager.pool.misses == 1
+    assert session is FakeSession.instances[-1] and session is not FakeSession.instances[0]
+    assert session.session_id == "caller" and session.init_started
+    assert checked == [config.default_avatar_image]
+    assert manager.sessions == {"caller": session}
@@ -0,0 +1,93 @@
+"""
+Pooled I420 Buffer Tests
+Checks that outstanding frames keep their buffers and that planes are sized and filled right.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from livekit import rtc
+
+from src.streaming.video_buffers import I420FramePool
+
+
+def bgr_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Smooth gradient frame, so chroma subsampling loses little."""
+    y, x = np.mgrid[0:height, 0:width]
+    blue = x * 255 // max(width - 1, 1)
+    green = y * 255 // max(height - 1, 1)
+    red = np.full_like(x, 40 * seed % 255)
+    return np.stack([blue, green, red], axis=-1).astype(np.uint8)
+
+
+def to_bgr(video_frame: rtc.VideoFrame) -> np.ndarray:
+    """Decode a frame through LiveKit's own I420 reader."""
+    rgba = video_frame.convert(rtc.VideoBufferType.RGBA)
+    pixels = np.frombuffer(rgba.data, dtype=np.uint8).reshape(video_frame.height, video_frame.width, 4)
+    return cv2.cvtColor(pixels, cv2.COLOR_RGBA2BGR)
+
+
+def test_outstanding_frames_are_never_overwritten():
+    pool = I420FramePool((16, 16), slots=2)
+    first = pool.convert(bgr_frame(16, 16, seed=1))
+    snapshot = bytes(first.data)
+
+    # Both slots are outstanding: the ring grows instead of reusing the first buffer
+    second = pool.convert(bgr_frame(16, 16, seed=2))
+    third = pool.convert(bgr_frame(16, 16, seed=3))
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert bytes(first.data) == snapshot
+    assert pool.slots == 3 and pool.grown == 1
+
+
+def test_released_buffers_are_reused_in_ring_order():
+    pool = I420FramePool((16, 16), slots=3)
+    frames = [pool.convert(bgr_frame(16, 16, seed=i)) for i in range(3)]
+
+    pool.release(frames[1])
+    assert pool.convert(bgr_frame(16, 16)) is frames[1]
+
+    pool.release_all()
+    assert pool.convert(bgr_frame(16, 16)) is frames[2]
+    assert pool.slots == 3 and pool.grown == 0
+
+
+def test_release_ignores_frames_from_other_pools():
+    pool = I420FramePool((16, 16), slots=1)
+    other = I420FramePool((16, 16), slots=1)
+    held = pool.convert(bgr_frame(16, 16))
+
+    pool.release(other.convert(bgr_frame(16, 16)))
+    assert pool.convert(bgr_frame(16, 16)) is not held
+
+
+@pytest.mark.parametrize("width, height", [(16, 12), (15, 12), (16, 11), (15, 11), (1, 1)])
+def test_plane_sizes_match_livekit(width, height):
+    pool = I420FramePool((width, height), slots=1)
+    video_frame = pool.convert(bgr_frame(width, height))
+
+    chroma = ((width + 1) // 2) * ((height + 1) // 2)
+    assert len(video_frame.data) == width * height + 2 * chroma
+    assert [len(video_frame.get_plane(i)) for i in range(3)] == [width * height, chroma, chroma]
+
+
+@pytest.mark.parametrize("width, height", [(64, 48), (63, 48), (64, 47), (63, 47)])
+def test_round_trip_through_livekit(width, height):
+    frame = bgr_frame(width, height, seed=3)
+    pool = I420FramePool((width, height), slots=1)
+
+    decoded = to_bgr(pool.convert(frame))
+
+    # Chroma subsampling and the YUV round trip cost a few levels, a misplaced plane far more
+    assert decoded.shape == frame.shape
+    assert float(np.abs(decoded.astype(np.int16) - frame.astype(np.int16)).mean()) < 4.0
+
+
+def test_frames_of_another_size_are_resized():
+    pool = I420FramePool((32, 32), slots=1)
+
+    decoded = to_bgr(pool.convert(np.full((64, 48, 3), 128, np.uint8)))
+
+    assert decoded.shape == (32, 32, 3)
+    assert np.abs(decoded.astype(np.int16) - 128).max() <= 3
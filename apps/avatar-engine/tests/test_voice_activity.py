@@ -0,0 +1,92 @@
+"""
+Voice Activity Gate Tests
+Feeds synthetic speech and silence frames through the energy gate and its hangover.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.voice_activity import EnergyVAD
+
+
+FRAME = 533                 # samples per video frame at 16 kHz / 30 fps
+THRESHOLD_DB = -45.0
+HANGOVER = 3
+
+
+def tone(level_db: float) -> np.ndarray:
+    """A sine frame at an RMS level in dBFS."""
+    amplitude = np.sqrt(2) * 10 ** (level_db / 20)
+    return (amplitude * np.sin(np.arange(FRAME) * 2 * np.pi * 220 / 16000)).astype(np.float32)
+
+
+SPEECH = tone(-20.0)
+QUIET = tone(-60.0)
+SILENCE = np.zeros(FRAME, dtype=np.float32)
+
+
+def make_vad() -> EnergyVAD:
+    return EnergyVAD(threshold_db=THRESHOLD_DB, hangover_frames=HANGOVER)
+
+
+def feed(vad: EnergyVAD, frame: np.ndarray, frames: int) -> list:
+    """Classify a frame repeatedly and return each decision."""
+    return [vad.update(frame) for _ in range(frames)]
+
+
+def test_starts_closed_and_stays_closed_on_silence():
+    vad = make_vad()
+
+    assert not vad.is_open
+    assert feed(vad, SILENCE, 10) == [False] * 10
+    assert feed(vad, QUIET, 10) == [False] * 10
+
+
+def test_opens_on_the_first_speech_frame():
+    vad = make_vad()
+
+    assert vad.update(SPEECH)
+    assert vad.is_open
+    assert vad.last_level_db == pytest.approx(-20.0, abs=0.1)
+
+
+def test_hangover_keeps_the_gate_open_then_closes():
+    vad = make_vad()
+    feed(vad, SPEECH, 4)
+
+    # Open for exactly the hangover after the last speech frame
+    assert feed(vad, SILENCE, HANGOVER + 2) == [True] * HANGOVER + [False, False]
+    assert not vad.is_open
+
+
+def test_speech_inside_the_hangover_restarts_it():
+    vad = make_vad()
+    vad.update(SPEECH)
+    feed(vad, SILENCE, HANGOVER - 1)
+
+    assert vad.update(SPEECH)
+    assert feed(vad, SILENCE, HANGOVER + 1) == [True] * HANGOVER + [False]
+
+
+def test_threshold_separates_speech_from_background():
+    vad = make_vad()
+
+    assert vad.update(tone(THRESHOLD_DB + 0.5))
+    vad.reset()
+    assert not vad.update(tone(THRESHOLD_DB - 0.5))
+
+
+def test_reset_closes_an_open_gate():
+    vad = make_vad()
+    vad.update(SPEECH)
+    vad.reset()
+
+    assert not vad.is_open
+    assert not vad.update(SILENCE)
+
+
+def test_empty_frame_counts_as_silence():
+    vad = make_vad()
+
+    assert not vad.update(np.zeros(0, dtype=np.float32))
+    assert vad.last_level_db == -120.0